@@ -38,131 +38,211 @@ Author: OEvortex <helpingai5@gmail.com>
 License: MIT
 """
 
+# Nothing below imports the heavy machinery (executing, pygments, the console
+# and panel renderers, the styles package, ...). ``litprinter_autoload.pth``
+# imports this package in every interpreter, so public names are resolved
+# lazily on first access through the module-level ``__getattr__`` (PEP 562).
+
+import importlib as _importlib
+import sys as _sys
+from types import ModuleType as _ModuleType
+
 # ============================================================================
 # IceCream-compatible Debug Printing (Main Feature)
 # ============================================================================
 
-from .litprint import (
-    ic,           # Main debug function
-    LIT,          # Alias
-    litprint,     # Alias  
-    lit,          # Alias
-    configureOutput,  # Configure ic output
-    enable,       # Enable ic output
-    disable,      # Disable ic output
-    format,       # Format without printing
-    set_style,    # Set color style
-    get_style,    # Get current style
-    argumentToString,  # Custom formatters
-    IceCreamDebugger,  # Core class
-)
-
-# Legacy alias
-from .core import LITPrintDebugger
+_LAZY_ATTRS = {
+    "ic": (".litprint", "ic"),                    # Main debug function
+    "LIT": (".litprint", "LIT"),                  # Alias
+    "litprint": (".litprint", "litprint"),        # Alias
+    "lit": (".litprint", "lit"),                  # Alias
+    "configureOutput": (".litprint", "configureOutput"),  # Configure ic output
+    "enable": (".litprint", "enable"),            # Enable ic output
+    "disable": (".litprint", "disable"),          # Disable ic output
+    "format": (".litprint", "format"),            # Format without printing
+    "set_style": (".litprint", "set_style"),      # Set color style
+    "get_style": (".litprint", "get_style"),      # Get current style
+    "argumentToString": (".litprint", "argumentToString"),  # Custom formatters
+    "IceCreamDebugger": (".litprint", "IceCreamDebugger"),  # Core class
+    "OutputConfig": (".litprint", "OutputConfig"),  # Immutable ic settings
+    "FormatBudget": (".formatting", "FormatBudget"),  # Formatting limits
+    "set_format_budget": (".formatting", "set_format_budget"),
+    "set_repr_guard": (".reprguard", "set_repr_guard"),  # Slow repr protection
+    "pin_repr": (".reprguard", "pin_repr"),
+    "logpoint": (".logpoints", "logpoint"),       # ic() output at file:line
+    "clear_logpoints": (".logpoints", "clear_logpoints"),
+    "AtomicWriter": (".writer", "AtomicWriter"),  # One write per output record
+    "LoopWriter": (".aio", "LoopWriter"),         # asyncio output queue
+    # Legacy alias
+    "LITPrintDebugger": (".core", "LITPrintDebugger"),
+}
 
 # ============================================================================
 # Builtins Installation
 # ============================================================================
 
-from .builtins import install, uninstall
+from .builtins import install, uninstall, _install_lazy
 
 # Auto-install ic to builtins when litprinter is imported
-# This makes ic() available globally after `pip install litprinter`
-_builtins = __import__('builtins')
-_builtins.ic = ic
-_builtins.LIT = LIT
-_builtins.litprint = litprint
+# This makes ic() available globally after `pip install litprinter`.
+# The builtins entries are stubs that load the real ic on first use.
+_install_lazy("ic", "LIT", "litprint")
+
+# Opt-in production mode: strip ic() calls from modules as they are imported
+# (see strip.py). Only imports the hook when LITPRINTER_STRIP is set.
+import os as _os
+if _os.environ.get("LITPRINTER_STRIP"):
+    from .strip import install_from_env as _install_strip
+    _install_strip()
+
+# Logpoints configured for this process (see logpoints.py)
+if _os.environ.get("LITPRINTER_LOGPOINTS") or _os.environ.get("LITPRINTER_LOGPOINTS_FILE"):
+    from .logpoints import install_from_env as _install_logpoints
+    _install_logpoints()
 
 # ============================================================================
 # Colors and Styling
 # ============================================================================
 
-from .coloring import (
-    TokyoNight,       # Tokyo Night theme (NEW DEFAULT)
-    LitStyle,         # Catppuccin-inspired (brighter)
-    SolarizedDark,    # IceCream-compatible
-    CyberpunkStyle,   # Neon cyberpunk
-    MonokaiStyle,     # Classic Monokai
-    DEFAULT_STYLE,    # Current default
-)
-from .colors import Colors
+_LAZY_ATTRS.update({
+    "TokyoNight": (".coloring", "TokyoNight"),        # Tokyo Night theme (NEW DEFAULT)
+    "LitStyle": (".coloring", "LitStyle"),            # Catppuccin-inspired (brighter)
+    "SolarizedDark": (".coloring", "SolarizedDark"),  # IceCream-compatible
+    "CyberpunkStyle": (".coloring", "CyberpunkStyle"),  # Neon cyberpunk
+    "MonokaiStyle": (".coloring", "MonokaiStyle"),    # Classic Monokai
+    "DEFAULT_STYLE": (".coloring", "DEFAULT_STYLE"),  # Current default
+    "Colors": (".colors", "Colors"),
+    "set_highlighter": (".highlight", "set_highlighter"),  # "fast" or "pygments"
+})
 
 # ============================================================================
 # Rich-style Infrastructure Modules
 # ============================================================================
 
-try:
-    from .segment import Segment, ControlType, ControlCode, render_segments
-except ImportError:
-    Segment = None
-    ControlType = None
-    ControlCode = None
-    render_segments = None
-
-try:
-    from .style import Style, NULL_STYLE, style, BOLD, DIM, ITALIC, UNDERLINE
-except ImportError:
-    Style = None
-    NULL_STYLE = None
-
-try:
-    from .text import Text, Span
-except ImportError:
-    Text = None
-    Span = None
-
-try:
-    from .box import (
-        Box, ROUNDED, HEAVY, DOUBLE, SQUARE, ASCII, DASHED, DOTTED,
-        NONE as BOX_NONE, get_box, render_box
-    )
-except ImportError:
-    Box = None
-    ROUNDED = None
+_LAZY_ATTRS.update({
+    # Segment
+    "Segment": (".segment", "Segment"),
+    "ControlType": (".segment", "ControlType"),
+    "ControlCode": (".segment", "ControlCode"),
+    "render_segments": (".segment", "render_segments"),
+    # Style
+    "Style": (".style", "Style"),
+    "NULL_STYLE": (".style", "NULL_STYLE"),
+    "style": (".style", "style"),
+    "BOLD": (".style", "BOLD"),
+    "DIM": (".style", "DIM"),
+    "ITALIC": (".style", "ITALIC"),
+    "UNDERLINE": (".style", "UNDERLINE"),
+    # Text
+    "Text": (".text", "Text"),
+    "Span": (".text", "Span"),
+    # Box
+    "Box": (".box", "Box"),
+    "ROUNDED": (".box", "ROUNDED"),
+    "HEAVY": (".box", "HEAVY"),
+    "DOUBLE": (".box", "DOUBLE"),
+    "SQUARE": (".box", "SQUARE"),
+    "ASCII": (".box", "ASCII"),
+    "DASHED": (".box", "DASHED"),
+    "DOTTED": (".box", "DOTTED"),
+    "BOX_NONE": (".box", "NONE"),
+    "get_box": (".box", "get_box"),
+    "render_box": (".box", "render_box"),
+})
 
 # ============================================================================
 # Console with Rich-like Features
 # ============================================================================
 
-from .console import Console, console, cprint
-from .console import print as console_print
+_LAZY_ATTRS.update({
+    "Console": (".console", "Console"),
+    "console": (".console", "console"),
+    "cprint": (".console", "cprint"),
+    "console_print": (".console", "print"),
+})
 
 # ============================================================================
 # Panel Rendering
 # ============================================================================
 
-try:
-    from .panel import Panel, BorderStyle, Padding, Shadow, Background, PanelGroup, panel
-except ImportError:
-    Panel = None
-    BorderStyle = None
+_LAZY_ATTRS.update({
+    "Panel": (".panel", "Panel"),
+    "BorderStyle": (".panel", "BorderStyle"),
+    "Padding": (".panel", "Padding"),
+    "Shadow": (".panel", "Shadow"),
+    "Background": (".panel", "Background"),
+    "PanelGroup": (".panel", "PanelGroup"),
+    "panel": (".panel", "panel"),
+})
 
 # ============================================================================
 # Traceback Formatting
 # ============================================================================
 
-from . import traceback
-from .traceback import (
-    PrettyTraceback,
-    Traceback,
-    install as install_traceback,
-    uninstall as uninstall_traceback,
-)
+_LAZY_ATTRS.update({
+    "traceback": (".traceback", None),
+    "PrettyTraceback": (".traceback", "PrettyTraceback"),
+    "Traceback": (".traceback", "Traceback"),
+    "install_traceback": (".traceback", "install"),
+    "uninstall_traceback": (".traceback", "uninstall"),
+})
 
 # ============================================================================
 # Styles/Themes
 # ============================================================================
 
-try:
-    from .styles import (
-        JARVIS, RICH, MODERN, NEON, CYBERPUNK, DRACULA, MONOKAI,
-        SOLARIZED, NORD, GITHUB, VSCODE, MATERIAL, RETRO, OCEAN,
-        AUTUMN, SYNTHWAVE, FOREST, MONOCHROME, SUNSET,
-        create_custom_style,
+_LAZY_ATTRS.update({
+    name: (".styles", name)
+    for name in (
+        "JARVIS", "RICH", "MODERN", "NEON", "CYBERPUNK", "DRACULA", "MONOKAI",
+        "SOLARIZED", "NORD", "GITHUB", "VSCODE", "MATERIAL", "RETRO", "OCEAN",
+        "AUTUMN", "SYNTHWAVE", "FOREST", "MONOCHROME", "SUNSET",
+        "create_custom_style",
     )
-except ImportError:
-    # Styles package not available
-    pass
+})
+
+class _Package(_ModuleType):
+    """Module type of the package, keeping public names that are submodule names.
+    
+    Importing a submodule binds it on the package, which would shadow the
+    public object of the same name (``console``, ``panel``, ``style``,
+    ``litprint``). The object is bound instead, as the eager imports did.
+    """
+    
+    def __setattr__(self, name, value):
+        if isinstance(value, _ModuleType) and value.__name__ == f"{__name__}.{name}":
+            module_name, attr = _LAZY_ATTRS.get(name, (None, None))
+            if module_name == f".{name}" and attr is not None:
+                value = getattr(value, attr, value)
+        super().__setattr__(name, value)
+
+
+_sys.modules[__name__].__class__ = _Package
+
+
+def __getattr__(name):
+    """Resolve public names lazily, importing their module on first access."""
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    try:
+        module = _importlib.import_module(module_name, __name__)
+    except ImportError as exc:
+        # Optional component unavailable (e.g. the styles package without Pygments)
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r} ({exc})"
+        ) from exc
+    
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 # ============================================================================
 # Version
@@ -188,6 +268,15 @@ __all__ = [
     "get_style",
     "argumentToString",
     "IceCreamDebugger",
+    "OutputConfig",
+    "FormatBudget",
+    "set_format_budget",
+    "set_repr_guard",
+    "pin_repr",
+    "logpoint",
+    "clear_logpoints",
+    "AtomicWriter",
+    "LoopWriter",
     "LITPrintDebugger",
     # Builtins (like IceCream)
     "install",
@@ -200,6 +289,7 @@ __all__ = [
     "MonokaiStyle",
     "DEFAULT_STYLE",
     "Colors",
+    "set_highlighter",
     # Segment
     "Segment",
     "ControlType",
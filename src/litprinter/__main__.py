@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Command Line
+
+Usage:
+    python -m litprinter recorder PATH [--tail N]
+        Print the records a flight recorder left in a memory-mapped file
+        (see ``ic.configureRecorder(path=...)``).
+    
+    python -m litprinter replay PATH [--no-color] [--time]
+        Render a capture log (see ``ic.configureCapture()``) as ic() would
+        have printed it. Replaying unpickles captured objects: only replay
+        logs you trust.
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def _recorder(args: argparse.Namespace) -> int:
+    from .recorder import read_records, _format_line
+
+    try:
+        pid, records = read_records(args.path)
+    except (OSError, ValueError) as error:
+        print(f"litprinter: {error}", file=sys.stderr)
+        return 1
+    if args.tail is not None:
+        records = records[-args.tail:] if args.tail > 0 else []
+    print(f"flight recorder of pid {pid}: {len(records):,} record(s)")
+    for _, when, thread, text in records:
+        print(_format_line(when, thread, text))
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    from .capture import replay
+
+    colorize = sys.stdout.isatty() if args.color is None else args.color
+    try:
+        replay(args.path, colorize=colorize, show_time=args.time)
+    except BrokenPipeError:
+        # Output piped into e.g. head
+        return 0
+    except (OSError, ValueError) as error:
+        print(f"litprinter: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface."""
+    parser = argparse.ArgumentParser(prog="python -m litprinter")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    recorder = commands.add_parser(
+        "recorder", help="print the records of a flight recorder file"
+    )
+    recorder.add_argument("path", help="file given to ic.configureRecorder(path=...)")
+    recorder.add_argument("--tail", type=int, metavar="N", help="only the last N records")
+    recorder.set_defaults(run=_recorder)
+
+    replay = commands.add_parser(
+        "replay", help="render a capture log as ic() would have printed it"
+    )
+    replay.add_argument("path", help="file written by ic.configureCapture()")
+    replay.add_argument("--color", dest="color", action="store_true", default=None,
+                        help="highlight the output (default: when stdout is a terminal)")
+    replay.add_argument("--no-color", dest="color", action="store_false",
+                        help="plain text output")
+    replay.add_argument("--time", action="store_true",
+                        help="start each line with the time and thread of the call")
+    replay.set_defaults(run=_replay)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
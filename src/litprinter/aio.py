@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Asyncio Module
+
+An output path for asyncio programs that never blocks the event loop.
+
+Output submitted on an event loop thread is appended to a per-loop queue
+and the call returns at once. A writer task owned by the loop drains the
+queue in batches and runs the (blocking) highlighting and writes in the
+loop's default executor, so the loop keeps serving other tasks. Records
+are tagged with the name of the task that produced them.
+
+Output from threads without a running loop is written synchronously, as
+usual. ``ic()`` cannot wait for room in a full queue (that would block the
+loop the writer task runs on), so overflow drops records and reports how
+many; ``await console.aprint()`` waits for room instead.
+
+Usage:
+    from litprinter import ic, Console
+    
+    ic.configureOutput(asyncOutput='asyncio')
+    
+    async def handler(request):
+        ic(request.path)           # [Task-42] ic| request.path: '/api'
+        await console.aprint("[green]done[/green]")
+        await ic.aflush()          # wait until queued output is written
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import asyncio
+import sys
+import traceback
+import weakref
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+from .writer import DEFAULT_QUEUE_SIZE
+
+
+__all__ = [
+    "LoopWriter",
+    "LOOP_OVERFLOW_POLICIES",
+    "default_writer",
+]
+
+# "block" is not offered: the writer task runs on the blocked loop
+LOOP_OVERFLOW_POLICIES = ("drop-oldest", "drop-newest")
+
+try:
+    _get_running_loop = asyncio._get_running_loop
+except AttributeError:  # pragma: no cover - private helper of CPython
+    def _get_running_loop():
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+Record = Tuple[Callable[[str], None], str]
+
+
+class _LoopState:
+    """Queue and writer task of one event loop."""
+    
+    __slots__ = ("queue", "wakeup", "drained", "task", "in_flight", "dropped", "__weakref__")
+    
+    def __init__(self):
+        self.queue: Deque[Record] = deque()
+        self.wakeup = asyncio.Event()
+        self.drained = asyncio.Event()
+        self.drained.set()
+        self.task: Optional["asyncio.Task"] = None
+        self.in_flight = 0
+        self.dropped = 0
+
+
+class LoopWriter:
+    """Queue output on the running event loop and write it from a loop task.
+    
+    Has the ``submit``/``flush``/``close`` interface of BackgroundWriter, so
+    it can be passed as ``ic.configureOutput(asyncOutput=...)``.
+    
+    Attributes:
+        maxsize: Maximum number of queued records per loop.
+        overflow: "drop-oldest" or "drop-newest".
+        tag_tasks: Prefix records with ``[task name]``.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = "drop-oldest",
+        tag_tasks: bool = True,
+    ):
+        """Initialize the writer. Writer tasks start on the first submit.
+        
+        Args:
+            maxsize: Maximum number of queued records per loop.
+            overflow: What to do when the queue is full.
+            tag_tasks: Prefix records with the name of the current task.
+        
+        Raises:
+            ValueError: If the policy is unknown or maxsize is not positive.
+        """
+        if overflow not in LOOP_OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r} for asyncio output; "
+                f"expected one of {', '.join(LOOP_OVERFLOW_POLICIES)}"
+            )
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.tag_tasks = tag_tasks
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    
+    def submit(self, function: Callable[[str], None], text: str) -> None:
+        """Queue ``function(text)`` on the running loop (or run it now).
+        
+        Args:
+            function: Output function to call with the text.
+            text: Already formatted output.
+        """
+        loop = _get_running_loop()
+        if loop is None:
+            function(text)
+            return
+        state = self._state(loop)
+        queue = state.queue
+        if len(queue) >= self.maxsize:
+            state.dropped += 1
+            if self.overflow == "drop-newest":
+                return
+            queue.popleft()
+        queue.append((function, self._tag(loop, text)))
+        if state.drained.is_set():
+            state.drained.clear()
+            state.wakeup.set()
+    
+    async def asubmit(self, function: Callable[[str], None], text: str) -> None:
+        """Queue ``function(text)``, waiting for room instead of dropping."""
+        loop = _get_running_loop()
+        if loop is None:
+            function(text)
+            return
+        state = self._state(loop)
+        while len(state.queue) >= self.maxsize:
+            await state.drained.wait()
+        self.submit(function, text)
+    
+    def _tag(self, loop, text: str) -> str:
+        if self.tag_tasks:
+            task = asyncio.current_task(loop)
+            if task is not None:
+                return f"[{task.get_name()}] {text}"
+        return text
+    
+    def _state(self, loop) -> _LoopState:
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        if state.task is None:
+            state.task = loop.create_task(self._drain(loop, state))
+            state.task.set_name("litprinter-writer")
+        return state
+    
+    # ------------------------------------------------------------------
+    # Writer task
+    # ------------------------------------------------------------------
+    
+    async def _drain(self, loop, state: _LoopState) -> None:
+        """Write queued records in batches until the loop shuts down."""
+        try:
+            while True:
+                await state.wakeup.wait()
+                state.wakeup.clear()
+                while state.queue:
+                    batch = list(state.queue)
+                    state.queue.clear()
+                    if state.dropped:
+                        # Report through the output function of the last record
+                        batch.append((batch[-1][0], self._drop_report(state.dropped)))
+                        state.dropped = 0
+                    state.in_flight = len(batch)
+                    await loop.run_in_executor(None, self._write_batch, batch)
+                    state.in_flight = 0
+                state.drained.set()
+        except asyncio.CancelledError:
+            # The loop is shutting down: write what is left here
+            self._write_batch(list(state.queue))
+            state.queue.clear()
+            state.in_flight = 0
+            state.drained.set()
+            raise
+        finally:
+            state.task = None
+            # The state's events and task refer to the loop: drop it so a
+            # closed loop can be collected
+            if self._states.get(loop) is state:
+                del self._states[loop]
+    
+    def _drop_report(self, dropped: int) -> str:
+        return (
+            f"litprinter: dropped {dropped:,} record(s) "
+            f"(asyncio queue full, overflow={self.overflow!r})"
+        )
+    
+    @staticmethod
+    def _write_batch(batch) -> None:
+        """Run output calls, reporting (not propagating) their errors."""
+        for function, text in batch:
+            try:
+                function(text)
+            except Exception:
+                traceback.print_exc(file=sys.__stderr__)
+    
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+    
+    async def aflush(self) -> None:
+        """Wait until everything queued on the running loop has been written."""
+        loop = _get_running_loop()
+        state = self._states.get(loop) if loop is not None else None
+        if state is not None:
+            await state.drained.wait()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write what is queued, without awaiting.
+        
+        On a loop thread, records not yet handed to the executor are written
+        synchronously (use ``aflush()`` there to avoid blocking). From other
+        threads this waits for each loop to drain.
+        
+        Returns:
+            True if every queue drained, False otherwise.
+        """
+        running = _get_running_loop()
+        drained = True
+        for loop, state in list(self._states.items()):
+            if loop is running:
+                if state.in_flight:
+                    drained = False
+                    continue
+                batch = list(state.queue)
+                state.queue.clear()
+                self._write_batch(batch)
+            elif loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(state.drained.wait(), loop)
+                try:
+                    future.result(timeout)
+                except Exception:
+                    drained = False
+            else:
+                # A loop that is no longer running: its writer task is gone
+                self._write_batch(list(state.queue))
+                state.queue.clear()
+        return drained
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write what is queued; later output on loops starts a new writer task."""
+        self.flush(timeout)
+    
+    @property
+    def pending(self) -> int:
+        """Number of records queued or being written on all loops."""
+        return sum(len(state.queue) + state.in_flight for state in list(self._states.values()))
+    
+    def __repr__(self) -> str:
+        return (
+            f"<LoopWriter maxsize={self.maxsize} overflow={self.overflow!r} "
+            f"pending={self.pending}>"
+        )
+
+
+_default_writer: Optional[LoopWriter] = None
+
+
+def default_writer() -> LoopWriter:
+    """The LoopWriter shared by ``asyncOutput='asyncio'`` and ``Console.aprint``.
+    
+    Sharing one writer keeps ic() and Console output of a loop in order.
+    """
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = LoopWriter()
+    return _default_writer
@@ -19,11 +19,49 @@ Author: OEvortex <helpingai5@gmail.com>
 License: MIT
 """
 
-from typing import Optional
+import sys
 
 _builtins = __import__('builtins')
 
 
+class _LazyBuiltin:
+    """Lightweight stand-in for ``ic`` installed into builtins at import time.
+    
+    ``import litprinter`` runs in every interpreter through the ``.pth``
+    autoload, so it must not pull in the formatting machinery (executing,
+    pygments, ...). This stub defers that import until ``ic`` is actually
+    used, then replaces itself in builtins with the real ``ic``.
+    """
+    
+    __slots__ = ('_name',)
+    
+    def __init__(self, name: str):
+        self._name = name
+    
+    def _resolve(self):
+        """Import the real ic and swap it into builtins in place of the stub."""
+        from .litprint import ic
+        if getattr(_builtins, self._name, None) is self:
+            setattr(_builtins, self._name, ic)
+        return ic
+    
+    def __call__(self, *args, **kwargs):
+        # Forward the caller's frame so source analysis sees the real call site
+        return self._resolve()._call(sys._getframe(1), args, **kwargs)
+    
+    def __getattr__(self, name: str):
+        return getattr(self._resolve(), name)
+    
+    def __repr__(self) -> str:
+        return f"<ic (not yet loaded) as {self._name!r}>"
+
+
+def _install_lazy(*names: str) -> None:
+    """Install lazy ic stubs into builtins under ``names``."""
+    for name in names:
+        setattr(_builtins, name, _LazyBuiltin(name))
+
+
 def install(ic: str = 'ic') -> None:
     """Install ic to Python builtins for global access.
     
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Capture Module
+
+Deferred formatting: record ic() calls to a compact binary log and render
+them later, possibly on another machine.
+
+Formatting values (repr, pretty-printing and highlighting) is most of what
+ic() costs. In capture mode nothing is formatted at call time; each call
+stores a snapshot of its values instead:
+
+- values ``marshal`` can store and that cannot change (numbers, strings,
+  bytes, None, and tuples/frozensets of those) are stored as they are,
+- other objects are pickled, so their state at call time is kept;
+  instances of classes defined in ``__main__`` (which the replaying process
+  cannot import) are pickled as their class name and attribute values,
+- objects that cannot be pickled fall back to their repr.
+
+The log is rendered with the usual argumentToString and theme machinery::
+
+    python -m litprinter replay app.iclog
+
+Log format: the magic ``LITCAP01``, then frames of a 4-byte little-endian
+length and a ``marshal``-ed tuple. A ``("site", id, context, abs context,
+exprs)`` frame describes a call site the first time it is used; ``("call",
+site id, wall time ns, thread, prefix, context mode, kinds, payloads)``
+frames describe calls. ``kinds`` has one letter per value: ``m`` (stored
+as is), ``p`` (pickled) or ``r`` (repr). Other ic() output (timer reports,
+watch changes, sampling summaries, logpoints) is stored as ``("text", wall
+time ns, thread, text)`` frames.
+
+Replaying unpickles the stored objects: only replay logs you trust.
+
+Usage:
+    from litprinter import ic
+    
+    ic.configureCapture(True, path="/var/tmp/app-{pid}.iclog")
+    ic(order)          # snapshot appended to the log, nothing printed
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import atexit
+import io
+import marshal
+import os
+import pickle
+import reprlib
+import struct
+import sys
+import threading
+import types
+import weakref
+from time import time_ns
+from typing import Any, Dict, IO, Iterator, Optional, Tuple
+
+from .core import OutputConfig, _ABSENT, _code_context, _get_call_site
+
+
+__all__ = [
+    "CaptureSink",
+    "read_capture",
+    "replay",
+]
+
+MAGIC = b"LITCAP01"
+
+_LENGTH = struct.Struct("<I")
+
+# marshal stores these faithfully, and they cannot change after the call
+_MARSHAL_TYPES = frozenset((int, float, complex, bool, type(None), str, bytes))
+
+# Bytes buffered before the log is written
+_BUFFER_SIZE = 64 * 1024
+
+# Sinks with buffered frames, flushed at exit and before fork
+_sinks: "weakref.WeakSet[CaptureSink]" = weakref.WeakSet()
+
+
+def _marshalable(value: Any, depth: int = 0) -> bool:
+    cls = type(value)
+    if cls in _MARSHAL_TYPES:
+        return True
+    if (cls is tuple or cls is frozenset) and depth < 4:
+        return all(_marshalable(item, depth + 1) for item in value)
+    return False
+
+
+def _instance_state(value: Any) -> Dict[str, Any]:
+    """Attribute values of an object, from its ``__dict__`` and slots."""
+    state = dict(getattr(value, "__dict__", None) or {})
+    for cls in type(value).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{cls.__name__.lstrip('_')}{name}"
+            try:
+                state[name] = getattr(value, name)
+            except AttributeError:
+                pass
+    return state
+
+
+class _MainPickler(pickle.Pickler):
+    """Pickler storing instances of ``__main__`` classes as _MainObject.
+    
+    The replaying process runs as ``litprinter.__main__`` and cannot import
+    the captured program's ``__main__`` classes, so their instances are
+    stored as their qualified name and attribute values instead, and the
+    classes and functions themselves as their repr.
+    """
+    
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, (type, types.FunctionType)):
+            if obj.__module__ == "__main__":
+                return _Repr, (repr(obj),)
+            return NotImplemented
+        cls = type(obj)
+        if cls.__module__ != "__main__":
+            return NotImplemented
+        return _MainObject, (cls.__qualname__,), _instance_state(obj)
+
+
+def _pickle(value: Any) -> bytes:
+    data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    if b"__main__" not in data:
+        return data
+    buffer = io.BytesIO()
+    _MainPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(value)
+    return buffer.getvalue()
+
+
+def _snapshot(value: Any) -> Tuple[str, Any]:
+    """(kind, payload) of a value: stored as is, pickled, or its repr."""
+    if _marshalable(value):
+        return "m", value
+    try:
+        return "p", (type(value).__qualname__, _pickle(value))
+    except Exception:
+        try:
+            return "r", repr(value)
+        except Exception as error:
+            return "r", f"<unrepresentable {type(value).__qualname__}: {error!r}>"
+
+
+class CaptureSink:
+    """Append snapshots of ic() calls to a binary log.
+    
+    Installed by ``ic.configureCapture()``; while installed, ic() calls are
+    captured instead of printed.
+    
+    Attributes:
+        path: The log file.
+    """
+    
+    def __init__(self, path: str):
+        """Open (append to) the log.
+        
+        Args:
+            path: Log file; ``{pid}`` is replaced by the process id. A child
+                process created by fork() writes to its own file: the
+                template with the child's pid, or ``path.<pid>``.
+        """
+        self._template = path
+        self._lock = threading.Lock()
+        self._open(path.replace("{pid}", str(os.getpid())))
+        _sinks.add(self)
+    
+    def _open(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[IO[bytes]] = open(path, "ab", buffering=_BUFFER_SIZE)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+        # (code, f_lasti) -> site id, written once per file
+        self._sites: Dict[tuple, int] = {}
+    
+    def _site(self, call_frame, lazy: bool) -> int:
+        key = (call_frame.f_code, call_frame.f_lasti)
+        site_id = self._sites.get(key)
+        if site_id is None:
+            code, lineno = call_frame.f_code, call_frame.f_lineno
+            exprs = tuple(
+                expr if isinstance(expr, str) else None
+                for expr in _get_call_site(call_frame, lazy).exprs
+            )
+            site_id = self._sites[key] = len(self._sites) + 1
+            self._write(("site", site_id, _code_context(code, lineno, False),
+                         _code_context(code, lineno, True), exprs))
+        return site_id
+    
+    def _write(self, frame: tuple) -> None:
+        """Append a frame (called with the lock held)."""
+        data = marshal.dumps(frame)
+        self._file.write(_LENGTH.pack(len(data)) + data)
+    
+    def record(self, call_frame, args: tuple, config: OutputConfig, lazy: bool = False) -> None:
+        """Append a snapshot of an ic() call."""
+        snapshots = [_snapshot(value) for value in args]
+        kinds = "".join(kind for kind, _ in snapshots)
+        payloads = tuple(payload for _, payload in snapshots)
+        prefix = config.prefix() if callable(config.prefix) else config.prefix
+        context = (2 if config.contextAbsPath else 1) if config.includeContext else 0
+        thread = threading.current_thread().name
+        with self._lock:
+            if self._file is None:
+                return
+            site_id = self._site(call_frame, lazy)
+            self._write(("call", site_id, time_ns(), thread, prefix, context, kinds, payloads))
+    
+    def message(self, text: str) -> None:
+        """Append other ic() output (timer reports, watches, summaries) as text."""
+        thread = threading.current_thread().name
+        with self._lock:
+            if self._file is not None:
+                self._write(("text", time_ns(), thread, text))
+    
+    def flush(self) -> None:
+        """Write buffered frames to the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+    
+    def close(self) -> None:
+        """Flush and close the log."""
+        _sinks.discard(self)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def _reopen_in_child(self) -> None:
+        """Switch a forked child to a log of its own."""
+        self._lock = threading.Lock()
+        pid = str(os.getpid())
+        if "{pid}" in self._template:
+            path = self._template.replace("{pid}", pid)
+        else:
+            path = f"{self._template}.{pid}"
+        if self._file is not None:
+            # Flushed before the fork; closing writes nothing more
+            self._file.close()
+            self._open(path)
+    
+    def __repr__(self) -> str:
+        return f"<CaptureSink {self.path!r}>"
+
+
+# ============================================================================
+# Process Lifecycle Hooks
+# ============================================================================
+
+def _flush_at_exit() -> None:
+    for sink in list(_sinks):
+        try:
+            sink.flush()
+        except Exception:
+            pass
+
+
+def _before_fork() -> None:
+    # Leave nothing buffered that the child would write a second time
+    for sink in list(_sinks):
+        sink._lock.acquire()
+        try:
+            if sink._file is not None:
+                sink._file.flush()
+        except Exception:
+            pass
+
+
+def _after_fork_in_parent() -> None:
+    for sink in list(_sinks):
+        sink._lock.release()
+
+
+def _after_fork_in_child() -> None:
+    for sink in list(_sinks):
+        sink._reopen_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_before_fork,
+        after_in_parent=_after_fork_in_parent,
+        after_in_child=_after_fork_in_child,
+    )
+atexit.register(_flush_at_exit)
+
+
+# ============================================================================
+# Reading and Replay
+# ============================================================================
+
+def read_capture(path: str) -> Iterator[tuple]:
+    """Iterate over the frames of a capture log.
+    
+    A log cut short (e.g. by a crash) ends at its last complete frame.
+    
+    Raises:
+        ValueError: If the file is not a capture log.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a litprinter capture log")
+        while True:
+            header = file.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(header)
+            data = file.read(length)
+            if len(data) < length:
+                return
+            yield marshal.loads(data)
+
+
+class _MainObject:
+    """Stands in for a captured instance of a ``__main__`` class."""
+    
+    def __init__(self, qualname: str):
+        self.qualname = qualname
+        self.fields: Dict[str, Any] = {}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.fields = state
+    
+    @reprlib.recursive_repr()
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.fields.items())
+        return f"{self.qualname}({fields})"
+
+
+class _Unpicklable:
+    """Stands in for a captured object that cannot be unpickled here."""
+    
+    def __init__(self, type_name: str, error: Exception):
+        self.text = f"<{type_name} (not restorable: {type(error).__name__}: {error})>"
+    
+    def __repr__(self) -> str:
+        return self.text
+
+
+class _Repr(str):
+    """A repr captured in place of the object; printed without quotes."""
+    
+    __slots__ = ()
+    
+    __repr__ = str.__str__
+
+
+def _restore(kind: str, payload: Any) -> Any:
+    if kind == "m":
+        return payload
+    if kind == "p":
+        type_name, data = payload
+        try:
+            return pickle.loads(data)
+        except Exception as error:
+            return _Unpicklable(type_name, error)
+    return _Repr(payload)
+
+
+def _replay_to_string(value: Any) -> str:
+    """argumentToString, except for stand-ins of objects that were not pickled."""
+    from .core import argumentToString
+    if type(value) is _Repr:
+        return str(value)
+    if type(value) is _Unpicklable:
+        return value.text
+    return argumentToString(value)
+
+
+def replay(path: str, colorize: bool = True, file: Optional[IO[str]] = None,
+           show_time: bool = False) -> int:
+    """Render a capture log as ic() would have printed it.
+    
+    Args:
+        path: The capture log.
+        colorize: Highlight the output with the current theme.
+        file: Where to write (default: stdout).
+        show_time: Start each line with the wall time of the call.
+    
+    Returns:
+        Number of calls rendered.
+    """
+    from datetime import datetime
+    from .core import IceCreamDebugger, _CallSite, _colorize
+    
+    out = file or sys.stdout
+    layout = IceCreamDebugger()
+    sites: Dict[int, Tuple[str, str, _CallSite]] = {}
+    calls = 0
+    config = OutputConfig(argToStringFunction=_replay_to_string)
+    for frame in read_capture(path):
+        if frame[0] == "site":
+            _, site_id, context, abs_context, exprs = frame
+            exprs = tuple(expr if expr is not None else _ABSENT for expr in exprs)
+            sites[site_id] = (context, abs_context, _CallSite(exprs, has_source=bool(exprs)))
+            continue
+        if frame[0] == "text":
+            # Timer report, watch change, ... stored as printed
+            _, when, thread, text = frame
+            stamp = datetime.fromtimestamp(when / 1e9).strftime("%H:%M:%S.%f")[:-3]
+        else:
+            _, site_id, when, thread, prefix, context_mode, kinds, payloads = frame
+            context, abs_context, site = sites[site_id]
+            values = tuple(_restore(kind, payload) for kind, payload in zip(kinds, payloads))
+            shown_context = {0: "", 1: context, 2: abs_context}[context_mode]
+            stamp = datetime.fromtimestamp(when / 1e9).strftime("%H:%M:%S.%f")[:-3]
+            if values:
+                text = layout._join_values(prefix, shown_context, site, values, config)
+            else:
+                # A bare ic() shows the time of the call, as when printed directly
+                text = f"{prefix}{shown_context}{stamp}"
+            calls += 1
+        if colorize:
+            text = _colorize(text)
+        if show_time:
+            text = f"{stamp} [{thread}] {text}"
+        out.write(text + "\n")
+    out.flush()
+    return calls
+
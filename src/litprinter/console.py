@@ -351,6 +351,66 @@ class Console:
         if self.quiet:
             return
         
+        output, text = self._render_print(objects, sep, end, style, markup, new_line_start)
+        self._write_quietly(output)
+        
+        # Record if enabled
+        if self.record:
+            self._record_buffer.append(Segment(text))
+    
+    async def aprint(
+        self,
+        *objects: Any,
+        sep: str = " ",
+        end: str = "\n",
+        style: Optional[str] = None,
+        justify: Optional[str] = None,
+        overflow: Optional[str] = None,
+        no_wrap: bool = False,
+        emoji: Optional[bool] = None,
+        markup: Optional[bool] = None,
+        highlight: Optional[bool] = None,
+        width: Optional[int] = None,
+        crop: bool = True,
+        soft_wrap: bool = False,
+        new_line_start: bool = False,
+    ) -> None:
+        """Print without blocking the running event loop.
+        
+        Takes the same arguments as print(). The output is rendered here and
+        queued on the loop's writer task (shared with
+        ``ic.configureOutput(asyncOutput='asyncio')``), which writes it in
+        the loop's executor, tagged with the current task name. Waits only
+        when the queue is full. Without a running loop it prints directly.
+        """
+        if self.quiet:
+            return
+        
+        from .aio import default_writer
+        
+        output, text = self._render_print(objects, sep, end, style, markup, new_line_start)
+        await default_writer().asubmit(self._write_quietly, output)
+        if self.record:
+            self._record_buffer.append(Segment(text))
+    
+    def _write_quietly(self, output: str) -> None:
+        """Write and flush, ignoring errors of the file (like print())."""
+        try:
+            self.file.write(output)
+            self.file.flush()
+        except Exception:
+            pass
+    
+    def _render_print(
+        self,
+        objects: Tuple[Any, ...],
+        sep: str,
+        end: str,
+        style: Optional[str],
+        markup: Optional[bool],
+        new_line_start: bool,
+    ) -> Tuple[str, str]:
+        """Build the output of print(): (text to write, styled text)."""
         # Convert objects to strings
         str_objects = []
         for obj in objects:
@@ -384,17 +444,7 @@ class Console:
             output = "\n"
         
         output += text + end
-        
-        # Write output
-        try:
-            self.file.write(output)
-            self.file.flush()
-        except Exception:
-            pass
-        
-        # Record if enabled
-        if self.record:
-            self._record_buffer.append(Segment(text))
+        return output, text
     
     def print_json(
         self,
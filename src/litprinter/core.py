@@ -26,18 +26,27 @@ License: MIT
 """
 
 from __future__ import print_function
+from collections import OrderedDict
 from datetime import datetime
+from enum import Enum
 from contextlib import contextmanager
-from os.path import basename, realpath
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from os.path import basename, dirname, realpath
+from time import perf_counter_ns
 from textwrap import dedent
 import ast
 import inspect
 import pprint
+import re
 import sys
+import threading
 import warnings
 import functools
+import importlib
 import json
-from typing import Any, List, Type, Optional, Dict, Callable, Union
+from types import CodeType, ModuleType
+from typing import TYPE_CHECKING, Any, List, Type, Optional, Dict, Callable, Tuple, Union
 
 # Optional imports
 try:
@@ -71,6 +80,32 @@ try:
 except ImportError:
     CyberpunkStyle = None
 
+if TYPE_CHECKING:
+    from .filters import CallSiteFilter
+    from .sampling import SamplerRegistry, SamplingPolicy
+    from .stats import CallSiteStats
+    from .timing import Timer, TimingRegistry
+    from .watch import Watch
+    from .writer import AtomicWriter, BackgroundWriter
+
+
+class _Submodules:
+    """The package's helper modules, imported on first attribute access.
+    
+    ``from litprinter import ic`` imports this module; the writer, sampling,
+    stats, formatting, highlighting, ... modules are only loaded by the
+    first call that needs them.
+    """
+    
+    def __getattr__(self, name: str) -> ModuleType:
+        module = importlib.import_module(f"{__package__}.{name}")
+        setattr(self, name, module)
+        return module
+
+
+_lazy = _Submodules()
+_STATS_MODULE = f"{__package__}.stats"
+
 # Sentinel for absent values
 _ABSENT = object()
 
@@ -94,6 +129,18 @@ NO_SOURCE_WARNING = (
 # Current style (can be changed)
 _current_style = None
 
+# Highlighter objects are reused: one formatter per style, one shared lexer
+_formatter_cache: Dict[Any, Any] = {}
+_lexer = None
+
+# LRU cache of colorized output keyed by (text, style, highlighter)
+COLORIZE_CACHE_SIZE = 512
+COLORIZE_CACHE_MAX_TEXT = 2048  # Longer texts are rarely repeated; don't cache them
+_colorize_cache: "OrderedDict[Tuple[str, Any], str]" = OrderedDict()
+_colorize_cache_lock = threading.Lock()
+_colorize_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
 def set_style(style):
     """Set the syntax highlighting style.
     
@@ -102,6 +149,8 @@ def set_style(style):
     """
     global _current_style
     _current_style = style
+    with _colorize_cache_lock:
+        _colorize_cache.clear()
 
 
 def get_style():
@@ -130,36 +179,164 @@ def _windows_color_support():
 
 
 def _create_formatter():
-    """Create a Pygments formatter with the current style."""
+    """Get the Pygments formatter for the current style, creating it once."""
     if not HAS_PYGMENTS:
         return None
     
     style = get_style()
-    if style:
-        return Terminal256Formatter(style=style)
-    return Terminal256Formatter()
+    formatter = _formatter_cache.get(style)
+    if formatter is None:
+        if style:
+            formatter = Terminal256Formatter(style=style)
+        else:
+            formatter = Terminal256Formatter()
+        _formatter_cache[style] = formatter
+    return formatter
+
+
+def _get_lexer():
+    """Get the shared Python lexer, creating it once."""
+    global _lexer
+    if _lexer is None:
+        _lexer = Python3Lexer(ensurenl=False)
+    return _lexer
 
 
 def _colorize(text: str) -> str:
-    """Apply syntax highlighting to text."""
-    if not HAS_PYGMENTS:
+    """Apply syntax highlighting to text.
+    
+    Uses the built-in table-driven highlighter unless Pygments has been
+    selected with ``highlight.set_highlighter('pygments')``. Results for
+    short texts are kept in an LRU cache keyed by the text and the current
+    style, since the same small values are printed repeatedly.
+    """
+    highlighter = _lazy.highlight.get_highlighter()
+    if highlighter == 'pygments' and not HAS_PYGMENTS:
         return text
     
+    cacheable = len(text) <= COLORIZE_CACHE_MAX_TEXT
+    if cacheable:
+        key = (text, get_style(), highlighter)
+        with _colorize_cache_lock:
+            colored = _colorize_cache.get(key)
+            if colored is not None:
+                _colorize_cache.move_to_end(key)
+                _colorize_stats["hits"] += 1
+                return colored
+            _colorize_stats["misses"] += 1
+    
     try:
-        formatter = _create_formatter()
-        lexer = Python3Lexer(ensurenl=False)
-        return highlight(text, lexer, formatter).rstrip()
+        if highlighter == 'fast':
+            colored = _lazy.highlight.highlight(text, get_style()).rstrip()
+        else:
+            colored = highlight(text, _get_lexer(), _create_formatter()).rstrip()
     except Exception:
         return text
+    
+    if cacheable:
+        with _colorize_cache_lock:
+            _colorize_cache[key] = colored
+            if len(_colorize_cache) > COLORIZE_CACHE_SIZE:
+                _colorize_cache.popitem(last=False)
+                _colorize_stats["evictions"] += 1
+    return colored
+
+
+def _colorize_output(text: str) -> str:
+    """Colorize output text, reporting the time taken when stats are on."""
+    stats = sys.modules.get(_STATS_MODULE)
+    if stats is not None and stats.MEASURING:
+        start = perf_counter_ns()
+        colored = _colorize(text)
+        stats.note_highlight(perf_counter_ns() - start)
+        return colored
+    return _colorize(text)
 
 
 def _colorized_stderr_print(text: str) -> None:
     """Print colorized text to stderr."""
-    colored = _colorize(text)
+    colored = _colorize_output(text)
     with _windows_color_support():
         print(colored, file=sys.stderr)
 
 
+def atomic_output(writer: "AtomicWriter") -> Callable[[str], None]:
+    """Build an output function that colorizes like the default one and
+    writes each record with a single ``os.write`` through ``writer``."""
+    def output(text: str) -> None:
+        colored = _colorize_output(text)
+        with _windows_color_support():
+            writer.write_record(colored)
+    
+    output.atomic_writer = writer
+    return output
+
+
+_PACKAGE_DIR = dirname(__file__)
+_STDLIB_DIR = dirname(functools.__file__)
+
+
+def _user_stacklevel() -> int:
+    """``stacklevel`` for a warning raised by the caller of this function
+    that points at the first frame outside litprinter (the user's code).
+    
+    Standard library frames between litprinter frames (singledispatch,
+    pprint) are skipped too.
+    """
+    frame = sys._getframe(2)
+    level = 2
+    while frame is not None:
+        if dirname(frame.f_code.co_filename) == _PACKAGE_DIR:
+            frame = frame.f_back
+            level += 1
+            continue
+        outer, skipped = frame, 0
+        while outer is not None and dirname(outer.f_code.co_filename) == _STDLIB_DIR:
+            outer = outer.f_back
+            skipped += 1
+        if not skipped or outer is None or dirname(outer.f_code.co_filename) != _PACKAGE_DIR:
+            break
+        frame = outer
+        level += skipped
+    return level
+
+
+def _is_loop_writer(writer: Any) -> bool:
+    """Whether ``writer`` is an asyncio LoopWriter (without importing asyncio)."""
+    aio = sys.modules.get(__package__ + ".aio")
+    return aio is not None and isinstance(writer, aio.LoopWriter)
+
+
+def _atomic_output_function(
+    atomicOutput: Union[bool, "AtomicWriter"],
+    current: Callable[[str], None],
+) -> Optional[Callable[[str], None]]:
+    """Resolve an ``atomicOutput`` setting to the output function to install.
+    
+    Returns None when the current output function should stay.
+    """
+    AtomicWriter = _lazy.writer.AtomicWriter
+    if isinstance(atomicOutput, AtomicWriter):
+        return atomic_output(atomicOutput)
+    if atomicOutput:
+        if getattr(current, "atomic_writer", None) is not None:
+            return None
+        try:
+            writer = AtomicWriter()
+        except ValueError as exc:
+            # stderr replaced by a stream without a descriptor (pytest
+            # capture, IDEs, notebooks): keep writing through it
+            warnings.warn(
+                f"{exc}; atomic output stays off", RuntimeWarning, stacklevel=_user_stacklevel()
+            )
+            return None
+        return atomic_output(writer)
+    # Turning atomic output off restores the default printer
+    if getattr(current, "atomic_writer", None) is not None:
+        return _colorized_stderr_print
+    return None
+
+
 # ============================================================================
 # Source Code Analysis
 # ============================================================================
@@ -185,10 +362,158 @@ def _is_literal(s: str) -> bool:
         return False
 
 
+# Matches every f-string prefix spelling (f, F, fr, rf, Fr, fR, FR, rF, Rf, RF)
+_FSTRING_PREFIX_RE = re.compile(r"(?:[fF][rR]?|[rR][fF])['\"]")
+
+
+def _is_fstring(s: str) -> bool:
+    """Check if a string is the source of an f-string literal."""
+    return _FSTRING_PREFIX_RE.match(s) is not None
+
+
+# ============================================================================
+# Call-site Cache
+# ============================================================================
+
+class _CallSite:
+    """Precomputed source analysis for a single ic() call site.
+    
+    A call site is identified by the code object of the calling frame and
+    the offset of the call instruction (``f_lasti``). Everything derived
+    from the source - the argument expressions and whether each one should
+    be shown next to its value - is computed once and reused afterwards.
+    
+    Attributes:
+        exprs: Source text of each argument, or ``_ABSENT`` if unavailable.
+        labels: Label prepended to each formatted value (``"expr: "`` or ``""``).
+        has_source: Whether the call node could be located in the source.
+    """
+    
+    __slots__ = ('exprs', 'labels', 'has_source')
+    
+    def __init__(self, exprs: tuple, has_source: bool):
+        self.exprs = exprs
+        self.has_source = has_source
+        self.labels = tuple(_label_for(expr) for expr in exprs)
+    
+    def label(self, index: int) -> str:
+        """Get the label for the argument at ``index``."""
+        if index < len(self.labels):
+            return self.labels[index]
+        return ''
+
+
+def _label_for(expr: Any) -> str:
+    """Build the label shown in front of a value for an argument expression.
+    
+    Literals and f-strings are evaluated in place, so showing their source
+    next to the value would be redundant - they get an empty label.
+    """
+    if expr is _ABSENT or _is_literal(expr) or _is_fstring(expr):
+        return ''
+    return f"{expr}: "
+
+
+# (code object, f_lasti) -> _CallSite
+_call_site_cache: Dict[Tuple[CodeType, int], _CallSite] = {}
+
+
+def _get_call_site(call_frame, lazy: bool = False) -> _CallSite:
+    """Get the cached analysis for the ic() call executing in ``call_frame``.
+    
+    Args:
+        call_frame: The frame that called ic().
+        lazy: The call is ``ic.lazy(...)``; lambda arguments are described
+            by the text of their body.
+    
+    Returns:
+        The _CallSite for this frame's current call instruction.
+    """
+    key = (call_frame.f_code, call_frame.f_lasti)
+    site = _call_site_cache.get(key)
+    if site is not None:
+        return site
+    
+    call_node = Source.executing(call_frame).node
+    if call_node is not None:
+        source = Source.for_frame(call_frame)
+        exprs = tuple(
+            source.get_text_with_indentation(
+                arg.body if lazy and isinstance(arg, ast.Lambda) else arg
+            )
+            for arg in call_node.args
+        )
+        site = _CallSite(exprs, has_source=True)
+    else:
+        site = _CallSite((), has_source=False)
+    
+    _call_site_cache[key] = site
+    return site
+
+
+def _warn_no_source(call_frame) -> None:
+    """Emit NO_SOURCE_WARNING attributed to the line that called ic()."""
+    module_globals = call_frame.f_globals
+    warnings.warn_explicit(
+        NO_SOURCE_WARNING,
+        RuntimeWarning,
+        call_frame.f_code.co_filename,
+        call_frame.f_lineno,
+        module=module_globals.get('__name__'),
+        registry=module_globals.setdefault('__warningregistry__', {}),
+    )
+
+
+# Formatted "file:line in func()" keyed by (code object, line, absolute path)
+_context_cache: Dict[Tuple[CodeType, int, bool], str] = {}
+
+
+@functools.lru_cache(maxsize=1024)
+def _realpath(filename: str) -> str:
+    """realpath() of a code object's filename, resolved once per file."""
+    return realpath(filename)
+
+
+def _get_context(call_frame, abs_path: bool) -> str:
+    """Get the ``file:line in func()`` context of the call in ``call_frame``.
+    
+    Everything comes from the frame's code object and line number; no
+    source lines are read and ``realpath`` runs once per file.
+    """
+    return _code_context(call_frame.f_code, call_frame.f_lineno, abs_path)
+
+
+def _code_context(code: CodeType, lineno: int, abs_path: bool) -> str:
+    """Get the ``file:line in func()`` context of ``lineno`` in ``code``."""
+    key = (code, lineno, abs_path)
+    context = _context_cache.get(key)
+    if context is not None:
+        return context
+    
+    filename = _realpath(code.co_filename) if abs_path else basename(code.co_filename)
+    func_name = code.co_name
+    if func_name != '<module>':
+        func_name = f'{func_name}()'
+    
+    context = _context_cache[key] = f"{filename}:{lineno} in {func_name}"
+    return context
+
+
+def clearCallSiteCache() -> None:
+    """Forget all cached call-site analysis and call contexts."""
+    _call_site_cache.clear()
+    _context_cache.clear()
+    _realpath.cache_clear()
+
+
 # ============================================================================
 # Argument Formatting
 # ============================================================================
 
+# Values whose pformat() output is just their repr()
+_REPR_TYPES = frozenset((int, float, complex, bool, type(None)))
+
+
 @functools.singledispatch
 def argumentToString(obj: Any) -> str:
     """Convert an argument to a string representation.
@@ -198,17 +523,31 @@ def argumentToString(obj: Any) -> str:
     
     Args:
         obj: The object to format.
-        
+    
     Returns:
         String representation of the object.
     """
-    s = DEFAULT_ARG_TO_STRING_FUNCTION(obj)
-    return s.replace('\\n', '\n')
+    cls = type(obj)
+    if cls in _REPR_TYPES:
+        return repr(obj)
+    integrations = _lazy.integrations
+    if (cls.__module__.partition('.')[0] in integrations.INTEGRATION_MODULES
+            and integrations.register_integrations(argumentToString)):
+        # NumPy/pandas formatters are registered once those libraries are in use
+        return argumentToString(obj)
+    # Timed per type; types with a slow repr are summarized instead
+    s = _lazy.reprguard._guard.format(obj, DEFAULT_ARG_TO_STRING_FUNCTION)
+    formatting = _lazy.formatting
+    return formatting.truncate(s.replace('\\n', '\n'), formatting.get_format_budget().max_chars)
 
 
 @argumentToString.register(str)
 def _format_str(obj: str) -> str:
     """Format string objects."""
+    max_chars = _lazy.formatting.get_format_budget().max_chars
+    if len(obj) > max_chars:
+        # Don't repr() megabytes only to cut them off afterwards
+        return _format_str(obj[:max_chars]) + f"... <{len(obj) - max_chars:,} more chars>"
     if '\n' in obj:
         return "'''" + obj + "'''"
     return repr(obj)
@@ -241,113 +580,199 @@ def _format_bytes(obj: bytes) -> str:
         return f"<bytes len={len(obj)}>"
 
 
+# Containers are walked iteratively under the format budget (see formatting.py);
+# nested values are still formatted through argumentToString.
+
+def _container_formatter(function: Callable[[Any], str]) -> Callable[[Any], str]:
+    """formatting.container_formatter, without importing formatting.py here."""
+    function._litprinter_walk = True
+    return function
+
+
 @argumentToString.register(dict)
+@_container_formatter
 def _format_dict(obj: dict) -> str:
     """Format dictionary objects."""
-    if len(obj) > 50:
-        return f"<dict with {len(obj)} items>"
-    
-    if not obj:
-        return "{}"
-    
-    # Small dicts with simple values on one line
-    if len(obj) <= 3:
-        simple = all(
-            isinstance(k, (str, int, float, bool)) and
-            isinstance(v, (str, int, float, bool, type(None)))
-            for k, v in obj.items()
-        )
-        if simple:
-            items = [f"{k!r}: {v!r}" for k, v in obj.items()]
-            return "{" + ", ".join(items) + "}"
-    
-    # Larger dicts with indentation
-    lines = []
-    for k, v in obj.items():
-        formatted_val = argumentToString(v)
-        if '\n' in formatted_val:
-            indented = formatted_val.replace('\n', '\n    ')
-            lines.append(f"  {k!r}: {indented}")
-        else:
-            lines.append(f"  {k!r}: {formatted_val}")
-    
-    return "{\n" + ",\n".join(lines) + "\n}"
+    return _lazy.formatting.format_container(obj, argumentToString)
 
 
 @argumentToString.register(list)
+@_container_formatter
 def _format_list(obj: list) -> str:
     """Format list objects."""
-    if len(obj) > 50:
-        return f"<list with {len(obj)} items>"
-    
-    if not obj:
-        return "[]"
-    
-    # Small lists with simple values on one line
-    if len(obj) <= 5:
-        simple = all(isinstance(x, (str, int, float, bool, type(None))) for x in obj)
-        if simple:
-            return repr(obj)
-    
-    # Larger lists with indentation
-    items = [argumentToString(x) for x in obj]
-    if all('\n' not in item for item in items):
-        joined = ", ".join(items)
-        if len(joined) < 60:
-            return "[" + joined + "]"
-    
-    formatted = ",\n  ".join(items)
-    return "[\n  " + formatted + "\n]"
+    return _lazy.formatting.format_container(obj, argumentToString)
 
 
 @argumentToString.register(tuple)
+@_container_formatter
 def _format_tuple(obj: tuple) -> str:
     """Format tuple objects."""
-    if len(obj) > 50:
-        return f"<tuple with {len(obj)} items>"
-    
-    if not obj:
-        return "()"
-    
-    if len(obj) == 1:
-        return f"({argumentToString(obj[0])},)"
-    
-    # Small tuples with simple values on one line
-    if len(obj) <= 5:
-        simple = all(isinstance(x, (str, int, float, bool, type(None))) for x in obj)
-        if simple:
-            return repr(obj)
-    
-    items = [argumentToString(x) for x in obj]
-    if all('\n' not in item for item in items):
-        joined = ", ".join(items)
-        if len(joined) < 60:
-            return "(" + joined + ")"
-    
-    formatted = ",\n  ".join(items)
-    return "(\n  " + formatted + "\n)"
+    return _lazy.formatting.format_container(obj, argumentToString)
 
 
 @argumentToString.register(set)
 @argumentToString.register(frozenset)
+@_container_formatter
 def _format_set(obj: Union[set, frozenset]) -> str:
     """Format set and frozenset objects."""
-    if len(obj) > 20:
-        return f"<{type(obj).__name__} with {len(obj)} items>"
+    return _lazy.formatting.format_container(obj, argumentToString)
+
+
+# ============================================================================
+# Formatted Value Memo
+# ============================================================================
+
+# LRU cache of argumentToString() output for immutable values printed over
+# and over (enum members, small tuples and frozensets of ints/strings/bytes),
+# keyed by (type, value) so that e.g. equal values of different types stay
+# apart. Plain ints, strings and bytes format faster than a lookup: they only
+# skip the dispatch.
+VALUE_MEMO_SIZE = 1024
+VALUE_MEMO_MAX_LEN = 256  # Longer strings, bytes and tuples are formatted each time
+_value_memo: "OrderedDict[Tuple[type, Any], str]" = OrderedDict()
+_value_memo_lock = threading.Lock()
+_value_memo_stats = {"hits": 0, "misses": 0, "bypassed": 0}
+# Budget the memoized texts were formatted under
+_value_memo_budget = None
+
+# Memoized types and the formatter each gets by default; values whose type
+# (or item type) dispatches to another, registered formatter bypass the memo
+_MEMO_FORMATTERS: Dict[type, Callable[[Any], str]] = {
+    int: argumentToString.registry[object],
+    str: _format_str,
+    bytes: _format_bytes,
+    tuple: _format_tuple,
+    frozenset: _format_set,
+}
+_MEMO_SCALARS = (int, str, bytes)
+# Enums (including str/int mixins) resolve to one of these unless overridden
+_DEFAULT_FORMATTERS = frozenset(_MEMO_FORMATTERS.values())
+
+# Whether a type dispatches to a default formatter; forgotten on registration
+_memo_dispatch: Dict[type, bool] = {}
+_dispatch_register = argumentToString.register
+
+
+def _register(cls, func=None):
+    """argumentToString.register, also forgetting which types are memoized."""
+    registered = _dispatch_register(cls, func)
+    _memo_dispatch.clear()
+    if func is None and registered is not cls:
+        # Decorator form: the formatter is registered when the decorator runs
+        def decorator(function):
+            result = registered(function)
+            _memo_dispatch.clear()
+            return result
+        return decorator
+    return registered
+
+
+argumentToString.register = _register
+
+
+def _default_formatted(cls: type) -> bool:
+    """Whether ``cls`` is formatted by the formatter it gets by default."""
+    default = _memo_dispatch.get(cls)
+    if default is None:
+        default = _memo_dispatch[cls] = argumentToString.dispatch(cls) in _DEFAULT_FORMATTERS
+    if not default:
+        # A custom formatter is registered for this type
+        _value_memo_stats["bypassed"] += 1
+    return default
+
+
+def _memoizable(value: Any) -> bool:
+    """Whether argumentToString(value) can be reused for equal values of its type."""
+    cls = type(value)
+    if cls is tuple or cls is frozenset:
+        if len(value) > VALUE_MEMO_MAX_LEN or not _default_formatted(cls):
+            return False
+        # Containers of exact int/str/bytes only
+        for item in value:
+            item_cls = type(item)
+            if item_cls not in _MEMO_SCALARS or not _default_formatted(item_cls) or (
+                item_cls is not int and len(item) > VALUE_MEMO_MAX_LEN
+            ):
+                return False
+        return True
+    return isinstance(value, Enum) and _default_formatted(cls)
+
+
+def _format_memoized(value: Any) -> str:
+    """argumentToString(value), reusing earlier output for repeated immutable values."""
+    global _value_memo_budget
+    cls = type(value)
+    if cls is int or cls is str or cls is bytes:
+        if _default_formatted(cls):
+            return _MEMO_FORMATTERS[cls](value)
+        return argumentToString(value)
+    if not _memoizable(value):
+        return argumentToString(value)
     
-    if not obj:
-        return "set()" if isinstance(obj, set) else "frozenset()"
+    key = (cls, value)
+    budget = _lazy.formatting.get_format_budget()
+    with _value_memo_lock:
+        if budget is not _value_memo_budget:
+            # Strings and tuples are cut to the budget: older texts may differ
+            _value_memo.clear()
+            _value_memo_budget = budget
+        text = _value_memo.get(key)
+        if text is not None:
+            _value_memo.move_to_end(key)
+            _value_memo_stats["hits"] += 1
+            return text
+        _value_memo_stats["misses"] += 1
     
-    try:
-        sorted_items = sorted(obj, key=str)
-        items = [argumentToString(x) for x in sorted_items]
-        
-        if len(obj) <= 5:
-            return "{" + ", ".join(items) + "}"
+    text = argumentToString(value)
+    with _value_memo_lock:
+        _value_memo[key] = text
+        if len(_value_memo) > VALUE_MEMO_SIZE:
+            _value_memo.popitem(last=False)
+    return text
+
+
+# ============================================================================
+# Output Configuration
+# ============================================================================
+
+@dataclass(frozen=True)
+class OutputConfig:
+    """Immutable output settings of an IceCreamDebugger.
+    
+    A debugger never changes a config in place: configureOutput() swaps in
+    a new one, while per-call overrides, ``bind()`` and ``configured()``
+    derive copies. A call that has picked up its config is therefore never
+    affected by other threads or asyncio tasks reconfiguring the debugger.
+    """
+    
+    prefix: Union[str, Callable[[], str]] = DEFAULT_PREFIX
+    outputFunction: Callable[[str], None] = _colorized_stderr_print
+    argToStringFunction: Callable[[Any], str] = argumentToString
+    includeContext: bool = False
+    contextAbsPath: bool = False
+    
+    def derive(self, **overrides: Any) -> "OutputConfig":
+        """Return a copy with the given settings changed.
         
-        return "{\n  " + ",\n  ".join(items) + "\n}"
-    except Exception:
-        return f"<{type(obj).__name__} with {len(obj)} items>"
+        Overrides that are None or equal to the current setting are ignored;
+        without any changes the config itself is returned.
+        """
+        changes = {
+            name: value for name, value in overrides.items()
+            if value is not None and value != getattr(self, name)
+        }
+        return replace(self, **changes) if changes else self
+
+
+def _config_property(name: str) -> property:
+    """Expose an OutputConfig field as a (legacy) debugger attribute."""
+    def fget(self):
+        return getattr(self.config, name)
+    
+    def fset(self, value):
+        self._config = replace(self._config, **{name: value})
+    
+    return property(fget, fset, doc=f"The ``{name}`` setting in effect.")
 
 
 # ============================================================================
@@ -394,11 +819,61 @@ class IceCreamDebugger:
             contextAbsPath: Whether to use absolute paths in context.
         """
         self._enabled = True
-        self._prefix = prefix
-        self._outputFunction = outputFunction
-        self._argToStringFunction = argToStringFunction
-        self._includeContext = includeContext
-        self._contextAbsPath = contextAbsPath
+        self._config = OutputConfig(
+            prefix, outputFunction, argToStringFunction, includeContext, contextAbsPath
+        )
+        # Overrides installed by configured() for the current thread/task
+        self._context_config: ContextVar[Optional[OutputConfig]] = ContextVar(
+            f"litprinter_config_{id(self):x}", default=None
+        )
+        # A BackgroundWriter or an asyncio LoopWriter
+        self._writer: Optional[Any] = None
+        self._sampling: Optional["SamplingPolicy"] = None
+        # Created on first use, like the modules they come from
+        self._sampler_registry: Optional["SamplerRegistry"] = None
+        self._timing_registry: Optional["TimingRegistry"] = None
+        import os
+        self._filter: Optional["CallSiteFilter"] = None
+        if os.environ.get("LITPRINTER_FILTER"):
+            self._filter = _lazy.filters.CallSiteFilter.from_env()
+        # Per-call-site overhead counters (None: not recording)
+        self._stats: Optional["CallSiteStats"] = None
+        if os.environ.get("LITPRINTER_STATS") and _lazy.stats.enabled_from_env():
+            self._stats = _lazy.stats.CallSiteStats()
+        # Logpoint expressions -> their labels
+        self._expression_sites: Dict[Tuple[str, ...], _CallSite] = {}
+        # Receives ic() calls instead of formatting and output (e.g. the
+        # flight recorder): an object with record(frame, args, config, lazy)
+        # and, for the other output (timers, watches, summaries), message(text)
+        self._sink: Optional[Any] = None
+    
+    @property
+    def _samplers(self) -> "SamplerRegistry":
+        """Per-site sampling state (created on first use)."""
+        registry = self._sampler_registry
+        if registry is None:
+            registry = self._sampler_registry = _lazy.sampling.SamplerRegistry(self._emit_summary)
+        return registry
+    
+    @property
+    def _timings(self) -> "TimingRegistry":
+        """Timer aggregates and ic() laps (created on first use)."""
+        registry = self._timing_registry
+        if registry is None:
+            registry = self._timing_registry = _lazy.timing.TimingRegistry(self._emit_report)
+        return registry
+    
+    # Read access to the settings of the config in effect
+    _prefix = _config_property("prefix")
+    _outputFunction = _config_property("outputFunction")
+    _argToStringFunction = _config_property("argToStringFunction")
+    _includeContext = _config_property("includeContext")
+    _contextAbsPath = _config_property("contextAbsPath")
+    
+    @property
+    def config(self) -> OutputConfig:
+        """The OutputConfig in effect for the current thread or task."""
+        return self._context_config.get() or self._config
     
     @property
     def enabled(self) -> bool:
@@ -413,6 +888,145 @@ class IceCreamDebugger:
         """Disable debugging output."""
         self._enabled = False
     
+    def configureFilter(
+        self,
+        include: Union[str, List[str], None] = None,
+        exclude: Union[str, List[str], None] = None,
+    ) -> None:
+        """Enable output only in selected modules or files.
+        
+        Patterns are globs matched against the module name of the calling
+        code (``"myapp.billing.*"``) or, if they contain a path separator
+        or end in ``.py``, against its file name. Exclude patterns win;
+        with include patterns, code matching none of them is disabled.
+        Calling it without patterns removes all filters.
+        
+        Args:
+            include: Pattern(s) of modules/files where output is enabled.
+            exclude: Pattern(s) of modules/files where output is disabled.
+        """
+        call_filter = _lazy.filters.CallSiteFilter(include or (), exclude or ())
+        # A new filter starts with an empty decision cache
+        self._filter = call_filter if call_filter.include or call_filter.exclude else None
+    
+    def _allowed(self, call_frame) -> bool:
+        """Whether the calling code passes the module/file filters."""
+        call_filter = self._filter
+        return call_filter is None or call_filter.allows(call_frame)
+    
+    def _active_code(self, code, module: str) -> bool:
+        """Whether output is enabled for code of ``module`` (for timers)."""
+        if not self._enabled:
+            return False
+        call_filter = self._filter
+        return call_filter is None or call_filter.allows_code(code, module)
+    
+    def configureTiming(
+        self,
+        cpu: Optional[bool] = None,
+        rss: Optional[bool] = None,
+        reportAtExit: Optional[bool] = None,
+    ) -> None:
+        """Configure timers and the lap deltas of bare ic() calls.
+        
+        Args:
+            cpu: Also show the CPU time used by the thread.
+            rss: Also show the change in resident memory (Linux).
+            reportAtExit: Print the timer aggregates when the program exits.
+        """
+        if cpu is not None:
+            self._timings.cpu = cpu
+        if rss is not None:
+            self._timings.rss = rss
+        if reportAtExit is not None:
+            self._timings.report_at_exit = reportAtExit
+    
+    def timer(self, label: Optional[str] = None, quiet: bool = False) -> "Timer":
+        """Measure a block (``with ic.timer():``) or a function (``@ic.timer()``).
+        
+        Args:
+            label: Name shown in the output (default: file:line of the block,
+                or the function name).
+            quiet: Only aggregate the measurements, do not print each one.
+        
+        Returns:
+            A Timer, usable as a context manager or decorator.
+        """
+        return self._timer(inspect.currentframe().f_back, label, quiet)
+    
+    def _timer(self, call_frame, label: Optional[str], quiet: bool,
+               config: Optional[OutputConfig] = None) -> "Timer":
+        """Create a timer for code running in ``call_frame``."""
+        code = call_frame.f_code
+        site = (
+            code,
+            call_frame.f_globals.get("__name__") or "",
+            (code, call_frame.f_lasti),
+            f"{basename(code.co_filename)}:{call_frame.f_lineno}",
+        )
+        
+        def report(line: str) -> None:
+            resolved = config or self.config
+            self._emit(f"{self._get_prefix(resolved)}{line}", resolved)
+        
+        return _lazy.timing.Timer(self._timings, report, self._active_code, label, site, quiet)
+    
+    def watch(self, *expressions: str, func: Optional[Callable] = None) -> "Watch":
+        """Print when watched expressions change inside a function.
+        
+        Args:
+            *expressions: Variable names or expressions such as ``"self.count"``.
+            func: The function to watch in; without it, the returned Watch
+                is a decorator choosing the function.
+        
+        Returns:
+            The Watch; ``stop()`` it (or use it as a context manager) to
+            stop watching.
+        """
+        return self._watch(expressions, func)
+    
+    def _watch(self, expressions: Tuple[str, ...], func: Optional[Callable],
+               config: Optional[OutputConfig] = None) -> "Watch":
+        """Create a watch reporting with ``config`` (default: the config in effect)."""
+        def format_value(value: Any) -> str:
+            return (config or self.config).argToStringFunction(value)
+        
+        def report(code: CodeType, lineno: int, expression: str, old: str, new: str) -> None:
+            resolved = config or self.config
+            context = _code_context(code, lineno, resolved.contextAbsPath)
+            self._emit(
+                f"{self._get_prefix(resolved)}[{context}] >>> {expression}: {old} -> {new}",
+                resolved,
+            )
+        
+        watch = _lazy.watch.Watch(expressions, format_value, report, lambda: self._enabled)
+        if func is not None:
+            watch.start(func)
+        return watch
+    
+    def timings(self, reset: bool = False) -> List[Dict[str, Any]]:
+        """Print the timer aggregates and return them.
+        
+        Args:
+            reset: Forget the aggregates afterwards.
+        
+        Returns:
+            Per-site dicts with count, p50, p95, p99, max and total (ns).
+        """
+        stats = self._timings.stats()
+        self._timings.report_now()
+        if reset:
+            self._timings.clear()
+        return stats
+    
+    def _emit_report(self, report: str) -> None:
+        """Output the timer aggregates table."""
+        config = self.config
+        prefix = self._get_prefix(config)
+        indent = " " * (len(prefix) + 2)
+        lines = [f"{prefix}timings:"] + [indent + line for line in report.splitlines()]
+        self._emit("\n".join(lines), config)
+    
     def configureOutput(
         self,
         prefix: Union[str, Callable[[], str], None] = None,
@@ -420,6 +1034,10 @@ class IceCreamDebugger:
         argToStringFunction: Optional[Callable[[Any], str]] = None,
         includeContext: Optional[bool] = None,
         contextAbsPath: Optional[bool] = None,
+        asyncOutput: Union[bool, str, "BackgroundWriter", None] = None,
+        queueSize: Optional[int] = None,
+        overflow: Optional[str] = None,
+        atomicOutput: Union[bool, "AtomicWriter", None] = None,
     ) -> None:
         """Configure output settings.
         
@@ -429,38 +1047,237 @@ class IceCreamDebugger:
             argToStringFunction: New argument formatting function.
             includeContext: Whether to include context.
             contextAbsPath: Whether to use absolute paths.
-            
+            asyncOutput: Run the output function on a background thread.
+                Pass True for a default BackgroundWriter or a writer instance,
+                or 'asyncio' to queue output on the running event loop.
+            queueSize: Bound of the background queue (implies asyncOutput).
+            overflow: Background queue overflow policy (implies asyncOutput):
+                'block', 'drop-newest', 'drop-oldest' or 'sample'
+                ('drop-newest' or 'drop-oldest' for asyncio output).
+            atomicOutput: Write each record to stderr with a single
+                ``os.write`` so output of several processes does not
+                interleave. Pass True, or an AtomicWriter for another target.
+        
         Raises:
             TypeError: If no arguments are provided.
         """
         if all(arg is None for arg in [prefix, outputFunction, argToStringFunction, 
-                                        includeContext, contextAbsPath]):
+                                        includeContext, contextAbsPath, asyncOutput,
+                                        queueSize, overflow, atomicOutput]):
             raise TypeError("configureOutput() requires at least one argument")
         
-        if prefix is not None:
-            self._prefix = prefix
-        if outputFunction is not None:
-            self._outputFunction = outputFunction
-        if argToStringFunction is not None:
-            self._argToStringFunction = argToStringFunction
-        if includeContext is not None:
-            self._includeContext = includeContext
-        if contextAbsPath is not None:
-            self._contextAbsPath = contextAbsPath
+        if atomicOutput is not None and outputFunction is None:
+            outputFunction = _atomic_output_function(atomicOutput, self._config.outputFunction)
+        self._config = self._config.derive(
+            prefix=prefix,
+            outputFunction=outputFunction,
+            argToStringFunction=argToStringFunction,
+            includeContext=includeContext,
+            contextAbsPath=contextAbsPath,
+        )
+        if asyncOutput is not None or queueSize is not None or overflow is not None:
+            self._configure_writer(asyncOutput, queueSize, overflow)
+    
+    def _configure_writer(
+        self,
+        asyncOutput: Union[bool, str, "BackgroundWriter", None],
+        queueSize: Optional[int],
+        overflow: Optional[str],
+    ) -> None:
+        """Switch between synchronous, background and asyncio output."""
+        if asyncOutput is False:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            return
+        
+        BackgroundWriter = _lazy.writer.BackgroundWriter
+        DEFAULT_QUEUE_SIZE = _lazy.writer.DEFAULT_QUEUE_SIZE
+        if isinstance(asyncOutput, BackgroundWriter) or _is_loop_writer(asyncOutput):
+            writer = asyncOutput
+        elif asyncOutput == 'asyncio' or (asyncOutput is None and _is_loop_writer(self._writer)):
+            from .aio import LoopWriter, default_writer
+            current = self._writer if _is_loop_writer(self._writer) else None
+            if queueSize is None and overflow is None:
+                writer = current or default_writer()
+            else:
+                writer = LoopWriter(
+                    maxsize=queueSize or (current.maxsize if current else DEFAULT_QUEUE_SIZE),
+                    overflow=overflow or (current.overflow if current else 'drop-oldest'),
+                )
+        else:
+            current = self._writer if isinstance(self._writer, BackgroundWriter) else None
+            writer = BackgroundWriter(
+                maxsize=queueSize or (current.maxsize if current else DEFAULT_QUEUE_SIZE),
+                overflow=overflow or (current.overflow if current else 'block'),
+            )
+        
+        if self._writer is not None and self._writer is not writer:
+            self._writer.close()
+        self._writer = writer
+    
+    @contextmanager
+    def configured(
+        self,
+        prefix: Union[str, Callable[[], str], None] = None,
+        outputFunction: Optional[Callable[[str], None]] = None,
+        argToStringFunction: Optional[Callable[[Any], str]] = None,
+        includeContext: Optional[bool] = None,
+        contextAbsPath: Optional[bool] = None,
+    ):
+        """Override output settings for the current thread or asyncio task.
+        
+        The overrides live in a context variable, so other threads and tasks
+        keep their own settings and nothing shared is modified.
+        
+        Example:
+            >>> with ic.configured(prefix='worker| ', includeContext=True):
+            ...     ic(job)
+        
+        Args:
+            prefix: Prefix string or callable returning prefix.
+            outputFunction: Function to call with formatted output.
+            argToStringFunction: Function to convert args to strings.
+            includeContext: Whether to show file/line/function.
+            contextAbsPath: Whether to use absolute paths.
+        """
+        token = self._context_config.set(self.config.derive(
+            prefix=prefix,
+            outputFunction=outputFunction,
+            argToStringFunction=argToStringFunction,
+            includeContext=includeContext,
+            contextAbsPath=contextAbsPath,
+        ))
+        try:
+            yield self
+        finally:
+            self._context_config.reset(token)
+    
+    def configureSampling(
+        self,
+        every: Optional[int] = None,
+        first: Optional[int] = None,
+        rate: Union[str, float, None] = None,
+        summaryInterval: Optional[float] = None,
+    ) -> None:
+        """Set the default sampling policy applied at every call site.
+        
+        Calling it without limits removes the default policy. Per-call
+        ``every``/``first``/``rate`` arguments take precedence.
+        
+        Args:
+            every: Print only every Nth call at each site.
+            first: Print only the first N calls at each site.
+            rate: Token-bucket rate limit per site, e.g. "10/s" or "100/m".
+            summaryInterval: Seconds between "suppressed N calls" summaries.
+        """
+        self._sampling = _lazy.sampling.SamplingPolicy.create(every, first, rate)
+        if summaryInterval is not None:
+            self._samplers.summary_interval = summaryInterval
+    
+    def _sample(
+        self,
+        call_frame,
+        every: Optional[int] = None,
+        first: Optional[int] = None,
+        rate: Union[str, float, None] = None,
+    ) -> bool:
+        """Decide whether a call is printed under the sampling policy in effect."""
+        if every is None and first is None and rate is None:
+            policy = self._sampling
+            if policy is None:
+                return True
+        else:
+            policy = self._samplers.policy_for(every, first, rate)
+        return self._samplers.allow(call_frame, policy)
+    
+    def _emit_summary(self, summary: str) -> None:
+        """Output a "suppressed N calls at file:line" line."""
+        config = self.config
+        self._emit(f"{self._get_prefix(config)}{summary}", config)
+    
+    def _print(self, call_frame, args: tuple, config: OutputConfig, lazy: bool = False) -> None:
+        """Format and output an ic() call (recording its cost if stats are on)."""
+        stats = self._stats
+        if self._sink is not None:
+            if stats is None:
+                self._sink.record(call_frame, args, config, lazy)
+                return
+            # Time in the sink is charged as format time
+            start = perf_counter_ns()
+            self._sink.record(call_frame, args, config, lazy)
+            stats.record(stats.site(call_frame), 0, perf_counter_ns() - start)
+            return
+        if stats is None:
+            self._emit(self._format(call_frame, *args, config=config, lazy=lazy), config)
+            return
+        
+        site = stats.site(call_frame)
+        phases = [0, 0]
+        output = self._format(call_frame, *args, config=config, lazy=lazy, phases=phases)
+        stats.record(site, phases[0], phases[1])
+        self._emit(output, config, site)
+    
+    def _emit(self, output: str, config: Optional[OutputConfig] = None,
+              site: Any = None) -> None:
+        """Hand formatted output to the output function (or its writer thread).
+        
+        ``site`` is the stats entry charged for highlighting and writing.
+        While a sink is installed, the output goes to the sink instead.
+        """
+        sink = self._sink
+        if sink is not None and hasattr(sink, "message"):
+            sink.message(output)
+            return
+        output_function = (config or self.config).outputFunction
+        if site is not None and self._stats is not None:
+            output_function = self._stats.measured(site, output_function)
+        if self._writer is not None:
+            self._writer.submit(output_function, output)
+        else:
+            output_function(output)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all background output has been written.
+        
+        Args:
+            timeout: Maximum number of seconds to wait (None waits forever).
+        
+        Returns:
+            True if everything was written, False on timeout.
+        """
+        if self._sink is not None and hasattr(self._sink, "flush"):
+            self._sink.flush()
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+    
+    async def aflush(self) -> None:
+        """Wait, without blocking the event loop, until queued output is written."""
+        writer = self._writer
+        if writer is None:
+            return
+        if _is_loop_writer(writer):
+            await writer.aflush()
+        else:
+            import asyncio
+            await asyncio.get_running_loop().run_in_executor(None, writer.flush)
     
     def __call__(self, *args) -> Any:
         """Debug print the arguments and return them.
         
         Args:
             *args: Values to debug print.
-            
+        
         Returns:
             None if no args, single arg if one arg, tuple if multiple.
         """
         if self._enabled:
             call_frame = inspect.currentframe().f_back
-            output = self._format(call_frame, *args)
-            self._outputFunction(output)
+            if self._allowed(call_frame) and (self._sampling is None or self._sample(call_frame)):
+                self._print(call_frame, args, self.config)
+            elif self._stats is not None:
+                self._stats.suppressed(call_frame)
         
         # Return passthrough
         if not args:
@@ -470,70 +1287,119 @@ class IceCreamDebugger:
         else:
             return args
     
+    def lazy(self, *thunks: Callable[[], Any]) -> Any:
+        """Debug print values that are only computed when they will be shown.
+        
+        Each argument is a zero-argument callable, typically a lambda. The
+        callables run only if output is enabled and the call is not sampled
+        out; the output shows the lambda body as the expression.
+        
+        Example:
+            >>> ic.lazy(lambda: compute_summary(batch))
+            ic| compute_summary(batch): {...}
+        
+        Args:
+            *thunks: Callables returning the values to print.
+        
+        Returns:
+            The computed value(s) like ic(), or None if nothing was printed.
+        """
+        if not self._enabled:
+            return None
+        call_frame = inspect.currentframe().f_back
+        if not self._allowed(call_frame) or (
+            self._sampling is not None and not self._sample(call_frame)
+        ):
+            if self._stats is not None:
+                self._stats.suppressed(call_frame)
+            return None
+        
+        values = tuple(thunk() for thunk in thunks)
+        self._print(call_frame, values, self.config, lazy=True)
+        if not values:
+            return None
+        elif len(values) == 1:
+            return values[0]
+        else:
+            return values
+    
     def format(self, *args) -> str:
         """Format arguments without printing.
         
         Args:
             *args: Values to format.
-            
+        
         Returns:
             Formatted string.
         """
         call_frame = inspect.currentframe().f_back
         return self._format(call_frame, *args)
     
-    def _format(self, call_frame, *args) -> str:
+    def _format(self, call_frame, *args, config: Optional[OutputConfig] = None,
+                lazy: bool = False, phases: Optional[List[int]] = None) -> str:
         """Internal formatting method.
         
         Args:
             call_frame: The calling frame.
             *args: Values to format.
-            
+            config: Settings to format with (default: the config in effect).
+            lazy: The values come from an ``ic.lazy(...)`` call.
+            phases: If given, nanoseconds spent in expression analysis and
+                value formatting are added to its two items.
+        
         Returns:
             Formatted string.
         """
-        prefix = self._get_prefix()
-        context = self._format_context(call_frame) if self._includeContext else ''
+        if config is None:
+            config = self.config
+        start = perf_counter_ns() if phases is not None else 0
+        # Resource counters are only read for the lap a bare ic() shows
+        lap = self._timings.lap(describe=not args)
+        prefix = self._get_prefix(config)
+        context = self._format_context(call_frame, config) if config.includeContext else ''
         
         if not args:
-            # No args - just show context or time
+            # No args - just show context, time and the lap since the last ic()
             time_str = self._format_time()
+            if lap:
+                time_str = f"{time_str} ({lap})"
+            if phases is not None:
+                phases[0] += perf_counter_ns() - start
             if context:
                 return f"{prefix}{context}{time_str}"
             return f"{prefix}{time_str}"
         
         # Format the arguments
-        return self._format_args(call_frame, prefix, context, args)
+        if phases is None:
+            return self._format_args(call_frame, prefix, context, args, config, lazy)
+        # _format_args() split in two, to time the analysis separately
+        site = _get_call_site(call_frame, lazy)
+        if not site.has_source:
+            _warn_no_source(call_frame)
+        analyzed = perf_counter_ns()
+        phases[0] += analyzed - start
+        output = self._join_values(prefix, context, site, args, config)
+        phases[1] += perf_counter_ns() - analyzed
+        return output
     
-    def _get_prefix(self) -> str:
+    def _get_prefix(self, config: Optional[OutputConfig] = None) -> str:
         """Get the current prefix string."""
-        if callable(self._prefix):
-            return self._prefix()
-        return self._prefix
+        prefix = (config or self.config).prefix
+        if callable(prefix):
+            return prefix()
+        return prefix
     
-    def _format_context(self, call_frame) -> str:
+    def _format_context(self, call_frame, config: Optional[OutputConfig] = None) -> str:
         """Format the call context (file:line in function)."""
-        frame_info = inspect.getframeinfo(call_frame)
-        
-        if self._contextAbsPath:
-            filename = realpath(frame_info.filename)
-        else:
-            filename = basename(frame_info.filename)
-        
-        lineno = frame_info.lineno
-        func_name = frame_info.function
-        
-        if func_name != '<module>':
-            func_name = f'{func_name}()'
-        
-        return f"{filename}:{lineno} in {func_name}"
+        return _get_context(call_frame, (config or self.config).contextAbsPath)
     
     def _format_time(self) -> str:
         """Format current time."""
         now = datetime.now()
         return now.strftime('%H:%M:%S.%f')[:-3]
     
-    def _format_args(self, call_frame, prefix: str, context: str, args: tuple) -> str:
+    def _format_args(self, call_frame, prefix: str, context: str, args: tuple,
+                     config: Optional[OutputConfig] = None, lazy: bool = False) -> str:
         """Format the argument values with their expressions.
         
         Args:
@@ -541,52 +1407,28 @@ class IceCreamDebugger:
             prefix: Output prefix.
             context: Context string.
             args: Argument values.
-            
+            config: Settings to format with (default: the config in effect).
+            lazy: The values come from an ``ic.lazy(...)`` call.
+        
         Returns:
             Formatted string.
         """
-        # Get the source expressions for arguments
-        call_node = Source.executing(call_frame).node
-        
-        if call_node is not None:
-            source = Source.for_frame(call_frame)
-            arg_strs = [
-                source.get_text_with_indentation(arg)
-                for arg in call_node.args
-            ]
-        else:
-            warnings.warn(NO_SOURCE_WARNING, RuntimeWarning, stacklevel=4)
-            arg_strs = [_ABSENT] * len(args)
-        
-        # Build pairs of (expression, value)
-        pairs = list(zip(arg_strs, args))
-        
-        # Format each pair
-        formatted_pairs = []
-        for expr, val in pairs:
-            val_str = self._argToStringFunction(val)
-            
-            # Check if expression is absent, a literal, or an f-string
-            # F-strings are evaluated immediately, so showing both source and value is redundant
-            is_fstring = expr is not _ABSENT and isinstance(expr, str) and (
-                expr.startswith('f"') or expr.startswith("f'") or
-                expr.startswith('F"') or expr.startswith("F'") or
-                expr.startswith('fr"') or expr.startswith("fr'") or
-                expr.startswith('rf"') or expr.startswith("rf'") or
-                expr.startswith('Fr"') or expr.startswith("Fr'") or
-                expr.startswith('fR"') or expr.startswith("fR'") or
-                expr.startswith('FR"') or expr.startswith("FR'") or
-                expr.startswith('rF"') or expr.startswith("rF'") or
-                expr.startswith('Rf"') or expr.startswith("Rf'") or
-                expr.startswith('RF"') or expr.startswith("RF'")
-            )
-            
-            if expr is _ABSENT or _is_literal(expr) or is_fstring:
-                # Just the value (skip redundant f-string source)
-                formatted_pairs.append(val_str)
-            else:
-                # Expression: value
-                formatted_pairs.append(f"{expr}: {val_str}")
+        site = _get_call_site(call_frame, lazy)
+        if not site.has_source:
+            _warn_no_source(call_frame)
+        return self._join_values(prefix, context, site, args, config)
+    
+    def _join_values(self, prefix: str, context: str, site: _CallSite, args: tuple,
+                     config: Optional[OutputConfig] = None) -> str:
+        """Lay out values behind the labels of ``site`` (shared with logpoints)."""
+        # Format each value behind its precomputed label
+        to_string = (config or self.config).argToStringFunction
+        if to_string is argumentToString:
+            to_string = _format_memoized
+        formatted_pairs = [
+            site.label(i) + to_string(val)
+            for i, val in enumerate(args)
+        ]
         
         # Join pairs
         args_str = self._pair_delimiter.join(formatted_pairs)
@@ -597,8 +1439,200 @@ class IceCreamDebugger:
         else:
             return f"{prefix}{args_str}"
     
+    def configureStats(
+        self,
+        enabled: Optional[bool] = None,
+        top: Optional[int] = None,
+        reportAtExit: Optional[bool] = None,
+    ) -> None:
+        """Record what each ic() call site costs.
+        
+        Args:
+            enabled: Start (True) or stop and forget (False) recording.
+            top: Number of sites shown by printStats() and at exit.
+            reportAtExit: Print the most expensive sites when the program exits.
+        """
+        if enabled is not None:
+            if enabled and self._stats is None:
+                self._stats = _lazy.stats.CallSiteStats()
+            elif not enabled:
+                if self._stats is not None:
+                    self._stats.close()
+                self._stats = None
+        if self._stats is not None:
+            if top is not None:
+                self._stats.top = top
+            if reportAtExit is not None:
+                self._stats.report_at_exit = reportAtExit
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-call-site counters, most expensive first.
+        
+        Calls handed to a sink (flight recorder, structured output, capture
+        log) are counted with the time spent in the sink as format_ns; their
+        highlight_ns, write_ns and bytes stay zero.
+        
+        Returns:
+            Dicts with file, line, function, calls, suppressed, analysis_ns,
+            format_ns, highlight_ns, write_ns, bytes and total_ns (empty
+            unless stats are enabled).
+        """
+        return self._stats.stats() if self._stats is not None else []
+    
+    def printStats(self, top: Optional[int] = None) -> str:
+        """Print the most expensive call sites as a Panel to stderr.
+        
+        Args:
+            top: Number of sites to show (default: the configured top).
+        
+        Returns:
+            The rendered report ('' if nothing was recorded).
+        """
+        report = self._stats.report(top) if self._stats is not None else ""
+        if report:
+            print(report, file=sys.stderr)
+        return report
+    
+    def configureRecorder(
+        self,
+        enabled: Optional[bool] = None,
+        size: Optional[int] = None,
+        path: Optional[str] = None,
+        dumpOnException: Optional[bool] = None,
+        dumpSignal: Optional[int] = None,
+    ) -> None:
+        """Record ic() calls in a ring buffer instead of printing them.
+        
+        Changing any setting starts a new, empty recorder.
+        
+        Args:
+            enabled: Start (True) or stop and discard (False) recording.
+            size: Number of records kept (default 10,000).
+            path: Keep the ring in this memory-mapped file so it survives a
+                crash (``{pid}`` is replaced by the process id).
+            dumpOnException: Dump when an exception is not handled (default).
+            dumpSignal: Dump when the process receives this signal.
+        """
+        from .recorder import FlightRecorder, DEFAULT_RECORDER_SIZE
+        
+        current = self._sink if isinstance(self._sink, FlightRecorder) else None
+        if enabled is False or (enabled is None and current is None):
+            if current is not None:
+                self._replace_sink(None)
+            return
+        self._replace_sink(FlightRecorder(
+            self,
+            size=size or (current.size if current else DEFAULT_RECORDER_SIZE),
+            path=path if path is not None else (current.path if current else None),
+            dump_on_exception=(
+                dumpOnException if dumpOnException is not None
+                else (current.dump_on_exception if current else True)
+            ),
+            dump_signal=dumpSignal,
+        ))
+    
+    def configureStructured(
+        self,
+        enabled: Optional[bool] = None,
+        sink: Any = None,
+        batchSize: Optional[int] = None,
+        maxDelay: Optional[float] = None,
+    ) -> None:
+        """Emit one JSON record per ic() call instead of colored text.
+        
+        Passing a new ``sink`` closes the current one; batch settings are
+        changed in place.
+        
+        Args:
+            enabled: Start (True) or stop (False) structured output.
+            sink: Where records go: a path or file descriptor, a text
+                stream, or a function called with batches of lines
+                (default: stderr).
+            batchSize: Number of records written together (default 64).
+            maxDelay: Seconds a record may wait for its batch (default 1).
+        """
+        from .structured import JsonLinesSink, DEFAULT_BATCH_SIZE, DEFAULT_MAX_DELAY
+        
+        current = self._sink if isinstance(self._sink, JsonLinesSink) else None
+        if enabled is False or (enabled is None and current is None and sink is None):
+            if current is not None:
+                self._replace_sink(None)
+            return
+        if current is not None and sink is None:
+            if batchSize is not None:
+                if batchSize < 1:
+                    raise ValueError("batchSize must be positive")
+                current.batch_size = batchSize
+            if maxDelay is not None:
+                current.max_delay = maxDelay
+            return
+        self._replace_sink(JsonLinesSink(
+            sink,
+            batch_size=batchSize or DEFAULT_BATCH_SIZE,
+            max_delay=maxDelay if maxDelay is not None else DEFAULT_MAX_DELAY,
+        ))
+    
+    def configureCapture(self, enabled: Optional[bool] = None, path: Optional[str] = None) -> None:
+        """Capture ic() calls to a binary log instead of printing them.
+        
+        Values are snapshotted (not formatted) at call time; the log is
+        rendered later with ``python -m litprinter replay PATH``.
+        
+        Args:
+            enabled: Start (True) or stop (False) capturing.
+            path: Log file; ``{pid}`` is replaced by the process id
+                (default: ``litprinter-{pid}.iclog``).
+        """
+        from .capture import CaptureSink
+        
+        current = self._sink if isinstance(self._sink, CaptureSink) else None
+        if enabled is False or (enabled is None and current is None and path is None):
+            if current is not None:
+                self._replace_sink(None)
+            return
+        if current is not None and path is None:
+            return
+        self._replace_sink(CaptureSink(path or "litprinter-{pid}.iclog"))
+    
+    def _replace_sink(self, sink: Any) -> None:
+        """Install ``sink`` (None: back to normal output), closing the previous one."""
+        previous, self._sink = self._sink, sink
+        if previous is not None and previous is not sink:
+            previous.close()
+    
+    def dumpRecorder(self, file: Any = None, clear: bool = False) -> int:
+        """Write the records of the flight recorder, oldest first.
+        
+        Args:
+            file: Text stream to write to (default: stderr).
+            clear: Forget the records after dumping.
+        
+        Returns:
+            Number of records written (0 without a recorder).
+        """
+        recorder = sys.modules.get(__package__ + ".recorder")
+        if recorder is None or not isinstance(self._sink, recorder.FlightRecorder):
+            return 0
+        return self._sink.dump(file, clear)
+    
+    def _log_values(self, call_frame, expressions: Tuple[str, ...], values: tuple,
+                    config: Optional[OutputConfig] = None) -> None:
+        """Output ``values`` as if ``ic(<expressions>)`` ran in ``call_frame``.
+        
+        Used by logpoints, whose expressions do not appear in the source. The
+        output always includes the context.
+        """
+        site = self._expression_sites.get(expressions)
+        if site is None:
+            site = self._expression_sites[expressions] = _CallSite(expressions, True)
+        if config is None:
+            config = self.config
+        context = _get_context(call_frame, config.contextAbsPath)
+        output = self._join_values(self._get_prefix(config), context, site, values, config)
+        self._emit(output, config)
+    
     def __repr__(self) -> str:
-        return f"<IceCreamDebugger prefix={self._prefix!r} enabled={self._enabled}>"
+        return f"<IceCreamDebugger prefix={self.config.prefix!r} enabled={self._enabled}>"
 
 
 # ============================================================================
@@ -614,13 +1648,52 @@ LITPrintDebugger = IceCreamDebugger
 # ============================================================================
 
 def clearStyleCache() -> None:
-    """Clear the style formatter cache (placeholder for compatibility)."""
-    pass
+    """Clear the per-style formatter cache, the colorized output cache and the value memo."""
+    _formatter_cache.clear()
+    with _colorize_cache_lock:
+        _colorize_cache.clear()
+        for counter in _colorize_stats:
+            _colorize_stats[counter] = 0
+    with _value_memo_lock:
+        _value_memo.clear()
+        for counter in _value_memo_stats:
+            _value_memo_stats[counter] = 0
 
 
 def getStyleCacheInfo() -> Dict[str, Any]:
-    """Get style cache information."""
-    return {"cache_size": 0, "cached_styles": []}
+    """Get style cache information.
+    
+    Returns:
+        Dict with the cached formatter styles, the colorized output cache
+        size, capacity, hits, misses and evictions, the formatted value memo
+        size, capacity, hits, misses and bypasses (custom formatters), the
+        slow repr guard counters under ``"repr_guard"``, and the summed ic()
+        call-site counters under ``"call_stats"``.
+    """
+    with _value_memo_lock:
+        memo = {
+            "value_memo_size": len(_value_memo),
+            "value_memo_maxsize": VALUE_MEMO_SIZE,
+            "value_memo_hits": _value_memo_stats["hits"],
+            "value_memo_misses": _value_memo_stats["misses"],
+            "value_memo_bypassed": _value_memo_stats["bypassed"],
+        }
+    with _colorize_cache_lock:
+        return {
+            "cache_size": len(_formatter_cache),
+            "cached_styles": [
+                getattr(style, '__name__', repr(style)) for style in _formatter_cache
+            ],
+            "colorize_cache_size": len(_colorize_cache),
+            "colorize_cache_maxsize": COLORIZE_CACHE_SIZE,
+            "colorize_hits": _colorize_stats["hits"],
+            "colorize_misses": _colorize_stats["misses"],
+            "colorize_evictions": _colorize_stats["evictions"],
+            **memo,
+            "repr_guard": _lazy.reprguard.repr_guard_info(),
+            # ic() call-site counters (all zero unless stats are enabled)
+            "call_stats": _lazy.stats.totals(),
+        }
 
 
 def isTerminalCapable() -> bool:
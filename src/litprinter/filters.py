@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Filters Module
+
+Enable ic() only in selected modules or files.
+
+A CallSiteFilter holds glob patterns that are matched against the module
+name of the calling code (``myapp.billing.*``) or, for patterns that look
+like paths, its file name (``*/billing/*.py``). Exclude patterns win over
+include patterns; with include patterns present, everything else is
+disabled.
+
+The decision is made once per code object and cached, so a call site
+that is filtered out costs a single dict lookup. Filters are immutable -
+changing them installs a new filter with an empty cache.
+
+Filters can be set from the environment, as comma-separated patterns with
+``-`` marking excludes::
+
+    LITPRINTER_FILTER="myapp.billing.*,-myapp.billing.tests.*" python app.py
+
+or at runtime:
+
+Usage:
+    from litprinter import ic
+    
+    ic.configureFilter(include=["myapp.billing.*"], exclude=["*.tests.*"])
+    ic.configureFilter()   # remove all filters
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import os
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+
+__all__ = [
+    "CallSiteFilter",
+    "FILTER_ENV",
+]
+
+FILTER_ENV = "LITPRINTER_FILTER"
+
+Patterns = Union[str, Iterable[str], None]
+
+
+def _patterns(patterns: Patterns) -> Tuple[str, ...]:
+    """Normalize a pattern or list of patterns (comma-separated strings allowed)."""
+    if patterns is None:
+        return ()
+    if isinstance(patterns, str):
+        patterns = patterns.split(",")
+    return tuple(pattern.strip() for pattern in patterns if pattern and pattern.strip())
+
+
+def _is_path_pattern(pattern: str) -> bool:
+    return "/" in pattern or os.sep in pattern or pattern.endswith(".py")
+
+
+def _matches(pattern: str, module: str, filename: str) -> bool:
+    if _is_path_pattern(pattern):
+        return fnmatchcase(filename, pattern)
+    # "pkg.*" also covers the package module "pkg" itself
+    if pattern.endswith(".*") and module == pattern[:-2]:
+        return True
+    return fnmatchcase(module, pattern)
+
+
+class CallSiteFilter:
+    """Glob filters deciding which code may print through ic().
+    
+    Attributes:
+        include: Patterns of modules/files where ic() is enabled (empty: all).
+        exclude: Patterns of modules/files where ic() is disabled.
+    """
+    
+    __slots__ = ("include", "exclude", "_decisions")
+    
+    def __init__(self, include: Patterns = (), exclude: Patterns = ()):
+        """Initialize the filter.
+        
+        Args:
+            include: Module/file glob patterns to enable ic() in.
+            exclude: Module/file glob patterns to disable ic() in.
+        """
+        self.include = _patterns(include)
+        self.exclude = _patterns(exclude)
+        # code object -> allowed
+        self._decisions: Dict[object, bool] = {}
+    
+    @classmethod
+    def from_spec(cls, spec: str) -> Optional["CallSiteFilter"]:
+        """Parse ``"pkg.*,-pkg.tests.*"`` (``-`` marks excludes).
+        
+        Returns:
+            The filter, or None if the spec has no patterns.
+        """
+        include, exclude = [], []
+        for pattern in _patterns(spec):
+            if pattern[0] in "-!":
+                exclude.append(pattern[1:])
+            else:
+                include.append(pattern)
+        if not include and not exclude:
+            return None
+        return cls(include, exclude)
+    
+    @classmethod
+    def from_env(cls) -> Optional["CallSiteFilter"]:
+        """Build the filter configured in ``LITPRINTER_FILTER``, if any."""
+        return cls.from_spec(os.environ.get(FILTER_ENV, ""))
+    
+    def allows(self, frame) -> bool:
+        """Decide whether the code running in ``frame`` may print."""
+        code = frame.f_code
+        try:
+            return self._decisions[code]
+        except KeyError:
+            return self.allows_code(code, frame.f_globals.get("__name__") or "")
+    
+    def allows_code(self, code, module: str) -> bool:
+        """Decide for a code object (None for code without one) of ``module``."""
+        try:
+            return self._decisions[code]
+        except KeyError:
+            filename = code.co_filename if code is not None else ""
+            allowed = self._decisions[code] = self.decide(module, filename)
+            return allowed
+    
+    def decide(self, module: str, filename: str) -> bool:
+        """Decide for code of ``module`` defined in ``filename``."""
+        if any(_matches(pattern, module, filename) for pattern in self.exclude):
+            return False
+        if self.include:
+            return any(_matches(pattern, module, filename) for pattern in self.include)
+        return True
+    
+    def __repr__(self) -> str:
+        return f"<CallSiteFilter include={list(self.include)} exclude={list(self.exclude)}>"
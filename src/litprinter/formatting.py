@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Formatting Module
+
+Budgeted, iterative formatting of container values for ic().
+
+Containers (dicts, lists, tuples, sets) are walked with an explicit stack
+instead of Python recursion, under a FormatBudget that limits the output
+size, the nesting depth, the number of items visited and the elapsed time.
+Once the budget is exhausted the walk stops and the containers that are
+still open are closed with ``...``, so formatting a huge object graph costs
+about as much as formatting the part that is shown.
+
+Each container is formatted once: a container met again renders as a
+back-reference ``<same as #1>`` to its first occurrence (which is labeled
+``#1``), and a container that contains itself renders as ``<cycle>``.
+Containers printed on one line and flat tuples and frozensets are simply
+repeated, since equal constants are often shared by the compiler.
+
+Long sequences and mappings are shown as a head/tail preview - the first
+items, a ``... <9,987 more items> ...`` line and the last items - instead
+of walking (or sorting) every element.
+
+Nested values are formatted with the same singledispatch function (so custom
+``argumentToString.register`` formatters still apply); only values whose
+formatter is marked with ``container_formatter`` are walked here.
+
+Usage:
+    from litprinter.formatting import FormatBudget, set_format_budget
+    
+    set_format_budget(max_chars=2000, max_depth=4)
+    set_format_budget(FormatBudget())   # back to the defaults
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+from dataclasses import dataclass, replace
+from itertools import islice
+import re
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+__all__ = [
+    "FormatBudget",
+    "DEFAULT_BUDGET",
+    "get_format_budget",
+    "set_format_budget",
+    "format_container",
+    "container_formatter",
+    "truncate",
+]
+
+
+@dataclass(frozen=True)
+class FormatBudget:
+    """Limits applied while formatting one value.
+    
+    Attributes:
+        max_chars: Maximum length of the formatted text.
+        max_depth: Containers nested deeper are shown as a placeholder.
+        max_items: Maximum number of container items visited.
+        max_seconds: Time after which the walk stops (None for no limit).
+        preview_items: Longer containers are shown as a head/tail preview.
+        preview_head: Items shown at the start of a preview.
+        preview_tail: Items shown at the end of a preview (sequences and
+            mappings only; set order is arbitrary).
+    """
+    
+    max_chars: int = 20_000
+    max_depth: int = 8
+    max_items: int = 10_000
+    max_seconds: Optional[float] = 0.2
+    preview_items: int = 50
+    preview_head: int = 10
+    preview_tail: int = 3
+
+
+DEFAULT_BUDGET = FormatBudget()
+
+_budget = DEFAULT_BUDGET
+
+
+def get_format_budget() -> FormatBudget:
+    """Get the budget used by ic() to format values."""
+    return _budget
+
+
+def set_format_budget(budget: Optional[FormatBudget] = None, **changes: Any) -> FormatBudget:
+    """Set the budget used by ic() to format values.
+    
+    Args:
+        budget: A complete FormatBudget (default: the current one).
+        **changes: FormatBudget fields to change, e.g. ``max_chars=2000``.
+    
+    Returns:
+        The new budget.
+    """
+    global _budget
+    _budget = replace(budget or _budget, **changes)
+    return _budget
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut ``text`` to ``limit`` characters, noting how much was left out."""
+    if len(text) <= limit:
+        return text
+    return f"{text[:max(limit, 0)]}... <{len(text) - max(limit, 0):,} more chars>"
+
+
+# Attribute marking a formatter whose containers are walked by this module
+_WALK_ATTR = "_litprinter_walk"
+
+
+def container_formatter(function: Callable[[Any], str]) -> Callable[[Any], str]:
+    """Mark a formatter as one whose values are walked by format_container.
+    
+    Nested values dispatching to a marked formatter are expanded on the
+    walker's stack instead of calling the formatter recursively.
+    """
+    setattr(function, _WALK_ATTR, True)
+    return function
+
+
+# ============================================================================
+# Layout
+# ============================================================================
+
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+_SIMPLE_KEY_TYPES = (str, int, float, bool)
+
+# Longest one-line rendering of a sequence with non-simple items
+_ONE_LINE_WIDTH = 60
+
+
+class _Omitted:
+    """Placeholder entry standing for the middle of a previewed container."""
+    
+    __slots__ = ("count",)
+    
+    def __init__(self, count: int):
+        self.count = count
+    
+    def text(self) -> str:
+        return f"... <{self.count:,} more items> ..."
+
+
+_EXHAUSTED = "..."
+_CYCLE = "<cycle>"
+
+# Node numbers are assigned in pre-order while walking; the text carries
+# markers that a final pass turns into dense "#n" labels (only for nodes that
+# are referenced) and back-references.
+_LABEL_MARK = "\x00{}\x01"
+_REF_MARK = "<same as \x02{}\x03>"
+_MARK_RE = re.compile("\x00(\\d+)\x01|\x02(\\d+)\x03")
+
+
+def _placeholder(obj: Any) -> str:
+    return f"<{type(obj).__name__} with {len(obj)} items>"
+
+
+def _simple_repr(value: Any, budget: FormatBudget) -> str:
+    if type(value) is str and len(value) > budget.max_chars:
+        return truncate(repr(value[:budget.max_chars]), budget.max_chars)
+    return repr(value)
+
+
+class _Frame:
+    """A container that is being formatted."""
+    
+    __slots__ = (
+        "kind", "obj", "label", "depth", "entries", "index", "parts",
+        "number", "nested", "hidden",
+    )
+    
+    def __init__(self, kind: str, obj: Any, label: Any, depth: int, entries: list,
+                 number: int):
+        self.kind = kind
+        self.obj = obj
+        self.label = label
+        self.depth = depth
+        self.entries = entries
+        self.index = 0
+        self.parts: List[Tuple[Any, str]] = []
+        self.number = number
+        # Whether any item is (or refers to) another container
+        self.nested = False
+        # Characters of markers in parts, which do not count for the layout
+        self.hidden = 0
+    
+    def finish(self) -> str:
+        """Lay the formatted items out following the container's rules."""
+        kind = self.kind
+        parts = self.parts
+        
+        if kind == "dict":
+            lines = []
+            for key, text in parts:
+                if key is None:
+                    lines.append(f"  {text}")
+                else:
+                    indented = text.replace("\n", "\n    ")
+                    lines.append(f"  {key}: {indented}")
+            return "{\n" + ",\n".join(lines) + "\n}"
+        
+        items = [text for _, text in parts]
+        if kind == "set":
+            if len(self.obj) <= 5:
+                return "{" + ", ".join(items) + "}"
+            return "{\n  " + ",\n  ".join(items) + "\n}"
+        
+        opener, closer = ("[", "]") if kind == "list" else ("(", ")")
+        if kind == "tuple" and len(self.obj) == 1 and len(items) == 1:
+            return f"({items[0]},)"
+        if all("\n" not in item for item in items):
+            joined = ", ".join(items)
+            if len(joined) - self.hidden < _ONE_LINE_WIDTH:
+                return opener + joined + closer
+        return opener + "\n  " + ",\n  ".join(items) + "\n" + closer
+
+
+# ============================================================================
+# Walker
+# ============================================================================
+
+class _Walker:
+    """Format one value under a budget, without recursion."""
+    
+    def __init__(self, to_string: Callable[[Any], str], budget: FormatBudget):
+        self.dispatch = to_string.dispatch
+        self.budget = budget
+        self.handlers = {}
+        self.items = 0
+        self.chars = 0
+        self.exhausted = False
+        self.deadline = (
+            perf_counter() + budget.max_seconds if budget.max_seconds is not None else None
+        )
+        # Identity memo: id -> node number, ids on the stack, and repeatable ids
+        self.nodes: Dict[int, int] = {}
+        self.active: Set[int] = set()
+        self.flat: Set[int] = set()
+        self.referenced = False
+    
+    def handler(self, cls: type) -> Callable[[Any], str]:
+        handler = self.handlers.get(cls)
+        if handler is None:
+            handler = self.handlers[cls] = self.dispatch(cls)
+        return handler
+    
+    def spend(self, chars: int) -> None:
+        """Account for a visited item and check the budget."""
+        budget = self.budget
+        self.items += 1
+        self.chars += chars
+        if self.items >= budget.max_items or self.chars >= budget.max_chars:
+            self.exhausted = True
+        elif self.deadline is not None and not self.items & 0x1F:
+            if perf_counter() >= self.deadline:
+                self.exhausted = True
+    
+    def leaf(self, handler: Callable[[Any], str], value: Any) -> str:
+        text = handler(value)
+        remaining = self.budget.max_chars - self.chars
+        if len(text) > remaining:
+            text = truncate(text, remaining)
+        return text
+    
+    def open(self, value: Any, label: Any, depth: int) -> Any:
+        """Format ``value`` directly, or return a _Frame to walk it."""
+        handler = self.handler(type(value))
+        if not getattr(handler, _WALK_ATTR, False):
+            return self.leaf(handler, value)
+        
+        budget = self.budget
+        if isinstance(value, dict):
+            kind = "dict"
+        elif isinstance(value, list):
+            kind = "list"
+        elif isinstance(value, tuple):
+            kind = "tuple"
+        elif isinstance(value, (set, frozenset)):
+            kind = "set"
+        else:
+            return self.leaf(handler, value)
+        
+        size = len(value)
+        if not size:
+            if kind == "set":
+                return "set()" if isinstance(value, set) else "frozenset()"
+            return {"dict": "{}", "list": "[]", "tuple": "()"}[kind]
+        
+        key = id(value)
+        number = self.nodes.get(key)
+        if number is not None and key not in self.flat:
+            if key in self.active:
+                return _CYCLE
+            self.referenced = True
+            return _REF_MARK.format(number)
+        
+        if depth > budget.max_depth:
+            return _placeholder(value)
+        
+        long = size > max(budget.preview_items, budget.preview_head + budget.preview_tail)
+        
+        if kind == "dict":
+            # Small dicts with simple values on one line
+            if size <= 3 and all(
+                isinstance(k, _SIMPLE_KEY_TYPES) and isinstance(v, _SIMPLE_TYPES)
+                for k, v in value.items()
+            ):
+                return "{" + ", ".join(
+                    f"{_simple_repr(k, budget)}: {_simple_repr(v, budget)}"
+                    for k, v in value.items()
+                ) + "}"
+            if long:
+                entries = list(islice(value.items(), budget.preview_head))
+                entries.append((None, _Omitted(size - budget.preview_head - budget.preview_tail)))
+                entries.extend(reversed(list(islice(reversed(value.items()), budget.preview_tail))))
+            else:
+                entries = list(value.items())
+        
+        elif kind == "set":
+            if long:
+                entries = [(None, item) for item in islice(value, budget.preview_head)]
+                entries.append((None, _Omitted(size - budget.preview_head)))
+            else:
+                try:
+                    entries = [(None, item) for item in sorted(value, key=str)]
+                except Exception:
+                    return _placeholder(value)
+        
+        else:
+            # Small sequences with simple values on one line
+            if size <= 5 and (kind == "list" or size > 1) and all(
+                isinstance(x, _SIMPLE_TYPES) for x in value
+            ):
+                opener, closer = ("[", "]") if kind == "list" else ("(", ")")
+                return opener + ", ".join(_simple_repr(x, budget) for x in value) + closer
+            if long:
+                entries = [(None, item) for item in value[:budget.preview_head]]
+                entries.append((None, _Omitted(size - budget.preview_head - budget.preview_tail)))
+                entries.extend((None, item) for item in value[size - budget.preview_tail:])
+            else:
+                entries = [(None, item) for item in value]
+        
+        number = len(self.nodes) + 1
+        self.nodes[key] = number
+        self.active.add(key)
+        return _Frame(kind, value, label, depth, entries, number)
+    
+    def close(self, frame: _Frame) -> str:
+        """Finish a frame and label it for back-references."""
+        text = frame.finish()
+        obj = frame.obj
+        self.active.discard(id(obj))
+        if not frame.nested and isinstance(obj, (tuple, frozenset)):
+            self.flat.add(id(obj))
+        return _LABEL_MARK.format(frame.number) + text
+    
+    def resolve(self, text: str) -> str:
+        """Turn node markers into "#n" labels and back-references."""
+        if not self.referenced:
+            return _MARK_RE.sub("", text)
+        
+        labels: Dict[str, str] = {}
+        referenced = {match for match in re.findall("\x02(\\d+)\x03", text)}
+        
+        def replace_mark(match: "re.Match") -> str:
+            label, ref = match.groups()
+            if label is not None:
+                if label not in referenced:
+                    return ""
+                labels[label] = f"#{len(labels) + 1}"
+                return labels[label] + " "
+            return labels.get(ref, "#?")
+        
+        return _MARK_RE.sub(replace_mark, text)
+    
+    def run(self, obj: Any) -> str:
+        root = self.open(obj, None, 0)
+        if not isinstance(root, _Frame):
+            return root
+        
+        stack = [root]
+        while True:
+            frame = stack[-1]
+            if frame.index < len(frame.entries) and not self.exhausted:
+                key, value = frame.entries[frame.index]
+                frame.index += 1
+                if type(value) is _Omitted:
+                    frame.parts.append((None, value.text()))
+                    continue
+                label = _simple_repr(key, self.budget) if frame.kind == "dict" else None
+                
+                result = self.open(value, label, frame.depth + 1)
+                if type(result) is _Frame:
+                    self.spend(len(label) if label else 0)
+                    frame.nested = True
+                    stack.append(result)
+                else:
+                    self.spend(len(result) + (len(label) if label else 0))
+                    if result is _CYCLE or result.startswith("<same as \x02"):
+                        frame.nested = True
+                        frame.hidden += 1
+                    frame.parts.append((label, result))
+                continue
+            
+            if frame.index < len(frame.entries):
+                # Out of budget: close the container without its other items
+                frame.parts.append((None, _EXHAUSTED))
+                frame.index = len(frame.entries)
+            
+            stack.pop()
+            if not stack:
+                # The root is never referenced other than by a cycle
+                text = frame.finish()
+                if len(self.nodes) > 1:
+                    text = self.resolve(text)
+                return truncate(text, self.budget.max_chars)
+            text = self.close(frame)
+            parent = stack[-1]
+            parent.hidden += frame.hidden + len(_LABEL_MARK.format(frame.number))
+            parent.parts.append((frame.label, text))
+
+
+def format_container(
+    obj: Any,
+    to_string: Callable[[Any], str],
+    budget: Optional[FormatBudget] = None,
+) -> str:
+    """Format a dict, list, tuple or set (and everything nested in it).
+    
+    Args:
+        obj: The container to format.
+        to_string: The singledispatch formatter used for nested values.
+        budget: Limits to apply (default: the budget set for ic()).
+    
+    Returns:
+        The formatted text, at most ``budget.max_chars`` long plus a
+        truncation note.
+    """
+    return _Walker(to_string, budget or _budget).run(obj)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Highlight Module
+
+A fast, table-driven syntax highlighter for ic() output and code snippets.
+
+Pygments lexes text through a stack of regex state machines and emits a
+token stream that a formatter then walks; for short repr strings and single
+source lines that machinery dominates the cost of printing. This module
+instead scans text with one compiled regex that recognizes Python's lexical
+classes (strings, numbers, names, operators, ...), and maps each class to a
+precomputed ANSI escape sequence.
+
+The escape sequences come from a per-theme lookup table built once from any
+Pygments-compatible Style class (the ``coloring`` and ``styles`` themes),
+using the same xterm-256 color approximation as Pygments'
+Terminal256Formatter. Once a table is built, highlighting never touches
+Pygments; without Pygments installed a basic 16-color table is used.
+
+Usage:
+    from litprinter.highlight import highlight, set_highlighter
+    from litprinter.coloring import MonokaiStyle
+    
+    print(highlight("x = {'a': [1, 2.5, None]}", MonokaiStyle))
+    
+    set_highlighter("pygments")   # use Pygments for ic() and tracebacks
+    set_highlighter("fast")       # back to the built-in engine (default)
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import builtins
+import keyword
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+__all__ = [
+    "highlight",
+    "get_theme_table",
+    "set_highlighter",
+    "get_highlighter",
+    "HIGHLIGHTERS",
+]
+
+HIGHLIGHTERS = ("fast", "pygments")
+
+_highlighter = "fast"
+
+
+def set_highlighter(name: str) -> None:
+    """Select the highlighter used for ic() output and traceback code.
+    
+    Args:
+        name: "fast" for the built-in engine or "pygments".
+    
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    global _highlighter
+    if name not in HIGHLIGHTERS:
+        raise ValueError(
+            f"Unknown highlighter {name!r}; expected one of {', '.join(HIGHLIGHTERS)}"
+        )
+    _highlighter = name
+
+
+def get_highlighter() -> str:
+    """Get the name of the selected highlighter."""
+    return _highlighter
+
+
+# ============================================================================
+# Lexical Scanner
+# ============================================================================
+
+# One alternation per lexical class; the group name selects the table entry.
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<comment>\#[^\n]*)
+    |(?P<string>[rRbBuUfF]{0,2}
+        (?:'''[\s\S]*?(?:'''|\Z)
+          |\"\"\"[\s\S]*?(?:\"\"\"|\Z)
+          |'(?:[^'\\\n]|\\.)*(?:'|(?=\n)|\Z)
+          |"(?:[^"\\\n]|\\.)*(?:"|(?=\n)|\Z)))
+    |(?P<number>0[xX][0-9a-fA-F_]+|0[bB][01_]+|0[oO][0-7_]+
+        |(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?[jJ]?)
+    |(?P<decorator>@[^\W\d][\w.]*)
+    |(?P<name>[^\W\d]\w*)
+    |(?P<op>\*\*=?|//=?|>>=?|<<=?|->|:=|!=|[-+*/%&|^~<>=]=?)
+    |(?P<punct>[()\[\]{},:;.@])
+    |(?P<other>.)
+    """,
+    re.VERBOSE,
+)
+
+_CONSTANTS = frozenset(("True", "False", "None"))
+_WORD_OPERATORS = frozenset(("and", "or", "not", "in", "is"))
+_KEYWORDS = frozenset(keyword.kwlist) - _CONSTANTS - _WORD_OPERATORS
+_PSEUDO_BUILTINS = frozenset(("self", "cls", "Ellipsis", "NotImplemented", "__debug__"))
+# Only genuine builtins - not names such as ``ic`` installed into the module
+_BUILTINS = frozenset(
+    name for name, value in vars(builtins).items()
+    if not name.startswith("_") and getattr(value, "__module__", None) == "builtins"
+)
+_EXCEPTIONS = frozenset(
+    name for name in _BUILTINS
+    if isinstance(getattr(builtins, name), type)
+    and issubclass(getattr(builtins, name), BaseException)
+)
+
+# Token classes produced by the scanner, with the Pygments token type each
+# one is looked up as when building a theme table.
+TOKEN_TYPES = {
+    "comment": "Comment.Single",
+    "string": "Literal.String",
+    "number": "Literal.Number",
+    "keyword": "Keyword",
+    "constant": "Keyword.Constant",
+    "operator_word": "Operator.Word",
+    "builtin": "Name.Builtin",
+    "builtin_pseudo": "Name.Builtin.Pseudo",
+    "exception": "Name.Exception",
+    "function": "Name.Function",
+    "class": "Name.Class",
+    "decorator": "Name.Decorator",
+    "name": "Name",
+    "operator": "Operator",
+    "punctuation": "Punctuation",
+    "text": "Text",
+}
+
+
+def _classify_name(word: str, previous: Optional[str]) -> str:
+    """Map an identifier to its token class, given the preceding keyword."""
+    if previous == "def":
+        return "function"
+    if previous == "class":
+        return "class"
+    if word in _KEYWORDS:
+        return "keyword"
+    if word in _CONSTANTS:
+        return "constant"
+    if word in _WORD_OPERATORS:
+        return "operator_word"
+    if word in _PSEUDO_BUILTINS:
+        return "builtin_pseudo"
+    if word in _EXCEPTIONS:
+        return "exception"
+    if word in _BUILTINS:
+        return "builtin"
+    return "name"
+
+
+_GROUP_CLASSES = {
+    "comment": "comment",
+    "string": "string",
+    "number": "number",
+    "decorator": "decorator",
+    "op": "operator",
+    "punct": "punctuation",
+    "other": "text",
+}
+
+
+# ============================================================================
+# Theme Tables
+# ============================================================================
+
+# Escape sequences as (start, end) per token class
+ThemeTable = Dict[str, Tuple[str, str]]
+
+# Basic 16-color table, used when no Style class is available
+_BASIC_TABLE: ThemeTable = {
+    "comment": ("\x1b[90m", "\x1b[39m"),
+    "string": ("\x1b[32m", "\x1b[39m"),
+    "number": ("\x1b[36m", "\x1b[39m"),
+    "keyword": ("\x1b[35m", "\x1b[39m"),
+    "constant": ("\x1b[35m", "\x1b[39m"),
+    "operator_word": ("\x1b[35m", "\x1b[39m"),
+    "builtin": ("\x1b[36m", "\x1b[39m"),
+    "builtin_pseudo": ("\x1b[36m", "\x1b[39m"),
+    "exception": ("\x1b[31m", "\x1b[39m"),
+    "function": ("\x1b[34m", "\x1b[39m"),
+    "class": ("\x1b[33m", "\x1b[39m"),
+    "decorator": ("\x1b[33m", "\x1b[39m"),
+    "name": ("", ""),
+    "operator": ("", ""),
+    "punctuation": ("", ""),
+    "text": ("", ""),
+}
+
+_tables: Dict[Any, ThemeTable] = {}
+_tables_lock = threading.Lock()
+
+
+def _xterm_palette() -> Tuple[Tuple[int, int, int], ...]:
+    """Build the xterm 256-color palette (as Pygments' Terminal256Formatter)."""
+    palette = [
+        (0x00, 0x00, 0x00), (0xcd, 0x00, 0x00), (0x00, 0xcd, 0x00), (0xcd, 0xcd, 0x00),
+        (0x00, 0x00, 0xee), (0xcd, 0x00, 0xcd), (0x00, 0xcd, 0xcd), (0xe5, 0xe5, 0xe5),
+        (0x7f, 0x7f, 0x7f), (0xff, 0x00, 0x00), (0x00, 0xff, 0x00), (0xff, 0xff, 0x00),
+        (0x5c, 0x5c, 0xff), (0xff, 0x00, 0xff), (0x00, 0xff, 0xff), (0xff, 0xff, 0xff),
+    ]
+    steps = (0x00, 0x5f, 0x87, 0xaf, 0xd7, 0xff)
+    for r in steps:
+        for g in steps:
+            for b in steps:
+                palette.append((r, g, b))
+    for i in range(24):
+        level = 8 + i * 10
+        palette.append((level, level, level))
+    return tuple(palette)
+
+
+_PALETTE = _xterm_palette()
+_color_index_cache: Dict[str, int] = {}
+
+
+def _closest_color(hex_color: str) -> int:
+    """Find the xterm-256 index closest to a ``rrggbb`` hex color."""
+    index = _color_index_cache.get(hex_color)
+    if index is not None:
+        return index
+    r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+    best, best_distance = 0, 257 * 257 * 3
+    # Like Pygments, skip the last two grays when matching
+    for i, (pr, pg, pb) in enumerate(_PALETTE[:254]):
+        distance = (pr - r) ** 2 + (pg - g) ** 2 + (pb - b) ** 2
+        if distance < best_distance:
+            best, best_distance = i, distance
+    _color_index_cache[hex_color] = best
+    return best
+
+
+def _escape_for(token_style: Dict[str, Any]) -> Tuple[str, str]:
+    """Turn a Pygments ``style_for_token`` dict into (start, end) escapes."""
+    start, end = [], []
+    color = token_style.get("color")
+    if color:
+        start.append(f"38;5;{_closest_color(color)}")
+        end.append("39")
+    bgcolor = token_style.get("bgcolor")
+    if bgcolor:
+        start.append(f"48;5;{_closest_color(bgcolor)}")
+        end.append("49")
+    if token_style.get("bold"):
+        start.append("01")
+        end.append("22")
+    if token_style.get("italic"):
+        start.append("03")
+        end.append("23")
+    if token_style.get("underline"):
+        start.append("04")
+        end.append("24")
+    if not start:
+        return ("", "")
+    return (f"\x1b[{';'.join(start)}m", f"\x1b[{';'.join(end)}m")
+
+
+def _build_table(style: Any) -> ThemeTable:
+    """Precompute the escape sequence of every token class for ``style``."""
+    try:
+        from pygments.token import string_to_tokentype
+    except ImportError:
+        return dict(_BASIC_TABLE)
+    
+    table: ThemeTable = {}
+    for token_class, token_path in TOKEN_TYPES.items():
+        try:
+            token_style = style.style_for_token(string_to_tokentype(token_path))
+        except Exception:
+            table[token_class] = _BASIC_TABLE[token_class]
+            continue
+        table[token_class] = _escape_for(token_style)
+    return table
+
+
+def get_theme_table(style: Any = None) -> ThemeTable:
+    """Get the (cached) escape table for a Style class.
+    
+    Args:
+        style: A Pygments-compatible Style class, or None for basic colors.
+    
+    Returns:
+        Mapping of token class to (start, end) escape sequences.
+    """
+    if style is None:
+        return _BASIC_TABLE
+    table = _tables.get(style)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(style)
+            if table is None:
+                table = _build_table(style)
+                _tables[style] = table
+    return table
+
+
+# ============================================================================
+# Highlighting
+# ============================================================================
+
+def highlight(text: str, style: Any = None) -> str:
+    """Highlight Python-like text with ANSI colors.
+    
+    Works on complete or partial source (single lines, repr output,
+    ``ic|`` records); unterminated strings are colored up to the end of
+    the line.
+    
+    Args:
+        text: The text to highlight.
+        style: A Pygments-compatible Style class, or None for basic colors.
+    
+    Returns:
+        The text with ANSI escape sequences inserted.
+    """
+    table = get_theme_table(style)
+    parts = []
+    append = parts.append
+    previous_keyword = None
+    
+    for match in _TOKEN_RE.finditer(text):
+        group = match.lastgroup
+        value = match.group()
+        if group == "ws":
+            append(value)
+            continue
+        if group == "name":
+            token_class = _classify_name(value, previous_keyword)
+            previous_keyword = value if value in ("def", "class") else None
+        else:
+            token_class = _GROUP_CLASSES[group]
+            previous_keyword = None
+        
+        start, end = table[token_class]
+        if start:
+            append(start)
+            append(value)
+            append(end)
+        else:
+            append(value)
+    
+    return "".join(parts)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Integrations Module
+
+Summary formatters for NumPy arrays and pandas DataFrames/Series.
+
+Building the full text of a large array or frame is slow, and the text is
+not what one wants to see in ic() output anyway. These formatters show the
+shape, dtype and memory size, a head/tail preview and vectorized statistics
+(min, max, mean and NaN count) instead; small values keep their usual repr.
+
+litprinter never imports NumPy or pandas itself. The formatters are
+registered with argumentToString the first time ic() is given an object
+from one of those libraries, and only for libraries that are already in
+``sys.modules``.
+
+Usage:
+    import numpy as np
+    from litprinter import ic
+    
+    ic(np.random.rand(10_000_000))
+    # ic| np.random.rand(10_000_000): ndarray(shape=(10000000,), dtype=float64, nbytes=76.3 MiB)
+    #       head: [0.417, 0.72, 0.000114, ...]
+    #       tail: [..., 0.0923, 0.186, 0.346]
+    #       min=1.19e-08, max=1, mean=0.5, nan=0
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import functools
+import sys
+import warnings
+from typing import Any, Callable, Dict, List, Set
+
+from .formatting import get_format_budget, truncate
+
+
+__all__ = [
+    "INTEGRATION_MODULES",
+    "register_integrations",
+    "format_ndarray",
+    "format_dataframe",
+    "format_series",
+]
+
+# Arrays with more elements are summarized without statistics
+STATS_MAX_ELEMENTS = 50_000_000
+
+# Columns listed (and summarized) for wide DataFrames
+MAX_COLUMNS = 20
+
+# NaNs in object/string columns are counted element by element in Python;
+# longer columns are reported without a count
+OBJECT_STATS_MAX_ROWS = 1_000_000
+
+_registered: Set[str] = set()
+
+
+def _format_size(nbytes: int) -> str:
+    """Format a byte count as e.g. ``76.3 MiB``."""
+    size = float(nbytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{int(size)} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def _format_number(value: Any) -> str:
+    """Format a NumPy/Python scalar compactly."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return repr(value)
+
+
+def _format_items(values: List[Any]) -> str:
+    """Format a short list of scalars for a preview line."""
+    max_chars = get_format_budget().max_chars
+    return ", ".join(truncate(_format_number(value), max_chars) for value in values)
+
+
+# ============================================================================
+# NumPy
+# ============================================================================
+
+def _array_stats(np: Any, arr: Any) -> str:
+    """Vectorized min/max/mean/NaN count of a numeric array."""
+    if arr.size > STATS_MAX_ELEMENTS:
+        return f"stats skipped ({arr.size:,} elements)"
+    
+    kind = arr.dtype.kind
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore")
+        if kind == "f":
+            nan = int(np.count_nonzero(np.isnan(arr)))
+            if nan == arr.size:
+                return f"nan={nan:,}"
+            if nan:
+                low, high, mean = np.nanmin(arr), np.nanmax(arr), np.nanmean(arr)
+            else:
+                low, high, mean = arr.min(), arr.max(), arr.mean()
+        elif kind in "iub":
+            nan = 0
+            low, high, mean = arr.min(), arr.max(), arr.mean()
+        else:
+            return ""
+    return (
+        f"min={_format_number(low)}, max={_format_number(high)}, "
+        f"mean={_format_number(mean)}, nan={nan:,}"
+    )
+
+
+def format_ndarray(arr: Any) -> str:
+    """Format a NumPy array: small arrays as their repr, large ones as a summary.
+    
+    Args:
+        arr: A ``numpy.ndarray``.
+    
+    Returns:
+        The array repr, or shape/dtype/size, head/tail preview and statistics.
+    """
+    budget = get_format_budget()
+    if arr.size <= budget.preview_items:
+        return truncate(repr(arr), budget.max_chars)
+    
+    np = sys.modules["numpy"]
+    head = arr.flat[:budget.preview_head].tolist()
+    tail = arr.flat[arr.size - budget.preview_tail:].tolist()
+    lines = [
+        f"{type(arr).__name__}(shape={arr.shape}, dtype={arr.dtype}, "
+        f"nbytes={_format_size(arr.nbytes)})",
+        f"  head: [{_format_items(head)}, ...]",
+        f"  tail: [..., {_format_items(tail)}]",
+    ]
+    stats = _array_stats(np, arr)
+    if stats:
+        lines.append(f"  {stats}")
+    return "\n".join(lines)
+
+
+# ============================================================================
+# pandas
+# ============================================================================
+
+def _column_stats(frame: Any) -> List[str]:
+    """Vectorized per-column statistics of (the first columns of) a DataFrame."""
+    frame = frame.iloc[:, :MAX_COLUMNS]
+    labels = list(frame.columns)
+    # Column labels may repeat: address the columns by position
+    frame = frame.set_axis(range(len(labels)), axis=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        numeric = frame.select_dtypes(include="number")
+        low, high, mean = numeric.min(), numeric.max(), numeric.mean()
+        if len(frame) <= OBJECT_STATS_MAX_ROWS:
+            nan = frame.isna().sum()
+        else:
+            nan = numeric.isna().sum()
+    
+    lines = []
+    for position, column in enumerate(labels):
+        if position in numeric.columns:
+            lines.append(
+                f"{column}: min={_format_number(low[position])}, "
+                f"max={_format_number(high[position])}, "
+                f"mean={_format_number(mean[position])}, nan={int(nan[position]):,}"
+            )
+        elif position in nan.index:
+            lines.append(f"{column}: nan={int(nan[position]):,}")
+        else:
+            lines.append(f"{column}: {frame.dtypes[position]}")
+    return lines
+
+
+def _indent(text: str, prefix: str = "    ") -> str:
+    return "\n".join(prefix + line for line in text.splitlines())
+
+
+def format_dataframe(frame: Any) -> str:
+    """Format a pandas DataFrame: small frames as their repr, large ones as a summary.
+    
+    Args:
+        frame: A ``pandas.DataFrame``.
+    
+    Returns:
+        The frame repr, or shape/memory/columns, head/tail rows and
+        per-column statistics.
+    """
+    budget = get_format_budget()
+    rows, columns = frame.shape
+    if rows <= budget.preview_items and columns <= MAX_COLUMNS:
+        return truncate(repr(frame), budget.max_chars)
+    
+    memory = int(frame.memory_usage(index=True, deep=False).sum())
+    listed = ", ".join(
+        f"{column} ({dtype})" for column, dtype in list(frame.dtypes.items())[:MAX_COLUMNS]
+    )
+    if columns > MAX_COLUMNS:
+        listed += f", ... <{columns - MAX_COLUMNS:,} more columns>"
+    
+    lines = [
+        f"{type(frame).__name__}(shape={frame.shape}, memory={_format_size(memory)})",
+        f"  columns: {listed}",
+        "  head:",
+        _indent(frame.head(budget.preview_head).to_string(max_cols=MAX_COLUMNS)),
+        "  tail:",
+        _indent(frame.tail(budget.preview_tail).to_string(max_cols=MAX_COLUMNS)),
+    ]
+    if rows:
+        lines.append("  stats:")
+        lines.extend(f"    {line}" for line in _column_stats(frame))
+    return truncate("\n".join(lines), budget.max_chars)
+
+
+def format_series(series: Any) -> str:
+    """Format a pandas Series: short series as their repr, long ones as a summary.
+    
+    Args:
+        series: A ``pandas.Series``.
+    
+    Returns:
+        The series repr, or length/dtype/memory, head/tail values and statistics.
+    """
+    budget = get_format_budget()
+    if len(series) <= budget.preview_items:
+        return truncate(repr(series), budget.max_chars)
+    
+    memory = int(series.memory_usage(index=True, deep=False))
+    lines = [
+        f"{type(series).__name__}(name={series.name!r}, length={len(series):,}, "
+        f"dtype={series.dtype}, memory={_format_size(memory)})",
+        f"  head: [{_format_items(series.iloc[:budget.preview_head].tolist())}, ...]",
+        f"  tail: [..., {_format_items(series.iloc[-budget.preview_tail:].tolist())}]",
+    ]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        numeric = series.dtype.kind in "iufb"
+        if not numeric and len(series) > OBJECT_STATS_MAX_ROWS:
+            return "\n".join(lines)
+        nan = int(series.isna().sum())
+        if numeric and nan < len(series):
+            lines.append(
+                f"  min={_format_number(series.min())}, max={_format_number(series.max())}, "
+                f"mean={_format_number(series.mean())}, nan={nan:,}"
+            )
+        else:
+            lines.append(f"  nan={nan:,}")
+    return "\n".join(lines)
+
+
+# ============================================================================
+# Registration
+# ============================================================================
+
+def _or_repr(formatter: Callable[[Any], str]) -> Callable[[Any], str]:
+    """Wrap a formatter so that a failing summary falls back to the repr."""
+    @functools.wraps(formatter)
+    def format_value(value: Any) -> str:
+        try:
+            return formatter(value)
+        except Exception:
+            return truncate(repr(value), get_format_budget().max_chars)
+    
+    return format_value
+
+
+def _register_numpy(to_string: Callable[[Any], str], numpy: Any) -> None:
+    to_string.register(numpy.ndarray)(_or_repr(format_ndarray))
+
+
+def _register_pandas(to_string: Callable[[Any], str], pandas: Any) -> None:
+    to_string.register(pandas.DataFrame)(_or_repr(format_dataframe))
+    to_string.register(pandas.Series)(_or_repr(format_series))
+
+
+_INTEGRATIONS: Dict[str, Callable[[Callable[[Any], str], Any], None]] = {
+    "numpy": _register_numpy,
+    "pandas": _register_pandas,
+}
+
+# Top-level packages whose objects may have a formatter here
+INTEGRATION_MODULES = frozenset(_INTEGRATIONS)
+
+
+def register_integrations(to_string: Callable[[Any], str]) -> bool:
+    """Register the formatters of every supported library that is imported.
+    
+    Libraries that are not in ``sys.modules`` are skipped (never imported),
+    and each library is registered only once.
+    
+    Args:
+        to_string: The singledispatch function to register formatters with.
+    
+    Returns:
+        True if any formatter was newly registered.
+    """
+    added = False
+    for name, register in _INTEGRATIONS.items():
+        if name in _registered:
+            continue
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        try:
+            register(to_string, module)
+        except AttributeError:
+            # Still being imported; try again on a later call
+            continue
+        _registered.add(name)
+        added = True
+    return added
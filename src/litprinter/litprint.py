@@ -20,15 +20,26 @@ Usage:
     
     # Format without printing
     s = ic.format(x)
+    
+    # Preconfigured debuggers and thread/task-local settings
+    db_ic = ic.bind(prefix='db| ', includeContext=True)
+    with ic.configured(prefix='worker| '):
+        ic(x)
 
 Author: OEvortex <helpingai5@gmail.com>
 License: MIT
 """
 
 import inspect
-from typing import Any, Callable, Optional, Union
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .core import IceCreamDebugger, OutputConfig, argumentToString, _colorized_stderr_print, _atomic_output_function, set_style, get_style
 
-from .core import IceCreamDebugger, argumentToString, _colorized_stderr_print, set_style, get_style
+if TYPE_CHECKING:
+    from .timing import Timer
+    from .watch import Watch
+    from .writer import AtomicWriter, BackgroundWriter
 
 
 # ============================================================================
@@ -42,62 +53,125 @@ class _IceCreamWrapper:
         ic(x)  # Call like a function
         ic.configureOutput(...)  # Access methods
         ic.disable() / ic.enable()  # Toggle
+        ic.bind(prefix='db| ')  # Preconfigured ic
     """
     
-    def __init__(self):
-        self._debugger = IceCreamDebugger()
+    def __init__(
+        self,
+        debugger: Optional[IceCreamDebugger] = None,
+        config: Optional[OutputConfig] = None,
+    ):
+        self._debugger = debugger if debugger is not None else IceCreamDebugger()
+        # Output settings fixed by bind(); None follows the debugger's config
+        self._bound = config
+        # Configs derived for per-call overrides: (includeContext,
+        # contextAbsPath) -> (base config, derived config)
+        self._overridden: Dict[Tuple[Optional[bool], Optional[bool]],
+                               Tuple[OutputConfig, OutputConfig]] = {}
     
     def __call__(self, *args, includeContext: Optional[bool] = None, 
-                 contextAbsPath: Optional[bool] = None) -> Any:
+                 contextAbsPath: Optional[bool] = None, every: Optional[int] = None,
+                 first: Optional[int] = None, rate: Union[str, float, None] = None) -> Any:
         """Debug print arguments and return them.
         
         Args:
             *args: Values to debug print.
             includeContext: Override context setting for this call.
             contextAbsPath: Override path setting for this call.
-            
+            every: Only print every Nth call at this call site.
+            first: Only print the first N calls at this call site.
+            rate: Rate limit for this call site, e.g. "10/s".
+        
         Returns:
             None if no args, single arg if one arg, tuple if multiple.
         """
-        # Save original settings for per-call overrides
-        orig_context = self._debugger._includeContext
-        orig_abs_path = self._debugger._contextAbsPath
+        return self._call(sys._getframe(1), args, includeContext, contextAbsPath,
+                          every, first, rate)
+    
+    def _call(self, call_frame, args: tuple, includeContext: Optional[bool] = None,
+              contextAbsPath: Optional[bool] = None, every: Optional[int] = None,
+              first: Optional[int] = None, rate: Union[str, float, None] = None) -> Any:
+        """Debug print ``args`` as if ic() had been called from ``call_frame``.
         
-        try:
-            # Apply per-call overrides
-            if includeContext is not None:
-                self._debugger._includeContext = includeContext
-            if contextAbsPath is not None:
-                self._debugger._contextAbsPath = contextAbsPath
-            
-            if not self._debugger.enabled:
-                # Return passthrough even when disabled
-                if not args:
-                    return None
-                elif len(args) == 1:
-                    return args[0]
-                else:
-                    return args
-            
-            # Get the caller's frame
-            call_frame = inspect.currentframe().f_back
-            
-            # Format and output
-            output = self._debugger._format(call_frame, *args)
-            self._debugger._outputFunction(output)
-            
-            # Return passthrough
-            if not args:
-                return None
-            elif len(args) == 1:
-                return args[0]
-            else:
-                return args
-                
-        finally:
-            # Restore original settings
-            self._debugger._includeContext = orig_context
-            self._debugger._contextAbsPath = orig_abs_path
+        This is the shared implementation behind ``__call__``; it is also
+        used by the lazy builtins stub, which forwards the caller's frame.
+        """
+        debugger = self._debugger
+        if debugger.enabled:
+            if debugger._allowed(call_frame) and debugger._sample(call_frame, every, first, rate):
+                # Format and output
+                debugger._print(call_frame, args, self._config_for(includeContext, contextAbsPath))
+            elif debugger._stats is not None:
+                debugger._stats.suppressed(call_frame)
+        
+        # Return passthrough (even when disabled or sampled out)
+        if not args:
+            return None
+        elif len(args) == 1:
+            return args[0]
+        else:
+            return args
+    
+    def _config_for(self, includeContext: Optional[bool],
+                    contextAbsPath: Optional[bool]) -> OutputConfig:
+        """Get the config for a call, with its per-call overrides applied.
+        
+        Overrides apply to a derived config; nothing shared changes.
+        """
+        config = self._bound or self._debugger.config
+        if includeContext is not None or contextAbsPath is not None:
+            key = (includeContext, contextAbsPath)
+            derived = self._overridden.get(key)
+            if derived is None or derived[0] is not config:
+                derived = self._overridden[key] = (config, config.derive(
+                    includeContext=includeContext, contextAbsPath=contextAbsPath))
+            config = derived[1]
+        return config
+    
+    def lazy(self, *thunks: Callable[[], Any], includeContext: Optional[bool] = None,
+             contextAbsPath: Optional[bool] = None, every: Optional[int] = None,
+             first: Optional[int] = None, rate: Union[str, float, None] = None) -> Any:
+        """Debug print values that are only computed when they will be shown.
+        
+        Each argument is a zero-argument callable, typically a lambda. The
+        callables run only if output is enabled and this call site is not
+        sampled out, so debug-only computations cost almost nothing when
+        disabled. The output shows the lambda body as the expression.
+        
+        Example:
+            >>> ic.lazy(lambda: compute_summary(batch), every=100)
+            ic| compute_summary(batch): {...}
+        
+        Args:
+            *thunks: Callables returning the values to print.
+            includeContext: Override context setting for this call.
+            contextAbsPath: Override path setting for this call.
+            every: Only print every Nth call at this call site.
+            first: Only print the first N calls at this call site.
+            rate: Rate limit for this call site, e.g. "10/s".
+        
+        Returns:
+            The computed value(s) like ic(), or None if nothing was printed.
+        """
+        debugger = self._debugger
+        call_frame = sys._getframe(1)
+        if not debugger.enabled:
+            return None
+        if not (debugger._allowed(call_frame) and debugger._sample(call_frame, every, first, rate)):
+            if debugger._stats is not None:
+                debugger._stats.suppressed(call_frame)
+            return None
+        
+        values = tuple(thunk() for thunk in thunks)
+        debugger._print(call_frame, values, self._config_for(includeContext, contextAbsPath),
+                        lazy=True)
+        
+        if not values:
+            return None
+        elif len(values) == 1:
+            return values[0]
+        else:
+            return values
     
     def format(self, *args) -> str:
         """Format arguments without printing.
@@ -109,7 +183,69 @@ class _IceCreamWrapper:
             Formatted string.
         """
         call_frame = inspect.currentframe().f_back
-        return self._debugger._format(call_frame, *args)
+        return self._debugger._format(call_frame, *args, config=self._bound)
+    
+    def bind(
+        self,
+        prefix: Union[str, Callable[[], str], None] = None,
+        outputFunction: Optional[Callable[[str], None]] = None,
+        argToStringFunction: Optional[Callable[[Any], str]] = None,
+        includeContext: Optional[bool] = None,
+        contextAbsPath: Optional[bool] = None,
+    ) -> "_IceCreamWrapper":
+        """Create a preconfigured ic.
+        
+        The bound ic formats with its own fixed settings (those not given
+        are taken from this ic now) and shares the enable switch, sampling
+        state and background writer. Binding only creates a small object,
+        and its calls never touch shared settings.
+        
+        Example:
+            >>> db_ic = ic.bind(prefix='db| ', includeContext=True)
+            >>> db_ic(query)
+        
+        Args:
+            prefix: Prefix string or callable returning prefix.
+            outputFunction: Function to call with formatted output.
+            argToStringFunction: Function to convert args to strings.
+            includeContext: Whether to show file/line/function.
+            contextAbsPath: Whether to use absolute paths.
+        
+        Returns:
+            A new ic sharing this one's debugger.
+        """
+        config = (self._bound or self._debugger.config).derive(
+            prefix=prefix,
+            outputFunction=outputFunction,
+            argToStringFunction=argToStringFunction,
+            includeContext=includeContext,
+            contextAbsPath=contextAbsPath,
+        )
+        return _IceCreamWrapper(self._debugger, config)
+    
+    def configured(
+        self,
+        prefix: Union[str, Callable[[], str], None] = None,
+        outputFunction: Optional[Callable[[str], None]] = None,
+        argToStringFunction: Optional[Callable[[Any], str]] = None,
+        includeContext: Optional[bool] = None,
+        contextAbsPath: Optional[bool] = None,
+    ):
+        """Override output settings for the current thread or asyncio task.
+        
+        Example:
+            >>> with ic.configured(prefix='worker| '):
+            ...     ic(job)
+        
+        Bound ics (see bind()) keep their own settings.
+        """
+        return self._debugger.configured(
+            prefix=prefix,
+            outputFunction=outputFunction,
+            argToStringFunction=argToStringFunction,
+            includeContext=includeContext,
+            contextAbsPath=contextAbsPath,
+        )
     
     def configureOutput(
         self,
@@ -118,6 +254,10 @@ class _IceCreamWrapper:
         argToStringFunction: Optional[Callable[[Any], str]] = None,
         includeContext: Optional[bool] = None,
         contextAbsPath: Optional[bool] = None,
+        asyncOutput: Union[bool, str, "BackgroundWriter", None] = None,
+        queueSize: Optional[int] = None,
+        overflow: Optional[str] = None,
+        atomicOutput: Union[bool, "AtomicWriter", None] = None,
     ) -> None:
         """Configure output settings.
         
@@ -127,15 +267,249 @@ class _IceCreamWrapper:
             argToStringFunction: Function to convert args to strings.
             includeContext: Whether to show file/line/function.
             contextAbsPath: Whether to use absolute paths.
+            asyncOutput: Highlight and write output on a background thread,
+                or 'asyncio' to queue it on the running event loop.
+            queueSize: Bound of the background output queue.
+            overflow: Policy when the background queue is full.
+            atomicOutput: Write each record with a single ``os.write``.
         """
+        if self._bound is not None:
+            # A bound ic only changes its own settings; the writer is shared
+            if all(arg is None for arg in [prefix, outputFunction, argToStringFunction,
+                                            includeContext, contextAbsPath, asyncOutput,
+                                            queueSize, overflow, atomicOutput]):
+                raise TypeError("configureOutput() requires at least one argument")
+            if atomicOutput is not None and outputFunction is None:
+                outputFunction = _atomic_output_function(atomicOutput, self._bound.outputFunction)
+            self._bound = self._bound.derive(
+                prefix=prefix,
+                outputFunction=outputFunction,
+                argToStringFunction=argToStringFunction,
+                includeContext=includeContext,
+                contextAbsPath=contextAbsPath,
+            )
+            if asyncOutput is not None or queueSize is not None or overflow is not None:
+                self._debugger._configure_writer(asyncOutput, queueSize, overflow)
+            return
+        
         self._debugger.configureOutput(
             prefix=prefix,
             outputFunction=outputFunction,
             argToStringFunction=argToStringFunction,
             includeContext=includeContext,
             contextAbsPath=contextAbsPath,
+            asyncOutput=asyncOutput,
+            queueSize=queueSize,
+            overflow=overflow,
+            atomicOutput=atomicOutput,
+        )
+    
+    def configureSampling(
+        self,
+        every: Optional[int] = None,
+        first: Optional[int] = None,
+        rate: Union[str, float, None] = None,
+        summaryInterval: Optional[float] = None,
+    ) -> None:
+        """Set the default sampling policy for every call site.
+        
+        Args:
+            every: Print only every Nth call at each site.
+            first: Print only the first N calls at each site.
+            rate: Rate limit per site, e.g. "10/s" or "100/m".
+            summaryInterval: Seconds between "suppressed N calls" summaries.
+        """
+        self._debugger.configureSampling(
+            every=every,
+            first=first,
+            rate=rate,
+            summaryInterval=summaryInterval,
         )
     
+    def configureFilter(
+        self,
+        include: Union[str, List[str], None] = None,
+        exclude: Union[str, List[str], None] = None,
+    ) -> None:
+        """Enable output only in selected modules or files.
+        
+        Example:
+            >>> ic.configureFilter(include="myapp.billing.*", exclude="*.tests.*")
+        
+        Args:
+            include: Glob pattern(s) of module names or file paths to enable.
+            exclude: Glob pattern(s) of module names or file paths to disable.
+        """
+        self._debugger.configureFilter(include=include, exclude=exclude)
+    
+    def configureTiming(
+        self,
+        cpu: Optional[bool] = None,
+        rss: Optional[bool] = None,
+        reportAtExit: Optional[bool] = None,
+    ) -> None:
+        """Configure timers and the lap deltas of bare ic() calls.
+        
+        Args:
+            cpu: Also show the CPU time used by the thread.
+            rss: Also show the change in resident memory (Linux).
+            reportAtExit: Print the timer aggregates when the program exits.
+        """
+        self._debugger.configureTiming(cpu=cpu, rss=rss, reportAtExit=reportAtExit)
+    
+    def timer(self, label: Optional[str] = None, quiet: bool = False) -> "Timer":
+        """Measure a block or every call of a function.
+        
+        Example:
+            >>> with ic.timer("load"):
+            ...     data = load()
+            ic| load took 12.3 ms
+            
+            >>> @ic.timer(quiet=True)
+            ... def handle(request): ...
+        
+        Args:
+            label: Name shown in the output (default: file:line of the block,
+                or the function name).
+            quiet: Only aggregate the measurements for ``ic.timings()``.
+        
+        Returns:
+            A Timer, usable as a context manager or decorator.
+        """
+        return self._debugger._timer(sys._getframe(1), label, quiet, self._bound)
+    
+    def watch(self, *expressions: str, func: Optional[Callable] = None) -> "Watch":
+        """Print when watched expressions change inside a function.
+        
+        On Python 3.12+ only the watched function is instrumented (via
+        ``sys.monitoring``); older versions fall back to ``sys.settrace``.
+        
+        Example:
+            >>> @ic.watch("total")
+            ... def checkout(cart):
+            ...     total = sum(item.price for item in cart)
+            ic| [shop.py:3 in checkout()] >>> total: <undefined> -> 15
+        
+        Args:
+            *expressions: Variable names or expressions such as ``"self.count"``.
+            func: The function to watch in; without it, use the result as a
+                decorator.
+        
+        Returns:
+            The Watch; call ``stop()`` or use it as a context manager to stop.
+        """
+        return self._debugger._watch(expressions, func, self._bound)
+    
+    def timings(self, reset: bool = False) -> List[Dict[str, Any]]:
+        """Print per-site timer aggregates (count, p50/p95/p99, max).
+        
+        Args:
+            reset: Forget the aggregates afterwards.
+        
+        Returns:
+            The aggregates as dicts, with durations in nanoseconds.
+        """
+        return self._debugger.timings(reset)
+    
+    def configureStats(
+        self,
+        enabled: Optional[bool] = None,
+        top: Optional[int] = None,
+        reportAtExit: Optional[bool] = None,
+    ) -> None:
+        """Record what each ic() call site costs (see ``ic.stats()``).
+        
+        Args:
+            enabled: Start (True) or stop and forget (False) recording.
+            top: Number of sites shown by printStats() and at exit.
+            reportAtExit: Print the most expensive sites when the program exits.
+        """
+        self._debugger.configureStats(enabled=enabled, top=top, reportAtExit=reportAtExit)
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-call-site calls, suppressed calls, bytes and time per phase.
+        
+        Returns:
+            Dicts sorted by total time, with times in nanoseconds.
+        """
+        return self._debugger.stats()
+    
+    def printStats(self, top: Optional[int] = None) -> str:
+        """Print the most expensive ic() call sites as a Panel to stderr.
+        
+        Args:
+            top: Number of sites to show.
+        
+        Returns:
+            The rendered report.
+        """
+        return self._debugger.printStats(top)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all background output has been written.
+        
+        Args:
+            timeout: Maximum number of seconds to wait (None waits forever).
+        
+        Returns:
+            True if everything was written, False on timeout.
+        """
+        return self._debugger.flush(timeout)
+    
+    def configureRecorder(
+        self,
+        enabled: Optional[bool] = None,
+        size: Optional[int] = None,
+        path: Optional[str] = None,
+        dumpOnException: Optional[bool] = None,
+        dumpSignal: Optional[int] = None,
+    ) -> None:
+        """Record ic() calls in a ring buffer, printed only when dumped.
+        
+        Args:
+            enabled: Start (True) or stop and discard (False) recording.
+            size: Number of records kept.
+            path: Keep the ring in a memory-mapped file that survives a crash.
+            dumpOnException: Dump when an exception is not handled.
+            dumpSignal: Dump when the process receives this signal.
+        """
+        self._debugger.configureRecorder(enabled, size, path, dumpOnException, dumpSignal)
+    
+    def configureStructured(
+        self,
+        enabled: Optional[bool] = None,
+        sink: Any = None,
+        batchSize: Optional[int] = None,
+        maxDelay: Optional[float] = None,
+    ) -> None:
+        """Emit one compact JSON record per call instead of colored text.
+        
+        Args:
+            enabled: Start (True) or stop (False) structured output.
+            sink: Path, file descriptor, text stream or function receiving
+                batches of JSON lines (default: stderr).
+            batchSize: Number of records written together.
+            maxDelay: Seconds a record may wait for its batch.
+        """
+        self._debugger.configureStructured(enabled, sink, batchSize, maxDelay)
+    
+    def configureCapture(self, enabled: Optional[bool] = None, path: Optional[str] = None) -> None:
+        """Capture calls to a binary log, rendered later by ``python -m litprinter replay``.
+        
+        Args:
+            enabled: Start (True) or stop (False) capturing.
+            path: Log file; ``{pid}`` is replaced by the process id.
+        """
+        self._debugger.configureCapture(enabled, path)
+    
+    def dumpRecorder(self, file: Any = None, clear: bool = False) -> int:
+        """Write the recorded calls (to stderr by default); returns their number."""
+        return self._debugger.dumpRecorder(file, clear)
+    
+    async def aflush(self) -> None:
+        """Wait, without blocking the event loop, until queued output is written."""
+        await self._debugger.aflush()
+    
     def enable(self) -> None:
         """Enable debug output."""
         self._debugger.enable()
@@ -150,6 +524,8 @@ class _IceCreamWrapper:
         return self._debugger.enabled
     
     def __repr__(self) -> str:
+        if self._bound is not None:
+            return f"<ic bound prefix={self._bound.prefix!r} enabled={self.enabled}>"
         return f"<ic enabled={self.enabled}>"
 
 
@@ -172,6 +548,10 @@ def configureOutput(
     argToStringFunction: Optional[Callable[[Any], str]] = None,
     includeContext: Optional[bool] = None,
     contextAbsPath: Optional[bool] = None,
+    asyncOutput: Union[bool, str, "BackgroundWriter", None] = None,
+    queueSize: Optional[int] = None,
+    overflow: Optional[str] = None,
+    atomicOutput: Union[bool, "AtomicWriter", None] = None,
 ) -> None:
     """Configure the global ic output settings.
     
@@ -181,6 +561,10 @@ def configureOutput(
         argToStringFunction: Argument formatting function.
         includeContext: Whether to include context.
         contextAbsPath: Whether to use absolute paths.
+        asyncOutput: Write output on a background thread.
+        queueSize: Bound of the background output queue.
+        overflow: Policy when the background queue is full.
+        atomicOutput: Write each record with a single ``os.write``.
     """
     ic.configureOutput(
         prefix=prefix,
@@ -188,6 +572,10 @@ def configureOutput(
         argToStringFunction=argToStringFunction,
         includeContext=includeContext,
         contextAbsPath=contextAbsPath,
+        asyncOutput=asyncOutput,
+        queueSize=queueSize,
+        overflow=overflow,
+        atomicOutput=atomicOutput,
     )
 
 
@@ -233,4 +621,5 @@ __all__ = [
     # Core exports
     'argumentToString',
     'IceCreamDebugger',
+    'OutputConfig',
 ]
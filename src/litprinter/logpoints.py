@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Logpoints Module
+
+Attach ic() output to a file and line without editing the code.
+
+A logpoint evaluates expressions in the frame executing a given line (just
+before the line runs) and prints them like ``ic(<expressions>)`` at that
+line would, through the ic debugger's formatting and output function::
+
+    from litprinter import logpoint
+    
+    logpoint("app/db.py:120", "query, params")
+    # ic| [db.py:120 in fetch()] >>> query: 'SELECT ...', params: (42,)
+
+On Python 3.12+ logpoints use ``sys.monitoring`` LINE events: every other
+line returns ``DISABLE`` the first time it runs, so after that only the
+targeted lines pay anything. Adding a logpoint after lines were disabled
+calls ``sys.monitoring.restart_events()`` so that they can be hit. Older
+Pythons fall back to ``sys.settrace`` (shared with watchpoints), tracing
+only functions that contain a targeted line (but every call pays for the
+check).
+
+Logpoints can be set at startup without touching the code, either as a
+``;``-separated list or from a file with one logpoint per line::
+
+    LITPRINTER_LOGPOINTS="app/db.py:120=query, params; app/api.py:42=request.path"
+    LITPRINTER_LOGPOINTS_FILE=/etc/myapp/logpoints.txt
+
+Each entry is ``<file>:<line>=<expressions>``, optionally followed by
+`` if <condition>`` to print only when the condition is true. Lines of the
+file starting with ``#`` are ignored.
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import ast
+import dis
+from abc import ABC, abstractmethod
+import os
+import sys
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+__all__ = [
+    "Logpoint",
+    "logpoint",
+    "remove_logpoint",
+    "clear_logpoints",
+    "get_logpoints",
+    "load_logpoints",
+    "install_from_env",
+]
+
+LOGPOINTS_ENV = "LITPRINTER_LOGPOINTS"
+LOGPOINTS_FILE_ENV = "LITPRINTER_LOGPOINTS_FILE"
+
+MONITORING_AVAILABLE = hasattr(sys, "monitoring")
+
+
+class _EvalError:
+    """Stands in for the value of an expression that raised."""
+    
+    __slots__ = ("text",)
+    
+    def __init__(self, exc: BaseException):
+        self.text = f"<{type(exc).__name__}: {exc}>"
+    
+    def __repr__(self) -> str:
+        return self.text
+
+
+def _split_expressions(source: str) -> Tuple[str, ...]:
+    """Split ``"query, params[0]"`` into its top-level expressions."""
+    tree = ast.parse(source.strip(), mode="eval").body
+    if isinstance(tree, ast.Tuple) and not source.strip().startswith("("):
+        return tuple(ast.get_source_segment(source.strip(), elt) for elt in tree.elts)
+    return (source.strip(),)
+
+
+def _parse_location(location: str) -> Tuple[str, int]:
+    """Split ``"app/db.py:120"`` into a normalized path and a line number."""
+    path, _, line = location.strip().rpartition(":")
+    if not path or not line.strip().isdigit():
+        raise ValueError(f"Invalid logpoint location {location!r}; expected 'file.py:LINE'")
+    return os.path.normpath(path), int(line)
+
+
+def _path_matches(filename: str, path: str) -> bool:
+    """Whether a code object's file name refers to the (possibly partial) path."""
+    filename = os.path.normpath(filename)
+    return filename == path or filename.endswith(os.sep + path)
+
+
+class Logpoint:
+    """An ic() output attached to a file and line.
+    
+    Attributes:
+        path: The (normalized) file path, matched as a suffix of file names.
+        line: The line number.
+        expressions: The expressions printed.
+        condition: Expression that must be true to print, or None.
+        hits: Number of times the logpoint printed.
+    """
+    
+    def __init__(self, location: str, expressions: str, condition: Optional[str] = None,
+                 debugger: Any = None):
+        """Initialize the logpoint (use ``logpoint()`` to also activate it).
+        
+        Args:
+            location: ``"path/to/file.py:LINE"``.
+            expressions: Comma-separated expressions, e.g. ``"query, params"``.
+            condition: Only print when this expression is true.
+            debugger: IceCreamDebugger to print with (default: the one of ``ic``).
+        
+        Raises:
+            ValueError: If the location is malformed.
+            SyntaxError: If an expression or the condition is not valid Python.
+        """
+        self.path, self.line = _parse_location(location)
+        self.expressions = _split_expressions(expressions)
+        self._compiled = [compile(expr, "<logpoint>", "eval") for expr in self.expressions]
+        self.condition = condition
+        self._condition = compile(condition, "<logpoint>", "eval") if condition else None
+        self._debugger = debugger
+        self.hits = 0
+    
+    @property
+    def location(self) -> str:
+        return f"{self.path}:{self.line}"
+    
+    def matches(self, code) -> bool:
+        """Whether ``code`` comes from the logpoint's file."""
+        return _path_matches(code.co_filename, self.path)
+    
+    def fire(self, frame) -> None:
+        """Evaluate the expressions in ``frame`` and print them."""
+        debugger = self._debugger
+        if debugger is None:
+            from .litprint import ic
+            debugger = ic._debugger
+        if not debugger.enabled:
+            return
+        
+        f_globals, f_locals = frame.f_globals, frame.f_locals
+        if self._condition is not None:
+            try:
+                if not eval(self._condition, f_globals, f_locals):
+                    return
+            except Exception:
+                return
+        values = []
+        for compiled in self._compiled:
+            try:
+                values.append(eval(compiled, f_globals, f_locals))
+            except Exception as exc:
+                values.append(_EvalError(exc))
+        self.hits += 1
+        debugger._log_values(frame, self.expressions, tuple(values))
+    
+    def remove(self) -> None:
+        """Deactivate the logpoint."""
+        remove_logpoint(self)
+    
+    def __repr__(self) -> str:
+        condition = f" if {self.condition}" if self.condition else ""
+        return f"<Logpoint {self.location}={', '.join(self.expressions)}{condition}>"
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class _Registry(ABC):
+    """Active logpoints and the per-code-object lookup of their lines."""
+    
+    def __init__(self):
+        self.logpoints: List[Logpoint] = []
+        # code object -> lines with logpoints (empty for most code)
+        self._lines: Dict[Any, FrozenSet[int]] = {}
+        self._lock = threading.Lock()
+        self._busy = threading.local()
+    
+    def lines_for(self, code) -> FrozenSet[int]:
+        try:
+            return self._lines[code]
+        except KeyError:
+            lines = frozenset(lp.line for lp in self.logpoints if lp.matches(code))
+            self._lines[code] = lines
+            return lines
+    
+    def fire(self, code, line: int, frame) -> None:
+        if getattr(self._busy, "active", False):
+            return
+        self._busy.active = True
+        try:
+            for lp in list(self.logpoints):
+                if lp.line == line and lp.matches(code):
+                    lp.fire(frame)
+        finally:
+            self._busy.active = False
+    
+    def add(self, lp: Logpoint) -> None:
+        with self._lock:
+            self.logpoints.append(lp)
+            self._lines.clear()
+            if len(self.logpoints) == 1:
+                self.start()
+            else:
+                self.refresh()
+    
+    def remove(self, lp: Logpoint) -> None:
+        with self._lock:
+            if lp not in self.logpoints:
+                return
+            self.logpoints.remove(lp)
+            self._lines.clear()
+            if not self.logpoints:
+                self.stop()
+    
+    @abstractmethod
+    def start(self) -> None:
+        """Start receiving line events (first logpoint added)."""
+    
+    def refresh(self) -> None:
+        """Make lines of newly added logpoints reachable."""
+    
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop receiving line events (last logpoint removed)."""
+
+
+class _MonitoringRegistry(_Registry):
+    """Global LINE events that disable themselves everywhere but on targets."""
+    
+    TOOL_NAME = "litprinter logpoints"
+    
+    def __init__(self):
+        super().__init__()
+        self._tool: Optional[int] = None
+        # Whether this tool disabled locations since the last restart_events()
+        self._disabled = False
+    
+    def _on_line(self, code, line):
+        lines = self._lines.get(code)
+        if lines is None:
+            lines = self.lines_for(code)
+        if line not in lines:
+            self._disabled = True
+            return sys.monitoring.DISABLE
+        self.fire(code, line, sys._getframe(1))
+        return None
+    
+    def start(self) -> None:
+        from .watch import acquire_tool_id
+        monitoring = sys.monitoring
+        # Locations disabled while an earlier set of logpoints was active
+        restart, self._disabled = self._disabled, False
+        self._tool = acquire_tool_id(self.TOOL_NAME)
+        monitoring.register_callback(self._tool, monitoring.events.LINE, self._on_line)
+        monitoring.set_events(self._tool, monitoring.events.LINE)
+        if restart:
+            monitoring.restart_events()
+    
+    def refresh(self) -> None:
+        # restart_events() affects every tool: only undo our own DISABLEs
+        if self._disabled:
+            self._disabled = False
+            sys.monitoring.restart_events()
+    
+    def stop(self) -> None:
+        if self._tool is not None:
+            monitoring = sys.monitoring
+            monitoring.set_events(self._tool, 0)
+            monitoring.register_callback(self._tool, monitoring.events.LINE, None)
+            monitoring.free_tool_id(self._tool)
+            self._tool = None
+
+
+class _TraceRegistry(_Registry):
+    """sys.settrace fallback: local tracers only for code with a target line."""
+    
+    def lines_for(self, code) -> FrozenSet[int]:
+        try:
+            return self._lines[code]
+        except KeyError:
+            lines = super().lines_for(code)
+            if lines:
+                # Only lines that belong to this code object (not nested functions)
+                lines = lines & {line for _, line in dis.findlinestarts(code)}
+                self._lines[code] = lines
+            return lines
+    
+    def _trace(self, frame, event, arg):
+        code = frame.f_code
+        lines = self._lines.get(code)
+        if lines is None:
+            lines = self.lines_for(code)
+        if not lines:
+            return None
+        
+        def local_trace(frame, event, arg):
+            if event == "line" and frame.f_lineno in lines:
+                self.fire(code, frame.f_lineno, frame)
+            return local_trace
+        
+        return local_trace
+    
+    def start(self) -> None:
+        from .watch import add_trace_client
+        add_trace_client(self._trace, "logpoints")
+    
+    def stop(self) -> None:
+        from .watch import remove_trace_client
+        remove_trace_client(self._trace)
+
+
+_registry: Optional[_Registry] = None
+
+
+def _get_registry() -> _Registry:
+    global _registry
+    if _registry is None:
+        _registry = _MonitoringRegistry() if MONITORING_AVAILABLE else _TraceRegistry()
+    return _registry
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+def logpoint(location: str, expressions: str, condition: Optional[str] = None,
+             debugger: Any = None) -> Logpoint:
+    """Print expressions whenever a line is about to run, without editing it.
+    
+    Example:
+        >>> logpoint("app/db.py:120", "query, params", condition="len(params) > 2")
+    
+    Args:
+        location: ``"path/to/file.py:LINE"``; the path may be partial
+            (``"db.py:120"``) and is matched against the end of file names.
+        expressions: Comma-separated expressions evaluated in that frame.
+        condition: Only print when this expression is true.
+        debugger: IceCreamDebugger to print with (default: the one of ``ic``).
+    
+    Returns:
+        The active Logpoint; call ``remove()`` on it to detach it.
+    """
+    lp = Logpoint(location, expressions, condition, debugger)
+    _get_registry().add(lp)
+    return lp
+
+
+def remove_logpoint(lp: Logpoint) -> None:
+    """Detach a logpoint."""
+    _get_registry().remove(lp)
+
+
+def clear_logpoints() -> None:
+    """Detach all logpoints."""
+    registry = _get_registry()
+    for lp in list(registry.logpoints):
+        registry.remove(lp)
+
+
+def get_logpoints() -> List[Logpoint]:
+    """The active logpoints."""
+    return list(_get_registry().logpoints)
+
+
+def _parse_entry(entry: str) -> Tuple[str, str, Optional[str]]:
+    """Parse ``file.py:LINE=expressions [if condition]``."""
+    location, sep, rest = entry.partition("=")
+    if not sep or not rest.strip():
+        raise ValueError(f"Invalid logpoint {entry!r}; expected 'file.py:LINE=expressions'")
+    expressions, sep, condition = rest.partition(" if ")
+    return location.strip(), expressions.strip(), condition.strip() if sep else None
+
+
+def load_logpoints(path: str) -> List[Logpoint]:
+    """Activate the logpoints listed in a file (one ``file.py:LINE=exprs`` per line).
+    
+    Args:
+        path: The file to read; blank lines and ``#`` comments are skipped.
+    
+    Returns:
+        The activated logpoints.
+    """
+    with open(path, encoding="utf-8") as fh:
+        entries = [line.strip() for line in fh]
+    return [
+        logpoint(*_parse_entry(entry))
+        for entry in entries
+        if entry and not entry.startswith("#")
+    ]
+
+
+def install_from_env() -> List[Logpoint]:
+    """Activate logpoints from ``LITPRINTER_LOGPOINTS`` and ``LITPRINTER_LOGPOINTS_FILE``.
+    
+    Invalid entries are reported as warnings and skipped, so a typo cannot
+    stop the program from starting.
+    """
+    import warnings
+    
+    logpoints = []
+    entries = [entry.strip() for entry in os.environ.get(LOGPOINTS_ENV, "").split(";")]
+    for entry in entries:
+        if not entry:
+            continue
+        try:
+            logpoints.append(logpoint(*_parse_entry(entry)))
+        except (ValueError, SyntaxError, RuntimeError) as exc:
+            warnings.warn(f"Ignoring logpoint {entry!r}: {exc}", RuntimeWarning, stacklevel=2)
+    
+    path = os.environ.get(LOGPOINTS_FILE_ENV)
+    if path:
+        try:
+            logpoints.extend(load_logpoints(path))
+        except (OSError, ValueError, SyntaxError, RuntimeError) as exc:
+            warnings.warn(f"Ignoring logpoints in {path!r}: {exc}", RuntimeWarning, stacklevel=2)
+    return logpoints
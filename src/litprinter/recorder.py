@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Recorder Module
+
+A flight recorder for ic(): calls are kept in a preallocated ring buffer
+instead of being written, and the last records are only printed when
+something goes wrong.
+
+Each record holds the call site, the wall-clock time, the thread name and
+the values. Immutable values (numbers, strings, bytes, tuples of those) are
+stored as they are and only formatted when the recorder is dumped; other
+values are formatted at call time, since they may change later. Other ic()
+output (timer reports, watch changes, sampling summaries, logpoints) is
+recorded as text. Nothing is highlighted or written until a dump, which
+happens:
+
+- on an unhandled exception (also through ``traceback.install()``'s hook),
+- when the process receives a configured signal (the handler only wakes a
+  dump thread, since the interrupted code may hold a lock that formatting
+  needs),
+- on demand, with ``ic.dumpRecorder()``.
+
+With a ``path``, the ring buffer lives in a memory-mapped file instead, so
+the last records survive a crash of the process. Values are then formatted
+at call time. A child process created by fork() records into a file of its
+own. Read the file with::
+
+    python -m litprinter recorder /tmp/app.ring
+
+Usage:
+    from litprinter import ic
+    import signal
+    
+    ic.configureRecorder(True, size=10_000, dumpSignal=signal.SIGUSR1)
+    ic(order_id, state)     # recorded, not printed
+    ...
+    ic.dumpRecorder()       # ic| flight recorder: 2 record(s)
+                            # 12:00:01.120 [MainThread] ic| [app.py:12 in f()] >>> ...
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import itertools
+import mmap
+import os
+import signal as _signal
+import struct
+import sys
+import threading
+import weakref
+from datetime import datetime
+from time import time_ns
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+
+from .core import OutputConfig, _code_context, _get_call_site
+
+
+__all__ = [
+    "FlightRecorder",
+    "read_records",
+    "DEFAULT_RECORDER_SIZE",
+]
+
+DEFAULT_RECORDER_SIZE = 10_000
+
+# Bytes per record in a memory-mapped ring; longer records are cut
+DEFAULT_SLOT_SIZE = 512
+
+_MAGIC = b"LITREC01"
+# magic, slot size, slot count, pid
+_HEADER = struct.Struct("<8sIIQ")
+_HEADER_SIZE = 64
+# sequence number (0: empty or being written), wall time ns, payload length
+_SLOT_HEADER = struct.Struct("<QqI")
+
+# Values of these types are stored as they are and formatted at dump time
+_IMMUTABLE_TYPES = frozenset((int, float, complex, bool, type(None), str, bytes))
+
+
+class _Formatted(str):
+    """A value formatted at call time (as opposed to a stored str value)."""
+    
+    __slots__ = ()
+
+
+class _SiteInfo:
+    """Location and argument labels of a recorded call site."""
+    
+    __slots__ = ("context", "labels")
+    
+    def __init__(self, context: str, labels: Tuple[str, ...]):
+        self.context = context
+        self.labels = labels
+    
+    def label(self, index: int) -> str:
+        return self.labels[index] if index < len(self.labels) else ""
+
+
+def _snapshot(value: Any, to_string: Callable[[Any], str]) -> Any:
+    """The value itself if it is immutable, its formatted text otherwise."""
+    cls = type(value)
+    if cls in _IMMUTABLE_TYPES or (
+        cls is tuple and all(type(item) in _IMMUTABLE_TYPES for item in value)
+    ):
+        return value
+    return _Formatted(to_string(value))
+
+
+# ============================================================================
+# Ring Buffers
+# ============================================================================
+
+class _MemoryRing:
+    """Preallocated list of slots holding record tuples."""
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._slots: List[Optional[tuple]] = [None] * size
+    
+    def put(self, seq: int, record: tuple) -> None:
+        self._slots[seq % self.size] = record
+    
+    def records(self) -> List[tuple]:
+        """Stored records, oldest first."""
+        records = [record for record in self._slots if record is not None]
+        records.sort(key=lambda record: record[0])
+        return records
+    
+    def clear(self) -> None:
+        self._slots = [None] * self.size
+    
+    def close(self) -> None:
+        pass
+
+
+class _MappedRing:
+    """Fixed-size slots in a memory-mapped file that outlive the process."""
+    
+    def __init__(self, path: str, size: int, slot_size: int = DEFAULT_SLOT_SIZE):
+        self.path = path
+        self.size = size
+        self.slot_size = slot_size
+        length = _HEADER_SIZE + size * slot_size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, length)
+            self._map = mmap.mmap(fd, length)
+        finally:
+            os.close(fd)
+        _HEADER.pack_into(self._map, 0, _MAGIC, slot_size, size, os.getpid())
+    
+    def put(self, seq: int, when: int, payload: bytes) -> None:
+        offset = _HEADER_SIZE + (seq % self.size) * self.slot_size
+        payload = payload[:self.slot_size - _SLOT_HEADER.size]
+        view = self._map
+        # Mark the slot as being written, so a crash midway leaves no torn record
+        _SLOT_HEADER.pack_into(view, offset, 0, 0, 0)
+        start = offset + _SLOT_HEADER.size
+        view[start:start + len(payload)] = payload
+        _SLOT_HEADER.pack_into(view, offset, seq, when, len(payload))
+    
+    def records(self) -> List[Tuple[int, int, str]]:
+        return _read_slots(self._map, self.size, self.slot_size)
+    
+    def clear(self) -> None:
+        for index in range(self.size):
+            _SLOT_HEADER.pack_into(self._map, _HEADER_SIZE + index * self.slot_size, 0, 0, 0)
+    
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except (BufferError, ValueError):
+            pass
+
+
+def _read_slots(buffer, size: int, slot_size: int) -> List[Tuple[int, int, str]]:
+    """(seq, wall time ns, payload) of the filled slots, oldest first."""
+    records = []
+    for index in range(size):
+        offset = _HEADER_SIZE + index * slot_size
+        seq, when, length = _SLOT_HEADER.unpack_from(buffer, offset)
+        if seq:
+            start = offset + _SLOT_HEADER.size
+            payload = bytes(buffer[start:start + length]).decode("utf-8", "ignore")
+            records.append((seq, when, payload))
+    records.sort()
+    return records
+
+
+def read_records(path: str) -> Tuple[int, List[Tuple[int, int, str, str]]]:
+    """Read the records a recorder left in a memory-mapped file.
+    
+    Returns:
+        The pid of the recording process and its records, oldest first, as
+        (sequence number, wall time ns, thread name, text).
+    
+    Raises:
+        ValueError: If the file is not a recorder file.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _HEADER_SIZE:
+        raise ValueError(f"{path} is not a litprinter recorder file")
+    magic, slot_size, size, pid = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a litprinter recorder file")
+    records = []
+    for seq, when, payload in _read_slots(data, size, slot_size):
+        thread, _, text = payload.partition("\0")
+        records.append((seq, when, thread, text))
+    return pid, records
+
+
+def _format_line(when: int, thread: str, text: str) -> str:
+    """One dump line: time, thread and the ic() output."""
+    stamp = datetime.fromtimestamp(when / 1e9).strftime("%H:%M:%S.%f")[:-3]
+    return f"{stamp} [{thread}] {text}"
+
+
+# ============================================================================
+# Recorder
+# ============================================================================
+
+# Recorders that dump on unhandled exceptions
+_recorders: "weakref.WeakSet[FlightRecorder]" = weakref.WeakSet()
+
+
+class FlightRecorder:
+    """Ring buffer of the most recent ic() calls of one debugger.
+    
+    Installed by ``ic.configureRecorder()``; while installed, ic() calls
+    are recorded instead of printed.
+    
+    Attributes:
+        size: Number of records kept.
+        path: Memory-mapped file backing the ring, if any.
+        dump_on_exception: Dump when an exception is not handled.
+    """
+    
+    def __init__(
+        self,
+        debugger: Any,
+        size: int = DEFAULT_RECORDER_SIZE,
+        path: Optional[str] = None,
+        dump_on_exception: bool = True,
+        dump_signal: Optional[int] = None,
+    ):
+        """Initialize the recorder.
+        
+        Args:
+            debugger: The IceCreamDebugger whose calls are recorded.
+            size: Number of records kept.
+            path: Back the ring with this file; ``{pid}`` is replaced by
+                the process id. A forked child uses the template with its
+                own pid, or ``path.<pid>``.
+            dump_on_exception: Dump when an exception is not handled.
+            dump_signal: Dump when the process receives this signal (must
+                be configured from the main thread).
+        
+        Raises:
+            ValueError: If size is not positive.
+        """
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.size = size
+        self._template = path
+        self.path = path.replace("{pid}", str(os.getpid())) if path else None
+        self.dump_on_exception = dump_on_exception
+        self._debugger = debugger
+        self._counter = itertools.count(1)
+        self._sites: Dict[tuple, _SiteInfo] = {}
+        if self.path:
+            self._ring: Any = _MappedRing(self.path, size)
+        else:
+            self._ring = _MemoryRing(size)
+        self._signal = dump_signal
+        self._previous_handler: Any = None
+        # Pipe waking the dump thread (read end, write end)
+        self._wakeup_read: Optional[int] = None
+        self._wakeup: Optional[int] = None
+        if dump_signal is not None:
+            self._start_dump_thread()
+            self._previous_handler = _signal.signal(dump_signal, self._on_signal)
+        if dump_on_exception:
+            _install_exception_hooks()
+        _recorders.add(self)
+    
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    
+    def _site(self, call_frame, lazy: bool, abs_path: bool) -> _SiteInfo:
+        key = (call_frame.f_code, call_frame.f_lasti, abs_path)
+        site = self._sites.get(key)
+        if site is None:
+            # The context ic() itself prints
+            context = _code_context(call_frame.f_code, call_frame.f_lineno, abs_path)
+            site = self._sites[key] = _SiteInfo(context, _get_call_site(call_frame, lazy).labels)
+        return site
+    
+    def record(self, call_frame, args: tuple, config: OutputConfig, lazy: bool = False) -> None:
+        """Store an ic() call in the ring buffer."""
+        site = self._site(call_frame, lazy, config.contextAbsPath)
+        to_string = config.argToStringFunction
+        values = tuple(_snapshot(value, to_string) for value in args)
+        seq = next(self._counter)
+        when = time_ns()
+        thread = threading.current_thread().name
+        if self.path is None:
+            self._ring.put(seq, (seq, when, thread, site, config, values))
+        else:
+            text = self._render(site, config, values)
+            self._ring.put(seq, when, f"{thread}\0{text}".encode("utf-8", "replace"))
+    
+    def message(self, text: str) -> None:
+        """Store other ic() output (timer reports, watches, summaries) as a text record."""
+        seq = next(self._counter)
+        when = time_ns()
+        thread = threading.current_thread().name
+        if self.path is None:
+            self._ring.put(seq, (seq, when, thread, None, None, text))
+        else:
+            self._ring.put(seq, when, f"{thread}\0{text}".encode("utf-8", "replace"))
+    
+    def _render(self, site: _SiteInfo, config: OutputConfig, values: tuple) -> str:
+        """The ic() output of a record, as printed with includeContext."""
+        to_string = config.argToStringFunction
+        args = self._debugger._pair_delimiter.join(
+            site.label(index) + (value if type(value) is _Formatted else to_string(value))
+            for index, value in enumerate(values)
+        )
+        prefix = self._debugger._get_prefix(config)
+        return f"{prefix}[{site.context}] >>> {args}" if args else f"{prefix}[{site.context}]"
+    
+    # ------------------------------------------------------------------
+    # Dumping
+    # ------------------------------------------------------------------
+    
+    def lines(self) -> List[str]:
+        """The recorded calls as dump lines, oldest first."""
+        if self.path is None:
+            # Text records (see message()) have no site
+            return [
+                _format_line(
+                    when, thread, values if site is None else self._render(site, config, values)
+                )
+                for _, when, thread, site, config, values in self._ring.records()
+            ]
+        lines = []
+        for _, when, payload in self._ring.records():
+            thread, _, text = payload.partition("\0")
+            lines.append(_format_line(when, thread, text))
+        return lines
+    
+    def dump(self, file: Optional[IO[str]] = None, clear: bool = False) -> int:
+        """Write the recorded calls, oldest first.
+        
+        Args:
+            file: Text stream to write to (default: stderr, written with
+                ``os.write``, without taking the locks of sys.stderr).
+            clear: Forget the records after dumping.
+        
+        Returns:
+            Number of records written.
+        """
+        lines = self.lines()
+        prefix = self._debugger._get_prefix()
+        header = f"{prefix}flight recorder: {len(lines):,} record(s)"
+        if self.path:
+            header += f" (also in {self.path})"
+        text = "\n".join([header] + lines) + "\n"
+        if file is None:
+            _write_fd(sys.__stderr__.fileno() if sys.__stderr__ else 2, text)
+        else:
+            file.write(text)
+            file.flush()
+        if clear:
+            self._ring.clear()
+        return len(lines)
+    
+    def _on_signal(self, signum, frame) -> None:
+        # Runs between two bytecodes of the main thread, which may hold a
+        # lock that formatting takes (memo, repr guard, highlighter): only
+        # wake the dump thread
+        wakeup = self._wakeup
+        if wakeup is not None:
+            try:
+                os.write(wakeup, b"\0")
+            except OSError:
+                pass
+        previous = self._previous_handler
+        if callable(previous):
+            previous(signum, frame)
+    
+    def _start_dump_thread(self) -> None:
+        """Start the thread dumping when the signal handler wakes it."""
+        self._wakeup_read, self._wakeup = os.pipe()
+        threading.Thread(
+            target=self._dump_on_wakeup, args=(self._wakeup_read,),
+            name="litprinter-recorder", daemon=True,
+        ).start()
+    
+    def _dump_on_wakeup(self, read_fd: int) -> None:
+        try:
+            # Ends when close() closes the write end
+            while os.read(read_fd, 64):
+                try:
+                    self.dump()
+                except Exception:
+                    pass
+        except OSError:
+            pass
+        finally:
+            os.close(read_fd)
+    
+    def _stop_dump_thread(self) -> None:
+        wakeup, self._wakeup = self._wakeup, None
+        if wakeup is not None:
+            os.close(wakeup)
+    
+    def _reopen_in_child(self) -> None:
+        """Give a forked child a ring (and dump thread) of its own."""
+        if self._wakeup is not None:
+            # The parent's dump thread does not exist here
+            os.close(self._wakeup_read)
+            os.close(self._wakeup)
+            self._start_dump_thread()
+        if self.path is not None:
+            pid = str(os.getpid())
+            if "{pid}" in self._template:
+                self.path = self._template.replace("{pid}", pid)
+            else:
+                self.path = f"{self._template}.{pid}"
+            # Unmapping in the child leaves the parent's mapping alone
+            self._ring.close()
+            self._ring = _MappedRing(self.path, self.size)
+            self._counter = itertools.count(1)
+    
+    def close(self) -> None:
+        """Stop recording: restore the signal handler and release the ring."""
+        _recorders.discard(self)
+        if self._signal is not None:
+            try:
+                if _signal.getsignal(self._signal) == self._on_signal:
+                    _signal.signal(self._signal, self._previous_handler or _signal.SIG_DFL)
+            except ValueError:  # not the main thread
+                pass
+            self._signal = None
+        self._stop_dump_thread()
+        self._ring.close()
+    
+    def __repr__(self) -> str:
+        target = f" path={self.path!r}" if self.path else ""
+        return f"<FlightRecorder size={self.size}{target}>"
+
+
+def _write_fd(fd: int, text: str) -> None:
+    """Write without taking the locks of sys.stderr (signal-safe)."""
+    data = memoryview(text.encode("utf-8", "replace"))
+    while data:
+        try:
+            written = os.write(fd, data)
+        except OSError:
+            return
+        data = data[written:]
+
+
+def _after_fork_in_child() -> None:
+    for recorder in list(_recorders):
+        try:
+            recorder._reopen_in_child()
+        except Exception:
+            pass
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# ============================================================================
+# Exception Hooks
+# ============================================================================
+
+# The exception the recorders were last dumped for (dumped once per exception)
+_dumped_for: Optional[int] = None
+_hooks_installed = False
+
+
+def dump_for_exception(exc_value: Optional[BaseException]) -> None:
+    """Dump every recorder that dumps on unhandled exceptions, once per exception.
+    
+    Called by the exception hooks installed here and by
+    ``litprinter.traceback.pretty_excepthook``.
+    """
+    global _dumped_for
+    if exc_value is not None:
+        if id(exc_value) == _dumped_for:
+            return
+        _dumped_for = id(exc_value)
+    for recorder in list(_recorders):
+        if recorder.dump_on_exception:
+            try:
+                recorder.dump()
+            except Exception:
+                pass
+
+
+def _install_exception_hooks() -> None:
+    """Chain sys.excepthook and threading.excepthook (once)."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    _hooks_installed = True
+    previous_hook = sys.excepthook
+    
+    def excepthook(exc_type, exc_value, tb):
+        dump_for_exception(exc_value)
+        previous_hook(exc_type, exc_value, tb)
+    
+    sys.excepthook = excepthook
+    
+    previous_thread_hook = threading.excepthook
+    
+    def thread_excepthook(args):
+        if args.exc_type is not SystemExit:
+            dump_for_exception(args.exc_value)
+        previous_thread_hook(args)
+    
+    threading.excepthook = thread_excepthook
+
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Repr Guard Module
+
+Adaptive protection against slow ``__repr__`` implementations.
+
+Objects without a registered formatter are printed with their repr, and
+some reprs are expensive: an ORM model whose repr loads lazy relations can
+take hundreds of milliseconds and issue queries every time it is printed.
+The guard times each type's repr and keeps a moving average per type. Once
+the average of at least three reprs and the latest repr both exceed the
+threshold, objects of that type are shown as a cheap structural summary built from their
+``__slots__``/``__dict__`` instead::
+
+    <Order id=7 status='paid' customer=... at 0x7f3a2c1b5e10>
+
+Only numbers, short strings, enum members and None are shown as values;
+anything else (which could be a lazy relation) is shown as ``...``.
+Builtin containers without attributes show their length
+(``<deque len=1000000 at 0x...>``). Switching a type emits a RuntimeWarning,
+is counted in ``getStyleCacheInfo()["repr_guard"]`` and is listed by
+``ic.printStats()``. The decision can be pinned per type.
+
+Usage:
+    from litprinter import set_repr_guard, pin_repr
+    
+    set_repr_guard(threshold=0.01)     # summarize types averaging over 10 ms
+    pin_repr(Order, "summary")         # always summarize Order
+    pin_repr(Invoice, "repr")          # never summarize Invoice
+    pin_repr(Order, None)              # back to automatic
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import threading
+import warnings
+from enum import Enum
+from time import perf_counter_ns
+from types import MemberDescriptorType
+from typing import Any, Callable, Dict, List, Optional
+
+
+__all__ = [
+    "set_repr_guard",
+    "pin_repr",
+    "repr_guard_info",
+    "summarize",
+    "DEFAULT_THRESHOLD",
+]
+
+# Average repr time (seconds) above which a type is summarized
+DEFAULT_THRESHOLD = 0.05
+
+# Weight of the newest sample in the moving average
+_SMOOTHING = 0.3
+
+# Reprs timed before a type can be switched (one cold or huge repr is not enough)
+_MIN_SAMPLES = 3
+
+PIN_MODES = ("repr", "summary")
+
+# Attributes shown in a summary before it ends with "..."
+_SUMMARY_FIELDS = 6
+_SUMMARY_STR_CHARS = 40
+
+_CHEAP_TYPES = (int, float, bool, type(None))
+
+# Py_TPFLAGS_HEAPTYPE: clear for types implemented in C by the interpreter
+_HEAPTYPE = 1 << 9
+
+
+def _type_name(cls: type) -> str:
+    if cls.__module__ in ("builtins", "__main__"):
+        return cls.__qualname__
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+# ============================================================================
+# Structural Summary
+# ============================================================================
+
+def _cheap_value(value: Any) -> str:
+    """Text of an attribute value that is known to be cheap to show, else '...'."""
+    cls = type(value)
+    if cls in _CHEAP_TYPES:
+        return repr(value)
+    if cls is str:
+        if len(value) > _SUMMARY_STR_CHARS:
+            return repr(value[:_SUMMARY_STR_CHARS]) + "..."
+        return repr(value)
+    if isinstance(value, Enum):
+        return f"{cls.__name__}.{value.name}"
+    return "..."
+
+
+def _fields(obj: Any) -> List[tuple]:
+    """(name, value) of the public attributes stored on ``obj``.
+    
+    Values are read from slots and ``__dict__`` directly, so no property,
+    ``__getattr__`` or lazy loader runs.
+    """
+    fields = []
+    for klass in type(obj).__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            descriptor = klass.__dict__.get(name)
+            if name.startswith("_") or type(descriptor) is not MemberDescriptorType:
+                continue
+            try:
+                fields.append((name, descriptor.__get__(obj, klass)))
+            except AttributeError:
+                pass  # Slot not set
+    try:
+        attributes = object.__getattribute__(obj, "__dict__")
+    except (AttributeError, TypeError):
+        attributes = {}
+    if isinstance(attributes, dict):
+        fields.extend(
+            (name, value) for name, value in list(attributes.items())
+            if isinstance(name, str) and not name.startswith("_")
+        )
+    return fields
+
+
+def summarize(obj: Any) -> str:
+    """A summary of ``obj`` that does not call its ``__repr__``.
+    
+    Returns:
+        e.g. ``<Order id=7 status='paid' customer=... at 0x7f3a2c1b5e10>``
+    """
+    cls = type(obj)
+    fields = _fields(obj)
+    parts = [cls.__qualname__]
+    parts.extend(f"{name}={_cheap_value(value)}" for name, value in fields[:_SUMMARY_FIELDS])
+    if len(fields) > _SUMMARY_FIELDS:
+        parts.append("...")
+    elif not fields and not cls.__flags__ & _HEAPTYPE:
+        # A builtin container (deque, array, ...): len() is cheap and exact
+        try:
+            parts.append(f"len={len(obj):,}")
+        except Exception:
+            pass
+    parts.append(f"at {id(obj):#x}")
+    return f"<{' '.join(parts)}>"
+
+
+# ============================================================================
+# Guard
+# ============================================================================
+
+class _TypeTiming:
+    """Moving average of the repr time of one type."""
+    
+    __slots__ = ("average_ns", "samples")
+    
+    def __init__(self, first_ns: int):
+        self.average_ns = float(first_ns)
+        self.samples = 1
+
+
+class _ReprGuard:
+    """Times reprs per type and summarizes the types that are too slow."""
+    
+    def __init__(self):
+        self.enabled = True
+        self.threshold_ns = DEFAULT_THRESHOLD * 1e9
+        self._timings: Dict[type, _TypeTiming] = {}
+        # Types switched to summaries (average repr time) and pinned types
+        self._slow: Dict[type, float] = {}
+        self._pins: Dict[type, str] = {}
+        # Pins and switches merged: what format() looks up
+        self._modes: Dict[type, str] = {}
+        self._lock = threading.Lock()
+        self.switched = 0
+        self.summarized = 0
+    
+    def format(self, obj: Any, to_string: Callable[[Any], str]) -> str:
+        """``to_string(obj)``, timed; or a summary for slow or pinned types."""
+        if not self.enabled:
+            return to_string(obj)
+        cls = type(obj)
+        mode = self._modes.get(cls)
+        if mode is not None:
+            if mode == "repr":
+                return to_string(obj)
+            self.summarized += 1
+            return summarize(obj)
+        start = perf_counter_ns()
+        text = to_string(obj)
+        elapsed = perf_counter_ns() - start
+        timing = self._timings.get(cls)
+        if timing is None:
+            with self._lock:
+                timing = self._timings.setdefault(cls, _TypeTiming(elapsed))
+        else:
+            # Unlocked: a concurrent update at worst loses one sample
+            timing.average_ns += _SMOOTHING * (elapsed - timing.average_ns)
+            timing.samples += 1
+        # The average decays slowly after one very slow repr, so the latest
+        # repr has to be slow too
+        threshold = self.threshold_ns
+        if (elapsed > threshold and timing.average_ns > threshold
+                and timing.samples >= _MIN_SAMPLES):
+            self._switch(cls, timing.average_ns)
+        return text
+    
+    def _switch(self, cls: type, average_ns: float) -> None:
+        """Show ``cls`` as a summary from now on."""
+        with self._lock:
+            if cls in self._modes:
+                return
+            self._slow[cls] = average_ns
+            self._modes[cls] = "summary"
+            self.switched += 1
+        from .core import _user_stacklevel
+        warnings.warn(
+            f"litprinter: repr() of {_type_name(cls)} takes {average_ns / 1e6:.1f} ms "
+            f"on average; showing a summary instead "
+            f"(pin_repr({cls.__qualname__}, 'repr') restores the repr)",
+            RuntimeWarning,
+            stacklevel=_user_stacklevel(),
+        )
+    
+    def pin(self, cls: type, mode: Optional[str]) -> None:
+        if mode is not None and mode not in PIN_MODES:
+            raise ValueError(
+                f"Unknown repr mode {mode!r}; expected one of {', '.join(PIN_MODES)} or None"
+            )
+        with self._lock:
+            if mode is None:
+                self._pins.pop(cls, None)
+                self._slow.pop(cls, None)
+                self._timings.pop(cls, None)
+                self._modes.pop(cls, None)
+            else:
+                self._pins[cls] = self._modes[cls] = mode
+    
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "threshold": self.threshold_ns / 1e9,
+                "types_timed": len(self._timings),
+                "switched": self.switched,
+                "summarized": self.summarized,
+                "slow_types": {
+                    _type_name(cls): round(average / 1e6, 3) for cls, average in self._slow.items()
+                },
+                "pinned": {_type_name(cls): mode for cls, mode in self._pins.items()},
+            }
+
+
+# Used by argumentToString for values without a registered formatter
+_guard = _ReprGuard()
+
+
+def set_repr_guard(enabled: Optional[bool] = None, threshold: Optional[float] = None) -> None:
+    """Configure the slow repr guard.
+    
+    Args:
+        enabled: Time reprs and summarize slow types (on by default).
+        threshold: Average repr time in seconds above which a type is
+            summarized (default 0.05).
+    
+    Raises:
+        ValueError: If threshold is not positive.
+    """
+    if enabled is not None:
+        _guard.enabled = enabled
+    if threshold is not None:
+        if threshold <= 0:
+            raise ValueError("threshold must be positive")
+        _guard.threshold_ns = threshold * 1e9
+
+
+def pin_repr(cls: type, mode: Optional[str]) -> None:
+    """Decide how objects of ``cls`` are shown, overriding the guard.
+    
+    Args:
+        cls: The type (exact type; subclasses are decided separately).
+        mode: "repr" (always the repr, never summarized), "summary" (always
+            the summary), or None (automatic again, forgetting the timings).
+    
+    Raises:
+        ValueError: If mode is unknown.
+    """
+    _guard.pin(cls, mode)
+
+
+def repr_guard_info() -> Dict[str, Any]:
+    """Get the state and counters of the repr guard.
+    
+    Returns:
+        Dict with the threshold, the number of types timed, types switched
+        to summaries (with their average repr time in ms), summaries shown
+        and pinned types.
+    """
+    return _guard.info()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Sampling Module
+
+Per-call-site sampling and rate limiting for ic().
+
+A sampling policy decides, before any frame inspection or formatting
+happens, whether a call is printed. Each call site (code object plus
+instruction offset) keeps its own counters, so a noisy ic() inside a hot
+loop can be throttled without silencing the rest of the program.
+
+Policies:
+- ``first=N``: print only the first N calls at the site
+- ``every=N``: print the 1st, (N+1)th, (2N+1)th, ... call
+- ``rate="10/s"``: token bucket allowing 10 calls per second (bursts of up
+  to one second's worth); units are ``/s``, ``/m`` and ``/h``
+
+Suppressed calls are summarized periodically, and once more at exit, as a
+single line such as ``suppressed 98,112 calls at app.py:42``.
+
+Usage:
+    from litprinter import ic
+    
+    for event in events:
+        ic(event, rate="5/s")            # per-call policy
+    
+    ic.configureSampling(every=1000)     # default policy for every site
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import atexit
+import threading
+import weakref
+from os.path import basename
+from time import monotonic
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+
+__all__ = [
+    "SamplingPolicy",
+    "SamplerRegistry",
+    "parse_rate",
+    "DEFAULT_SUMMARY_INTERVAL",
+]
+
+DEFAULT_SUMMARY_INTERVAL = 5.0
+
+# Suppressed calls only look at the clock once per this many calls
+_SUMMARY_CHECK_MASK = 0xFF
+
+_RATE_UNITS = {"s": 1.0, "sec": 1.0, "m": 60.0, "min": 60.0, "h": 3600.0, "hour": 3600.0}
+
+
+def parse_rate(rate: Union[str, float, int]) -> float:
+    """Parse a rate such as ``"10/s"``, ``"100/m"`` or ``2.5`` into calls/second.
+    
+    Args:
+        rate: Rate string ``"<count>/<unit>"`` or a number of calls per second.
+    
+    Returns:
+        The rate in calls per second.
+    
+    Raises:
+        ValueError: If the rate cannot be parsed or is not positive.
+    """
+    if isinstance(rate, (int, float)):
+        per_second = float(rate)
+    else:
+        count, _, unit = str(rate).partition("/")
+        try:
+            per_second = float(count) / _RATE_UNITS[unit.strip().lower() or "s"]
+        except (KeyError, ValueError):
+            raise ValueError(
+                f"Invalid rate {rate!r}; expected e.g. '10/s', '100/m' or '5/h'"
+            ) from None
+    if per_second <= 0:
+        raise ValueError(f"Rate must be positive, got {rate!r}")
+    return per_second
+
+
+class SamplingPolicy(NamedTuple):
+    """Which calls at a site are printed. Unset limits are None."""
+    
+    every: Optional[int] = None
+    first: Optional[int] = None
+    rate: Optional[float] = None  # calls per second
+    
+    @classmethod
+    def create(
+        cls,
+        every: Optional[int] = None,
+        first: Optional[int] = None,
+        rate: Union[str, float, None] = None,
+    ) -> Optional["SamplingPolicy"]:
+        """Build a validated policy, or None if no limit is set."""
+        if every is None and first is None and rate is None:
+            return None
+        if every is not None and every < 1:
+            raise ValueError(f"every must be >= 1, got {every!r}")
+        if first is not None and first < 0:
+            raise ValueError(f"first must be >= 0, got {first!r}")
+        return cls(every, first, parse_rate(rate) if rate is not None else None)
+
+
+class _SiteSampler:
+    """Counters and token bucket for one call site."""
+    
+    __slots__ = (
+        "policy", "calls", "suppressed", "tokens", "stamp", "summary_stamp",
+        "filename", "lineno",
+    )
+    
+    def __init__(self, policy: SamplingPolicy, filename: str, lineno: int):
+        now = monotonic()
+        self.policy = policy
+        self.calls = 0
+        self.suppressed = 0
+        self.tokens = self._burst(policy)
+        self.stamp = now
+        self.summary_stamp = now
+        self.filename = filename
+        self.lineno = lineno
+    
+    @staticmethod
+    def _burst(policy: SamplingPolicy) -> float:
+        return max(1.0, policy.rate) if policy.rate is not None else 0.0
+    
+    def allow(self) -> bool:
+        """Count a call and decide whether it should be printed."""
+        self.calls += 1
+        policy = self.policy
+        allowed = True
+        
+        if policy.first is not None and self.calls > policy.first:
+            allowed = False
+        elif policy.every is not None and (self.calls - 1) % policy.every:
+            allowed = False
+        elif policy.rate is not None:
+            now = monotonic()
+            tokens = self.tokens + (now - self.stamp) * policy.rate
+            self.stamp = now
+            burst = self._burst(policy)
+            if tokens > burst:
+                tokens = burst
+            if tokens >= 1.0:
+                self.tokens = tokens - 1.0
+            else:
+                self.tokens = tokens
+                allowed = False
+        
+        if not allowed:
+            self.suppressed += 1
+        return allowed
+    
+    def take_summary(self) -> Optional[str]:
+        """Return and reset the suppressed-calls summary, if there is one."""
+        count = self.suppressed
+        if not count:
+            return None
+        self.suppressed = 0
+        self.summary_stamp = monotonic()
+        noun = "call" if count == 1 else "calls"
+        return f"suppressed {count:,} {noun} at {basename(self.filename)}:{self.lineno}"
+
+
+# Registries with samplers, for the exit summary
+_registries: "weakref.WeakSet[SamplerRegistry]" = weakref.WeakSet()
+
+
+class SamplerRegistry:
+    """Per-call-site samplers of one debugger.
+    
+    Attributes:
+        summary_interval: Minimum seconds between summaries for a site.
+    """
+    
+    def __init__(
+        self,
+        emit_summary: Callable[[str], None],
+        summary_interval: float = DEFAULT_SUMMARY_INTERVAL,
+    ):
+        """Initialize the registry.
+        
+        Args:
+            emit_summary: Called with each "suppressed N calls at ..." line.
+            summary_interval: Minimum seconds between summaries for a site.
+        """
+        self.summary_interval = summary_interval
+        self._emit_summary = emit_summary
+        self._sites: Dict[Tuple[object, int], _SiteSampler] = {}
+        self._policies: Dict[tuple, Optional[SamplingPolicy]] = {}
+        self._lock = threading.Lock()
+        _registries.add(self)
+    
+    def policy_for(
+        self,
+        every: Optional[int],
+        first: Optional[int],
+        rate: Union[str, float, None],
+    ) -> Optional[SamplingPolicy]:
+        """Get the (cached) policy for per-call keyword arguments."""
+        key = (every, first, rate)
+        try:
+            return self._policies[key]
+        except KeyError:
+            policy = self._policies[key] = SamplingPolicy.create(every, first, rate)
+            return policy
+    
+    def allow(self, call_frame, policy: SamplingPolicy) -> bool:
+        """Decide whether the call executing in ``call_frame`` is printed.
+        
+        Only the frame's code object, instruction offset and (for new sites)
+        line number are read - no source analysis happens here.
+        """
+        key = (call_frame.f_code, call_frame.f_lasti)
+        sampler = self._sites.get(key)
+        if sampler is None or sampler.policy is not policy:
+            with self._lock:
+                sampler = self._sites[key] = _SiteSampler(
+                    policy, call_frame.f_code.co_filename, call_frame.f_lineno
+                )
+        
+        allowed = sampler.allow()
+        if sampler.suppressed and (allowed or not sampler.suppressed & _SUMMARY_CHECK_MASK):
+            if monotonic() - sampler.summary_stamp >= self.summary_interval:
+                summary = sampler.take_summary()
+                if summary:
+                    self._emit_summary(summary)
+        return allowed
+    
+    def flush_summaries(self) -> None:
+        """Emit a summary for every site with suppressed calls."""
+        with self._lock:
+            samplers = list(self._sites.values())
+        for sampler in samplers:
+            summary = sampler.take_summary()
+            if summary:
+                self._emit_summary(summary)
+    
+    def stats(self) -> List[Dict[str, object]]:
+        """Per-site call and suppression counters."""
+        with self._lock:
+            samplers = list(self._sites.values())
+        return [
+            {
+                "file": sampler.filename,
+                "line": sampler.lineno,
+                "calls": sampler.calls,
+                "suppressed": sampler.suppressed,
+            }
+            for sampler in samplers
+        ]
+    
+    def clear(self) -> None:
+        """Forget all per-site state."""
+        with self._lock:
+            self._sites.clear()
+
+
+def _flush_at_exit() -> None:
+    """Report calls that were suppressed since the last summary."""
+    for registry in list(_registries):
+        try:
+            registry.flush_summaries()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_at_exit)
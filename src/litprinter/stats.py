@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Stats Module
+
+Per-call-site statistics about what ic() itself costs.
+
+When enabled, every ic() call site records how often it was called and
+suppressed (sampled or filtered out), the time spent in expression
+analysis, value formatting, highlighting and writing, and the number of
+bytes it emitted. ``ic.stats()`` returns the numbers, ``ic.printStats()``
+renders the most expensive sites in a Panel, and a summary is printed at
+exit.
+
+Recording is off by default, so ic() pays nothing for it. Enable it with
+``ic.configureStats(True)`` or ``LITPRINTER_STATS=1``.
+
+In the sink modes (flight recorder, structured output, capture log) ic()
+hands its values to the sink instead of formatting and writing them. Those
+calls are counted too, with the time spent in the sink as format time;
+their highlight, write and bytes columns stay zero, and bare ic() calls
+show no lap.
+
+Usage:
+    from litprinter import ic
+    
+    ic.configureStats(True)
+    ...
+    ic.printStats(top=5)
+    # ╭ ic() overhead (top 5 of 12 sites) ─────────────────────────────╮
+    # │ site            calls  suppr.  analysis  format  highlight ... │
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import atexit
+import os
+import sys
+import threading
+import weakref
+from os.path import basename
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional
+
+
+__all__ = [
+    "CallSiteStats",
+    "STATS_ENV",
+    "totals",
+]
+
+STATS_ENV = "LITPRINTER_STATS"
+
+DEFAULT_TOP = 10
+
+# Set while any debugger records stats: the default output function then
+# reports its highlight time through note_highlight()
+MEASURING = False
+
+_phases = threading.local()
+
+_COUNTERS = (
+    "calls", "suppressed", "analysis_ns", "format_ns", "highlight_ns", "write_ns", "bytes",
+)
+
+
+def note_highlight(ns: int) -> None:
+    """Record the highlight time of the output being written on this thread."""
+    _phases.highlight = ns
+
+
+class _SiteStats:
+    """Counters of one call site."""
+    
+    __slots__ = ("filename", "lineno", "function") + _COUNTERS
+    
+    def __init__(self, filename: str, lineno: int, function: str):
+        self.filename = filename
+        self.lineno = lineno
+        self.function = function
+        for counter in _COUNTERS:
+            setattr(self, counter, 0)
+    
+    @property
+    def total_ns(self) -> int:
+        return self.analysis_ns + self.format_ns + self.highlight_ns + self.write_ns
+    
+    def as_dict(self) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "file": self.filename,
+            "line": self.lineno,
+            "function": self.function,
+        }
+        for counter in _COUNTERS:
+            row[counter] = getattr(self, counter)
+        row["total_ns"] = self.total_ns
+        return row
+
+
+# Registries with stats, for the exit summary and totals()
+_registries: "weakref.WeakSet[CallSiteStats]" = weakref.WeakSet()
+
+
+class CallSiteStats:
+    """Per-call-site counters of one debugger.
+    
+    Attributes:
+        report_at_exit: Print the top sites when the interpreter exits.
+        top: Number of sites in reports.
+    """
+    
+    def __init__(self, report_at_exit: bool = True, top: int = DEFAULT_TOP):
+        """Initialize the registry and start measuring output.
+        
+        Args:
+            report_at_exit: Print the top sites when the interpreter exits.
+            top: Number of sites in reports.
+        """
+        global MEASURING
+        self.report_at_exit = report_at_exit
+        self.top = top
+        self._sites: Dict[tuple, _SiteStats] = {}
+        self._lock = threading.Lock()
+        _registries.add(self)
+        MEASURING = True
+    
+    def close(self) -> None:
+        """Stop recording: leave the exit report and totals(), and stop
+        measuring output once no registry records stats."""
+        global MEASURING
+        self.report_at_exit = False
+        _registries.discard(self)
+        MEASURING = bool(_registries)
+    
+    def site(self, call_frame) -> _SiteStats:
+        """Get (or create) the counters of the call executing in ``call_frame``."""
+        code = call_frame.f_code
+        key = (code, call_frame.f_lasti)
+        site = self._sites.get(key)
+        if site is None:
+            with self._lock:
+                site = self._sites.setdefault(
+                    key, _SiteStats(code.co_filename, call_frame.f_lineno, code.co_name)
+                )
+        return site
+    
+    def record(self, site: _SiteStats, analysis_ns: int, format_ns: int) -> None:
+        """Count a printed (or sunk) call and the time spent preparing its output."""
+        with self._lock:
+            site.calls += 1
+            site.analysis_ns += analysis_ns
+            site.format_ns += format_ns
+    
+    def suppressed(self, call_frame) -> None:
+        """Count a call that was sampled or filtered out."""
+        site = self.site(call_frame)
+        with self._lock:
+            site.calls += 1
+            site.suppressed += 1
+    
+    def measured(self, site: _SiteStats, output_function: Callable[[str], None]
+                 ) -> Callable[[str], None]:
+        """Wrap an output function to charge its time and output to ``site``.
+        
+        The wrapper may run on the background writer thread.
+        """
+        def output(text: str) -> None:
+            _phases.highlight = 0
+            start = perf_counter_ns()
+            try:
+                output_function(text)
+            finally:
+                elapsed = perf_counter_ns() - start
+                highlight = min(_phases.highlight, elapsed)
+                with self._lock:
+                    site.highlight_ns += highlight
+                    site.write_ns += elapsed - highlight
+                    site.bytes += len(text.encode("utf-8", "replace"))
+        return output
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Counters of every site, most expensive first (times in nanoseconds)."""
+        with self._lock:
+            rows = [site.as_dict() for site in self._sites.values()]
+        rows.sort(key=lambda row: row["total_ns"], reverse=True)
+        return rows
+    
+    def clear(self) -> None:
+        """Forget all counters."""
+        with self._lock:
+            self._sites.clear()
+    
+    def report(self, top: Optional[int] = None) -> str:
+        """Render the most expensive sites as a Panel (empty if none)."""
+        rows = self.stats()
+        if not rows:
+            return ""
+        top = self.top if top is None else top
+        shown = rows[:top]
+        header = ["site", "calls", "suppr.", "analysis", "format", "highlight", "write", "bytes"]
+        table = [header] + [
+            [
+                f"{basename(row['file'])}:{row['line']} {row['function']}",
+                f"{row['calls']:,}",
+                f"{row['suppressed']:,}",
+                _ms(row["analysis_ns"]),
+                _ms(row["format_ns"]),
+                _ms(row["highlight_ns"]),
+                _ms(row["write_ns"]),
+                f"{row['bytes']:,}",
+            ]
+            for row in shown
+        ]
+        widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+        lines = [
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(line, widths))
+            )
+            for line in table
+        ]
+        total = sum(row["total_ns"] for row in rows)
+        lines.append(f"total ic() time: {_ms(total)} in {sum(row['calls'] for row in rows):,} calls")
+        guard = sys.modules.get(f"{__package__}.reprguard")
+        slow_types = guard.repr_guard_info()["slow_types"] if guard is not None else {}
+        if slow_types:
+            lines.append(
+                f"slow reprs summarized: {len(slow_types)} type(s) ({', '.join(slow_types)})"
+            )
+        
+        from .panel import Panel
+        title = f"ic() overhead (top {len(shown)} of {len(rows)} sites)"
+        return Panel.fit("\n".join(lines), title=title).render()
+
+
+def _ms(ns: int) -> str:
+    return f"{ns / 1e6:.2f}ms"
+
+
+def totals() -> Dict[str, int]:
+    """Counters summed over every site of every debugger recording stats."""
+    summed = dict.fromkeys(_COUNTERS, 0)
+    for registry in list(_registries):
+        for row in registry.stats():
+            for counter in _COUNTERS:
+                summed[counter] += row[counter]
+    return summed
+
+
+def enabled_from_env() -> bool:
+    """Whether ``LITPRINTER_STATS`` asks for stats."""
+    return os.environ.get(STATS_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+def _report_at_exit() -> None:
+    """Print the top sites of registries that asked for it."""
+    for registry in list(_registries):
+        if not registry.report_at_exit:
+            continue
+        try:
+            report = registry.report()
+            if report:
+                print(report, file=sys.stderr)
+        except Exception:
+            pass
+
+
+atexit.register(_report_at_exit)
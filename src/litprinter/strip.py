@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Strip Module
+
+An opt-in import hook that removes ic() calls from production code.
+
+Even a disabled ic() evaluates its arguments, builds the call and enters
+the debugger. With the hook installed, modules are rewritten at import time
+so that ``ic(expr)`` becomes ``expr``, ``ic(a, b)`` becomes ``(a, b)`` and
+``ic()`` becomes ``None`` - the values ic() would have passed through -
+and no debugger code runs at all. ``ic.lazy(...)`` becomes ``None``, as
+when output is disabled, without creating its lambdas.
+
+The rewritten bytecode is cached next to the normal ``.pyc`` files (as
+``module.cpython-XY.opt-litstrip2.pyc``) and reused while the source is
+unchanged, so the rewrite only costs something on the first import.
+
+Calls are left alone when they cannot be rewritten without changing what
+is evaluated: starred arguments (``ic(*values)``), ``**kwargs`` and keyword
+arguments whose values are not constants.
+
+Enable it from the environment (litprinter is imported at startup by its
+``.pth`` file, so the hook is in place before application code runs)::
+
+    LITPRINTER_STRIP=1 LITPRINTER_STRIP_PACKAGES=myapp,myapp_utils python -m myapp
+
+Without ``LITPRINTER_STRIP_PACKAGES`` every module outside the standard
+library and site-packages is rewritten. ``LITPRINTER_STRIP_NAMES`` changes
+the names treated as ic (default ``ic``).
+
+Usage:
+    from litprinter.strip import install_strip_hook
+    
+    install_strip_hook(packages=["myapp"])
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import ast
+import os
+import sys
+from importlib.abc import MetaPathFinder
+from importlib.machinery import SourceFileLoader
+from importlib.util import MAGIC_NUMBER, cache_from_source
+import marshal
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+__all__ = [
+    "StripTransformer",
+    "StripFinder",
+    "StripLoader",
+    "strip_source",
+    "install_strip_hook",
+    "uninstall_strip_hook",
+    "install_from_env",
+]
+
+DEFAULT_NAMES = ("ic",)
+
+# Bump when the rewrite changes, so stale cached bytecode is not reused
+STRIP_VERSION = 2
+
+
+def _split_env(name: str) -> List[str]:
+    return [item.strip() for item in os.environ.get(name, "").split(",") if item.strip()]
+
+
+# ============================================================================
+# AST Rewrite
+# ============================================================================
+
+class StripTransformer(ast.NodeTransformer):
+    """Replace ``ic(...)`` calls by the value the call would return.
+    
+    Attributes:
+        names: Function names treated as ic.
+        stripped: Number of calls rewritten so far.
+    """
+    
+    def __init__(self, names: Iterable[str] = DEFAULT_NAMES):
+        self.names = frozenset(names)
+        self.stripped = 0
+    
+    def _is_lazy(self, func: ast.AST) -> bool:
+        """Whether ``func`` is ``ic.lazy``."""
+        return (
+            isinstance(func, ast.Attribute) and func.attr == "lazy"
+            and isinstance(func.value, ast.Name) and func.value.id in self.names
+        )
+    
+    def _strippable(self, node: ast.Call) -> bool:
+        func = node.func
+        if not (isinstance(func, ast.Name) and func.id in self.names or self._is_lazy(func)):
+            return False
+        if any(isinstance(arg, ast.Starred) for arg in node.args):
+            return False
+        # Keyword options (includeContext=..., rate=...) are dropped, which
+        # is only safe when evaluating them has no effect
+        return all(
+            keyword.arg is not None and isinstance(keyword.value, ast.Constant)
+            for keyword in node.keywords
+        )
+    
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        if not self._strippable(node):
+            return node
+        
+        self.stripped += 1
+        args = node.args
+        if not args or self._is_lazy(node.func):
+            replacement: ast.AST = ast.Constant(value=None)
+        elif len(args) == 1:
+            return args[0]
+        else:
+            replacement = ast.Tuple(elts=args, ctx=ast.Load())
+        return ast.copy_location(replacement, node)
+
+
+def strip_source(source: bytes, path: str, names: Iterable[str] = DEFAULT_NAMES):
+    """Compile module source with its ic() calls stripped.
+    
+    Args:
+        source: The module source.
+        path: The file name recorded in the code object.
+        names: Function names treated as ic.
+    
+    Returns:
+        The module code object.
+    """
+    tree = ast.parse(source, filename=path)
+    tree = ast.fix_missing_locations(StripTransformer(names).visit(tree))
+    return compile(tree, path, "exec", dont_inherit=True)
+
+
+# ============================================================================
+# Import Hook
+# ============================================================================
+
+def _cache_tag() -> str:
+    optimize = sys.flags.optimize
+    return f"litstrip{STRIP_VERSION}" + (f"o{optimize}" if optimize else "")
+
+
+class StripLoader(SourceFileLoader):
+    """Source loader that strips ic() calls and caches the result separately."""
+    
+    def __init__(self, fullname: str, path: str, names: Iterable[str] = DEFAULT_NAMES):
+        super().__init__(fullname, path)
+        self.names = tuple(names)
+    
+    def source_to_code(self, data, path, *, _optimize=-1):
+        return strip_source(data, path, self.names)
+    
+    def get_code(self, fullname: str):
+        source_path = self.get_filename(fullname)
+        try:
+            cache_path = cache_from_source(source_path, optimization=_cache_tag())
+        except NotImplementedError:
+            cache_path = None
+        
+        stats = self.path_stats(source_path)
+        mtime = int(stats["mtime"]) & 0xFFFFFFFF
+        size = int(stats.get("size", 0)) & 0xFFFFFFFF
+        header = (
+            MAGIC_NUMBER
+            + (0).to_bytes(4, "little")
+            + mtime.to_bytes(4, "little")
+            + size.to_bytes(4, "little")
+        )
+        
+        if cache_path is not None:
+            try:
+                data = self.get_data(cache_path)
+            except OSError:
+                pass
+            else:
+                if data[:16] == header:
+                    try:
+                        return marshal.loads(data[16:])
+                    except (EOFError, ValueError, TypeError):
+                        pass
+        
+        code = self.source_to_code(self.get_data(source_path), source_path)
+        if cache_path is not None and not sys.dont_write_bytecode:
+            try:
+                self.set_data(cache_path, header + marshal.dumps(code))
+            except (NotImplementedError, OSError):
+                pass
+        return code
+
+
+def _library_paths() -> Tuple[str, ...]:
+    """Directories of the standard library and installed packages."""
+    import sysconfig
+    paths = sysconfig.get_paths()
+    return tuple(
+        os.path.realpath(paths[key]) + os.sep
+        for key in ("stdlib", "platstdlib", "purelib", "platlib")
+        if key in paths
+    )
+
+
+class StripFinder(MetaPathFinder):
+    """Meta path finder that loads selected modules through StripLoader.
+    
+    Attributes:
+        packages: Top-level package (or module) names to rewrite; empty to
+            rewrite everything outside the standard library and site-packages.
+        names: Function names treated as ic.
+    """
+    
+    def __init__(self, packages: Sequence[str] = (), names: Iterable[str] = DEFAULT_NAMES):
+        self.packages = tuple(packages)
+        self.names = tuple(names)
+        # Resolved now: importing from inside find_spec() would recurse
+        self._excluded = () if self.packages else _library_paths()
+    
+    def _selected_name(self, fullname: str) -> bool:
+        if fullname == "litprinter" or fullname.startswith("litprinter."):
+            return False
+        if not self.packages:
+            return True
+        return any(
+            fullname == package or fullname.startswith(package + ".")
+            for package in self.packages
+        )
+    
+    def _selected_path(self, path: str) -> bool:
+        if self.packages:
+            return True
+        return not os.path.realpath(path).startswith(self._excluded)
+    
+    def find_spec(self, fullname, path, target=None):
+        if not self._selected_name(fullname):
+            return None
+        
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        
+        loader = spec.loader
+        if type(loader) is not SourceFileLoader or not self._selected_path(spec.origin):
+            return spec
+        spec.loader = StripLoader(loader.name, loader.path, self.names)
+        if spec.cached is not None:
+            try:
+                spec.cached = cache_from_source(spec.origin, optimization=_cache_tag())
+            except NotImplementedError:
+                pass
+        return spec
+
+
+_finder: Optional[StripFinder] = None
+
+
+def install_strip_hook(
+    packages: Sequence[str] = (),
+    names: Iterable[str] = DEFAULT_NAMES,
+) -> StripFinder:
+    """Rewrite ic() calls in modules imported from now on.
+    
+    Modules that are already imported are not affected.
+    
+    Args:
+        packages: Packages to rewrite (default: all modules outside the
+            standard library and site-packages).
+        names: Function names treated as ic.
+    
+    Returns:
+        The installed finder.
+    """
+    global _finder
+    uninstall_strip_hook()
+    _finder = StripFinder(packages, names)
+    sys.meta_path.insert(0, _finder)
+    return _finder
+
+
+def uninstall_strip_hook() -> None:
+    """Remove the import hook installed by install_strip_hook()."""
+    global _finder
+    if _finder is not None and _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+    _finder = None
+
+
+def install_from_env() -> Optional[StripFinder]:
+    """Install the hook if ``LITPRINTER_STRIP`` is set to a true value.
+    
+    ``LITPRINTER_STRIP_PACKAGES`` and ``LITPRINTER_STRIP_NAMES`` are
+    comma-separated lists of packages to rewrite and names treated as ic.
+    """
+    if os.environ.get("LITPRINTER_STRIP", "").lower() not in ("1", "true", "yes", "on"):
+        return None
+    return install_strip_hook(
+        _split_env("LITPRINTER_STRIP_PACKAGES"),
+        _split_env("LITPRINTER_STRIP_NAMES") or DEFAULT_NAMES,
+    )
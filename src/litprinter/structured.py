@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Structured Output Module
+
+JSON-lines output for ic(), for log pipelines that should not have to parse
+the human-readable format back.
+
+Each ic() call becomes one compact JSON object on its own line::
+
+    {"prefix":"ic| ","values":[{"expr":"user.id","value_repr":"42","type":"int"}],
+     "file":"/app/api.py","line":12,"function":"handle","thread":"MainThread",
+     "pid":4242,"monotonic":5123.004871,"time":1760668800.123456}
+
+(shown wrapped; records are single lines). Other ic() output, such as
+timer reports, watch changes and sampling summaries, becomes a
+``{"kind":"message","text":...,"thread":...,"pid":...,...}`` record.
+Values are formatted with the
+argToStringFunction in effect and never colorized. The JSON is assembled
+from pieces precomputed per call site and per type, with only the value
+text escaped per call, and records are written in batches: when a batch
+is full, or by a background thread once the oldest record has waited
+``max_delay`` seconds.
+
+Usage:
+    from litprinter import ic
+    
+    ic.configureStructured(True)                        # stderr
+    ic.configureStructured(True, sink="/var/log/app/ic.jsonl", batchSize=256)
+    ic.configureStructured(False)                       # back to text output
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import atexit
+import os
+import sys
+import threading
+import weakref
+from json.encoder import encode_basestring
+from time import monotonic, time
+from typing import Any, Callable, Dict, IO, List, Optional, Union
+
+from .core import OutputConfig, _get_call_site
+from .writer import AtomicWriter
+
+
+__all__ = [
+    "JsonLinesSink",
+    "DEFAULT_BATCH_SIZE",
+]
+
+DEFAULT_BATCH_SIZE = 64
+# Buffered records are written once the oldest is this many seconds old
+DEFAULT_MAX_DELAY = 1.0
+
+Target = Union[None, int, str, "os.PathLike[str]", IO[str], Callable[[str], Any]]
+
+# Sinks with buffered records, flushed at exit and reset after fork
+_sinks: "weakref.WeakSet[JsonLinesSink]" = weakref.WeakSet()
+
+
+# C-accelerated JSON string escaping (adds the quotes)
+_encode_str = encode_basestring
+
+# Start of a value whose expression is unknown (no source)
+_UNKNOWN_EXPR = '{"expr":null,"value_repr":'
+
+
+class _SiteJson:
+    """JSON fragments of one call site that do not change between calls."""
+    
+    __slots__ = ("exprs", "location")
+    
+    def __init__(self, exprs: List[str], location: str):
+        # '{"expr":"x","value_repr":' per argument
+        self.exprs = exprs
+        # ',"file":...,"line":...,"function":...'
+        self.location = location
+
+
+class JsonLinesSink:
+    """Write ic() calls as JSON lines to a file, stream or function.
+    
+    Installed by ``ic.configureStructured()``; while installed, ic() calls
+    are written as JSON instead of text.
+    
+    Attributes:
+        batch_size: Number of records written together.
+        max_delay: Seconds a buffered record may wait for its batch.
+    """
+    
+    def __init__(
+        self,
+        target: Target = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        """Initialize the sink.
+        
+        Args:
+            target: Where records go: None for ``sys.stderr``, a path or
+                file descriptor (written with one ``os.write`` per batch,
+                see AtomicWriter), a text stream, or a function called
+                with each batch of lines.
+            batch_size: Number of records written together.
+            max_delay: Write buffered records once the oldest is this many
+                seconds old (also flushed by ``ic.flush()`` and at exit).
+        
+        Raises:
+            ValueError: If batch_size is not positive.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._owned: Optional[AtomicWriter] = None
+        if target is None:
+            self._write: Callable[[str], Any] = self._write_stderr
+        elif isinstance(target, (int, str)) or hasattr(target, "__fspath__"):
+            self._owned = AtomicWriter(target)
+            self._write = self._owned.write
+        elif hasattr(target, "write"):
+            stream = target
+            
+            def write(text: str) -> None:
+                stream.write(text)
+                stream.flush()
+            
+            self._write = write
+        else:
+            self._write = target
+        self._sites: Dict[tuple, _SiteJson] = {}
+        self._types: Dict[type, str] = {}
+        self._closed = False
+        self._reset()
+        _sinks.add(self)
+    
+    def _reset(self) -> None:
+        """(Re)create the buffer and lock; used at init and after fork."""
+        self._buffer: List[str] = []
+        self._oldest = 0.0
+        self._lock = threading.Lock()
+        # Notified when a record goes into an empty buffer
+        self._buffered = threading.Condition(self._lock)
+        # Writes batches whose oldest record waited max_delay; started
+        # with the first record
+        self._flusher: Optional[threading.Thread] = None
+    
+    @staticmethod
+    def _write_stderr(text: str) -> None:
+        sys.stderr.write(text)
+        sys.stderr.flush()
+    
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+    
+    def _site(self, call_frame, lazy: bool) -> _SiteJson:
+        key = (call_frame.f_code, call_frame.f_lasti)
+        site = self._sites.get(key)
+        if site is None:
+            code = call_frame.f_code
+            call_site = _get_call_site(call_frame, lazy)
+            exprs = [
+                '{"expr":%s,"value_repr":' % _encode_str(expr) if isinstance(expr, str)
+                else _UNKNOWN_EXPR
+                for expr in call_site.exprs
+            ]
+            location = ',"file":%s,"line":%d,"function":%s' % (
+                _encode_str(code.co_filename), call_frame.f_lineno, _encode_str(code.co_name)
+            )
+            site = self._sites[key] = _SiteJson(exprs, location)
+        return site
+    
+    def _type(self, cls: type) -> str:
+        encoded = self._types.get(cls)
+        if encoded is None:
+            name = cls.__qualname__
+            if cls.__module__ != "builtins":
+                name = f"{cls.__module__}.{name}"
+            encoded = self._types[cls] = ',"type":%s}' % _encode_str(name)
+        return encoded
+    
+    def encode(self, call_frame, args: tuple, config: OutputConfig, prefix: str,
+               lazy: bool = False) -> str:
+        """The JSON line (without newline) of an ic() call."""
+        site = self._site(call_frame, lazy)
+        to_string = config.argToStringFunction
+        exprs = site.exprs
+        types = self._types
+        parts = []
+        for index, value in enumerate(args):
+            cls = type(value)
+            expr = exprs[index] if index < len(exprs) else _UNKNOWN_EXPR
+            parts.append(expr + _encode_str(to_string(value)) + (types.get(cls) or self._type(cls)))
+        values = ",".join(parts)
+        return '{"prefix":%s,"values":[%s]%s,"thread":%s,"pid":%d,"monotonic":%r,"time":%r}' % (
+            _encode_str(prefix),
+            values,
+            site.location,
+            _encode_str(threading.current_thread().name),
+            os.getpid(),
+            monotonic(),
+            time(),
+        )
+    
+    def encode_message(self, text: str) -> str:
+        """The JSON line of other output (a timer, watch or sampling summary line)."""
+        return '{"kind":"message","text":%s,"thread":%s,"pid":%d,"monotonic":%r,"time":%r}' % (
+            _encode_str(text),
+            _encode_str(threading.current_thread().name),
+            os.getpid(),
+            monotonic(),
+            time(),
+        )
+    
+    # ------------------------------------------------------------------
+    # Sink interface
+    # ------------------------------------------------------------------
+    
+    def record(self, call_frame, args: tuple, config: OutputConfig, lazy: bool = False) -> None:
+        """Encode an ic() call and buffer it (writing the batch when full)."""
+        prefix = config.prefix() if callable(config.prefix) else config.prefix
+        self._buffer_line(self.encode(call_frame, args, config, prefix, lazy))
+    
+    def message(self, text: str) -> None:
+        """Buffer other ic() output (timer reports, watches, summaries) as a record."""
+        self._buffer_line(self.encode_message(text))
+    
+    def _buffer_line(self, line: str) -> None:
+        with self._lock:
+            buffer = self._buffer
+            if not buffer:
+                self._oldest = monotonic()
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_when_due, name="litprinter-structured", daemon=True
+                    )
+                    self._flusher.start()
+                else:
+                    self._buffered.notify()
+            buffer.append(line)
+            if len(buffer) < self.batch_size and monotonic() - self._oldest < self.max_delay:
+                return
+            batch = self._take()
+        self._write(batch)
+    
+    def _take(self) -> str:
+        """Empty the buffer into one text (called with the lock held)."""
+        batch = "\n".join(self._buffer) + "\n"
+        self._buffer = []
+        return batch
+    
+    def _flush_when_due(self) -> None:
+        """Flusher thread: write the buffer once its oldest record is due."""
+        with self._lock:
+            while not self._closed:
+                if not self._buffer:
+                    self._buffered.wait()
+                    continue
+                remaining = self._oldest + self.max_delay - monotonic()
+                if remaining > 0:
+                    self._buffered.wait(remaining)
+                    continue
+                batch = self._take()
+                self._lock.release()
+                try:
+                    self._write(batch)
+                except Exception:
+                    pass
+                finally:
+                    self._lock.acquire()
+    
+    def flush(self) -> None:
+        """Write the buffered records."""
+        with self._lock:
+            if not self._buffer:
+                return
+            batch = self._take()
+        self._write(batch)
+    
+    def close(self) -> None:
+        """Stop the flusher, flush, and close the file if the sink opened it."""
+        with self._lock:
+            self._closed = True
+            self._buffered.notify()
+        self.flush()
+        _sinks.discard(self)
+        if self._owned is not None:
+            self._owned.close()
+            self._owned = None
+    
+    def __repr__(self) -> str:
+        return f"<JsonLinesSink batch_size={self.batch_size} buffered={len(self._buffer)}>"
+
+
+def _flush_at_exit() -> None:
+    for sink in list(_sinks):
+        try:
+            sink.flush()
+        except Exception:
+            pass
+
+
+def _after_fork_in_child() -> None:
+    # Records buffered in the parent are written by the parent
+    for sink in list(_sinks):
+        sink._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(_flush_at_exit)
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Timing Module
+
+Timers, lap deltas and resource deltas for ic().
+
+- ``ic.timer()`` measures a block (as a context manager) or every call of a
+  function (as a decorator) with ``perf_counter_ns`` and prints the elapsed
+  time. Measurements are aggregated per site (count, p50/p95/p99, max).
+- A bare ``ic()`` shows the time since the previous ic() on the same thread
+  next to its timestamp.
+- With ``ic.configureTiming(cpu=True, rss=True)`` both also show the CPU
+  time used by the thread and the change in resident memory (read from
+  ``/proc/self/statm``, where available). Other ic() calls only read the
+  wall clock, so the resource deltas of a bare ic() cover the time since
+  the previous bare ic() on the thread.
+
+Aggregates are printed by ``ic.timings()``, and at exit with
+``ic.configureTiming(reportAtExit=True)``.
+
+Usage:
+    from litprinter import ic
+    
+    with ic.timer("load"):
+        data = load()
+    # ic| load took 12.3 ms
+    
+    @ic.timer(quiet=True)
+    def handle(request):
+        ...
+    
+    ic.timings()
+    # ic| timings:
+    #       site      count     p50     p95     p99     max
+    #       handle      120  1.2 ms  3.4 ms  5.0 ms  7.9 ms
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import atexit
+import functools
+import os
+import random
+import threading
+import weakref
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from time import thread_time_ns as _cpu_time_ns
+except ImportError:  # platforms without a per-thread CPU clock
+    from time import process_time_ns as _cpu_time_ns
+
+
+__all__ = [
+    "Timer",
+    "TimingRegistry",
+    "format_duration",
+    "read_rss",
+]
+
+# Measurements kept per site for percentiles (count and max stay exact)
+RESERVOIR_SIZE = 10_000
+
+_PERCENTILES = (50, 95, 99)
+
+
+# ============================================================================
+# Clocks
+# ============================================================================
+
+_statm_fd: Optional[int] = None
+_page_size = 0
+
+
+def read_rss() -> Optional[int]:
+    """Current resident set size in bytes, or None if it cannot be read.
+    
+    Reads ``/proc/self/statm`` through a descriptor kept open across calls.
+    """
+    global _statm_fd, _page_size
+    try:
+        if _statm_fd is None:
+            _statm_fd = os.open("/proc/self/statm", os.O_RDONLY)
+            _page_size = os.sysconf("SC_PAGE_SIZE")
+        return int(os.pread(_statm_fd, 128, 0).split()[1]) * _page_size
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _reset_statm() -> None:
+    # The descriptor refers to the parent process after fork()
+    global _statm_fd
+    _statm_fd = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_statm)
+
+
+# A snapshot is (wall ns, cpu ns or None, rss bytes or None)
+Snapshot = Tuple[int, Optional[int], Optional[int]]
+
+
+def format_duration(ns: int) -> str:
+    """Format nanoseconds as e.g. ``850 ns``, ``12.3 µs``, ``4.56 ms`` or ``1.2 s``."""
+    if ns < 1_000:
+        return f"{ns} ns"
+    for unit, scale in (("µs", 1_000), ("ms", 1_000_000), ("s", 1_000_000_000)):
+        value = ns / scale
+        if value < 1_000 or unit == "s":
+            return f"{value:.3g} {unit}"
+    return f"{ns} ns"
+
+
+def _format_bytes_delta(delta: int) -> str:
+    sign = "-" if delta < 0 else "+"
+    size = float(abs(delta))
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{sign}{int(size)} {unit}" if unit == "B" else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+def _format_resources(start: Snapshot, end: Snapshot) -> str:
+    """``cpu 11.9 ms, rss +2.0 MiB`` for the parts measured in both snapshots."""
+    parts = []
+    if start[1] is not None and end[1] is not None:
+        parts.append(f"cpu {format_duration(end[1] - start[1])}")
+    if start[2] is not None and end[2] is not None:
+        parts.append(f"rss {_format_bytes_delta(end[2] - start[2])}")
+    return ", ".join(parts)
+
+
+# ============================================================================
+# Aggregates
+# ============================================================================
+
+class _SiteTimings:
+    """Exact count/total/max and a sample reservoir for percentiles."""
+    
+    __slots__ = ("label", "count", "total", "max", "samples", "_lock", "_random")
+    
+    def __init__(self, label: str, lock: threading.Lock, rng: random.Random):
+        self.label = label
+        self._lock = lock
+        self._random = rng.random
+        self.reset()
+    
+    def reset(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.samples: List[int] = []
+    
+    def add(self, elapsed: int) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+            if len(self.samples) < RESERVOIR_SIZE:
+                self.samples.append(elapsed)
+            else:
+                # Reservoir sampling: keep each measurement with equal probability
+                slot = int(self._random() * self.count)
+                if slot < RESERVOIR_SIZE:
+                    self.samples[slot] = elapsed
+    
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        stats: Dict[str, Any] = {"site": self.label, "count": self.count}
+        for percentile in _PERCENTILES:
+            # Nearest-rank percentile
+            rank = max(1, -(-percentile * len(ordered) // 100))
+            stats[f"p{percentile}"] = ordered[rank - 1] if ordered else 0
+        stats["max"] = self.max
+        stats["total"] = self.total
+        return stats
+
+
+# Registries that report at exit
+_registries: "weakref.WeakSet[TimingRegistry]" = weakref.WeakSet()
+
+
+class TimingRegistry:
+    """Lap clocks and per-site timer aggregates of one debugger.
+    
+    Attributes:
+        cpu: Also measure thread CPU time.
+        rss: Also measure resident memory.
+        report_at_exit: Print the aggregates when the interpreter exits.
+    """
+    
+    def __init__(self, emit_report: Callable[[str], None]):
+        """Initialize the registry.
+        
+        Args:
+            emit_report: Called with the lines of the at-exit report.
+        """
+        self.cpu = False
+        self.rss = False
+        self.report_at_exit = False
+        self._emit_report = emit_report
+        self._sites: Dict[object, _SiteTimings] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._rng = random.Random()
+        _registries.add(self)
+    
+    def snapshot(self, wall: Optional[int] = None) -> Snapshot:
+        """Read the wall clock (unless given) and the enabled resource counters."""
+        return (
+            perf_counter_ns() if wall is None else wall,
+            _cpu_time_ns() if self.cpu else None,
+            read_rss() if self.rss else None,
+        )
+    
+    def lap(self, describe: bool = True) -> str:
+        """Start a new lap on this thread and describe the previous one.
+        
+        Every lap reads the wall clock; the resource counters are only read
+        for described laps, whose resource deltas therefore span back to the
+        previous described lap.
+        
+        Args:
+            describe: Return the description (False: only start the lap).
+        
+        Returns:
+            ``+1.23 ms`` (with resource deltas if enabled) since the previous
+            lap on this thread, or '' for the thread's first lap.
+        """
+        now = perf_counter_ns()
+        local = self._local
+        previous = getattr(local, "last", None)
+        local.last = now
+        if not describe:
+            return ""
+        snapshot = self.snapshot(now)
+        described = getattr(local, "described", None)
+        local.described = snapshot
+        if previous is None:
+            return ""
+        delta = f"+{format_duration(now - previous)}"
+        resources = _format_resources(described, snapshot) if described is not None else ""
+        return f"{delta}, {resources}" if resources else delta
+    
+    def site(self, key: object, label: str) -> _SiteTimings:
+        """Get (or create) the aggregates of a site."""
+        site = self._sites.get(key)
+        if site is None:
+            with self._lock:
+                site = self._sites.setdefault(key, _SiteTimings(label, self._lock, self._rng))
+        return site
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-site count, p50/p95/p99, max and total (in nanoseconds)."""
+        with self._lock:
+            return [site.stats() for site in self._sites.values() if site.count]
+    
+    def report(self) -> List[str]:
+        """The aggregates as table lines (empty if nothing was timed)."""
+        stats = self.stats()
+        if not stats:
+            return []
+        header = ["site", "count"] + [f"p{p}" for p in _PERCENTILES] + ["max"]
+        rows = [
+            [str(row["site"]), f"{row['count']:,}"]
+            + [format_duration(row[name]) for name in header[2:]]
+            for row in sorted(stats, key=lambda row: -row["total"])
+        ]
+        widths = [max(len(line[i]) for line in [header] + rows) for i in range(len(header))]
+        return [
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(line, widths))
+            ).rstrip()
+            for line in [header] + rows
+        ]
+    
+    def clear(self) -> None:
+        """Forget all aggregates."""
+        # Timers keep references to their sites, so reset them in place
+        with self._lock:
+            for site in self._sites.values():
+                site.reset()
+    
+    def report_now(self) -> None:
+        """Emit the report if there is anything to report."""
+        lines = self.report()
+        if lines:
+            self._emit_report("\n".join(lines))
+
+
+# ============================================================================
+# Timer
+# ============================================================================
+
+class Timer:
+    """Context manager and decorator measuring elapsed time.
+    
+    Created by ``ic.timer()``; not meant to be instantiated directly.
+    """
+    
+    __slots__ = (
+        "_registry", "_report", "_active", "label", "quiet", "_site", "_starts", "_aggregate",
+    )
+    
+    def __init__(
+        self,
+        registry: TimingRegistry,
+        report: Callable[[str], None],
+        active: Callable[[Any, str], bool],
+        label: Optional[str],
+        site: Tuple[Any, str, object, str],
+        quiet: bool = False,
+    ):
+        """Initialize the timer.
+        
+        Args:
+            registry: Registry receiving the measurements.
+            report: Called with "<label> took <duration>" lines.
+            active: Called with a code object and module name; False skips
+                the measurement (output disabled or filtered out).
+            label: Label for output and aggregates (default: the site).
+            site: Code object, module name, aggregation key and label of
+                the place where the timer was created.
+            quiet: Only aggregate, do not print each measurement.
+        """
+        self._registry = registry
+        self._report = report
+        self._active = active
+        self.label = label
+        self.quiet = quiet
+        self._site = site
+        # Starts of the blocks entered in this thread/task (nested blocks
+        # of the same timer stack up)
+        self._starts: ContextVar[Tuple[Optional[Snapshot], ...]] = ContextVar(
+            f"litprinter_timer_{id(self):x}", default=()
+        )
+        self._aggregate: Optional[_SiteTimings] = None
+    
+    def _finish(self, aggregate: _SiteTimings, start: Snapshot) -> None:
+        end = self._registry.snapshot()
+        elapsed = end[0] - start[0]
+        aggregate.add(elapsed)
+        if not self.quiet:
+            label = aggregate.label
+            resources = _format_resources(start, end)
+            suffix = f" ({resources})" if resources else ""
+            self._report(f"{label} took {format_duration(elapsed)}{suffix}")
+    
+    def __enter__(self) -> "Timer":
+        code, module = self._site[:2]
+        start = self._registry.snapshot() if self._active(code, module) else None
+        self._starts.set(self._starts.get() + (start,))
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        starts = self._starts.get()
+        if not starts:
+            return
+        start = starts[-1]
+        self._starts.set(starts[:-1])
+        if start is not None:
+            aggregate = self._aggregate
+            if aggregate is None:
+                _, _, key, label = self._site
+                aggregate = self._aggregate = self._registry.site(
+                    self.label or key, self.label or label
+                )
+            self._finish(aggregate, start)
+    
+    def __call__(self, func: Callable) -> Callable:
+        """Time every call of ``func``.
+        
+        Without a label, the output shows the function's qualified name and
+        its calls are aggregated as a site of their own.
+        """
+        code = getattr(func, "__code__", None)
+        module = getattr(func, "__module__", None) or ""
+        aggregate = self._registry.site(
+            self.label or code or func,
+            self.label or getattr(func, "__qualname__", repr(func)),
+        )
+        
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if not self._active(code, module):
+                return func(*args, **kwargs)
+            start = self._registry.snapshot()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish(aggregate, start)
+        
+        return timed
+
+
+def _report_at_exit() -> None:
+    """Print the aggregates of registries that asked for it."""
+    for registry in list(_registries):
+        if registry.report_at_exit:
+            try:
+                registry.report_now()
+            except Exception:
+                pass
+
+
+atexit.register(_report_at_exit)
@@ -54,6 +54,8 @@ try:
 except ImportError:
     ClassType: TypeAlias = type
 
+from .highlight import highlight as fast_highlight, get_highlighter
+
 # Type alias for suppression paths
 SuppressType = Iterable[str]
 
@@ -814,8 +816,16 @@ class PrettyTraceback:
                     code_snippet = "".join(lines_for_snippet[start_line_idx:end_line_idx])
                     highlighted_code = code_snippet
 
+                    # Python source goes through the built-in table-driven highlighter,
+                    # which needs neither Pygments nor lexer guessing
+                    is_python = (
+                        frame_info.filename.endswith('.py') or frame_info.filename.startswith('<')
+                    )
+                    if is_python and get_highlighter() == "fast":
+                        highlighted_code = fast_highlight(code_snippet, self.style_cls)
+
                     # Apply syntax highlighting if Pygments is available
-                    if HAS_PYGMENTS and self.formatter:
+                    elif HAS_PYGMENTS and self.formatter:
                         # Default to plain text lexer
                         lexer = TextLexer()
 
@@ -1085,6 +1095,10 @@ def pretty_excepthook(exc_type: Type[BaseException], exc_value: BaseException, t
         tb: The traceback object
     """
     global _current_hook_options
+    # Show the ic() calls leading up to the crash first (see recorder.py)
+    recorder = sys.modules.get("litprinter.recorder")
+    if recorder is not None:
+        recorder.dump_for_exception(exc_value)
     PrettyTraceback(exc_type, exc_value, tb, **_current_hook_options).print(file=sys.stderr)
 
 def install(
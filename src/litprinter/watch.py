@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Watch Module
+
+Watchpoints: print when a variable or attribute changes inside a function.
+
+``ic.watch("total", "self.count", func=process)`` re-evaluates the watched
+expressions in every frame running ``process`` after each line, and prints
+the old and new values (formatted like ic() arguments) when one changes,
+together with the line that changed it.
+
+On Python 3.12+ this uses ``sys.monitoring`` with LINE events enabled only
+for the watched code objects, so code that is not watched runs at full
+speed. Older Pythons fall back to ``sys.settrace``, which slows down every
+function call of the threads it is installed in (the current thread and
+threads started afterwards) while a watch is active.
+
+Usage:
+    from litprinter import ic
+    
+    @ic.watch("total", "item.price")
+    def checkout(cart):
+        total = 0
+        for item in cart:
+            total += item.price
+        return total
+    
+    # ic| [shop.py:3 in checkout()] >>> total: <undefined> -> 0
+    # ic| [shop.py:5 in checkout()] >>> total: 0 -> 15
+    
+    with ic.watch("self.state", func=Machine.step):
+        machine.run()
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import inspect
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+__all__ = [
+    "Watch",
+    "MONITORING_AVAILABLE",
+    "add_trace_client",
+    "remove_trace_client",
+]
+
+MONITORING_AVAILABLE = hasattr(sys, "monitoring")
+
+# Values of these types are compared directly; anything else is compared by
+# its formatted text, which also catches in-place mutation
+_IMMUTABLE_TYPES = frozenset((int, float, complex, bool, type(None), str, bytes))
+
+
+class _Undefined:
+    """Marker for an expression that could not be evaluated (e.g. unbound)."""
+    
+    def __repr__(self) -> str:
+        return "<undefined>"
+
+
+_UNDEFINED = _Undefined()
+_MUTABLE = object()
+
+# A watch reports a change on behalf of a frame (not re-entrantly)
+_busy = threading.local()
+
+
+class _FrameState:
+    """Last seen values and line of one watched frame."""
+    
+    __slots__ = ("values", "line")
+    
+    def __init__(self, values: List[tuple], line: int):
+        self.values = values
+        self.line = line
+
+
+class Watch:
+    """A set of watched expressions in one function.
+    
+    Returned by ``ic.watch()``. Use it as a decorator (if no function was
+    given), as a context manager (to stop watching on exit), or call
+    ``stop()``.
+    
+    Attributes:
+        expressions: The watched expressions.
+        code: The watched code object, once a function is chosen.
+    """
+    
+    def __init__(
+        self,
+        expressions: Sequence[str],
+        format_value: Callable[[Any], str],
+        report: Callable[[Any, int, str, str, str], None],
+        active: Callable[[], bool],
+    ):
+        """Initialize the watch.
+        
+        Args:
+            expressions: Expressions evaluated in the watched frames.
+            format_value: Formats values for comparison and output.
+            report: Called with (code, line, expression, old, new) on a change.
+            active: Returns False while output is disabled.
+        
+        Raises:
+            SyntaxError: If an expression is not valid Python.
+        """
+        self.expressions = tuple(expressions)
+        self._compiled = [compile(expr, "<watch>", "eval") for expr in self.expressions]
+        self._format_value = format_value
+        self._report = report
+        self._active = active
+        self.code = None
+        # id(frame) -> state, for the sys.monitoring backend
+        self._states: Dict[int, _FrameState] = {}
+    
+    # ------------------------------------------------------------------
+    # Choosing the function
+    # ------------------------------------------------------------------
+    
+    def __call__(self, func: Callable) -> Callable:
+        """Start watching ``func`` and return it unchanged (decorator form)."""
+        self.start(func)
+        return func
+    
+    def start(self, func: Callable) -> "Watch":
+        """Start watching the code of ``func``."""
+        if self.code is not None:
+            raise RuntimeError("This watch is already attached to a function")
+        target = inspect.unwrap(getattr(func, "__func__", func))
+        code = getattr(target, "__code__", None)
+        if code is None:
+            raise TypeError(f"Cannot watch {func!r}: it has no Python code")
+        self.code = code
+        _backend().add(self)
+        return self
+    
+    def stop(self) -> None:
+        """Stop watching."""
+        if self.code is not None:
+            _backend().remove(self)
+            self.code = None
+            self._states.clear()
+    
+    def __enter__(self) -> "Watch":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def __repr__(self) -> str:
+        target = self.code.co_name if self.code is not None else None
+        return f"<Watch {list(self.expressions)} in {target}>"
+    
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+    
+    def _snapshot(self, value: Any) -> tuple:
+        """(value, None) for immutable values, (_MUTABLE, text) otherwise."""
+        if type(value) in _IMMUTABLE_TYPES or value is _UNDEFINED:
+            return (value, None)
+        return (_MUTABLE, self._format_value(value))
+    
+    def _text(self, entry: tuple) -> str:
+        value, text = entry
+        if text is not None:
+            return text
+        return repr(value) if value is _UNDEFINED else self._format_value(value)
+    
+    def _evaluate(self, frame) -> List[Any]:
+        f_globals, f_locals = frame.f_globals, frame.f_locals
+        values = []
+        for compiled in self._compiled:
+            try:
+                values.append(eval(compiled, f_globals, f_locals))
+            except Exception:
+                values.append(_UNDEFINED)
+        return values
+    
+    def _begin(self, frame) -> _FrameState:
+        """Record the initial values of a frame entering the watched code."""
+        values = self._evaluate(frame) if self._active() else [_UNDEFINED] * len(self._compiled)
+        return _FrameState([self._snapshot(value) for value in values], frame.f_lineno)
+    
+    def _step(self, frame, state: _FrameState, line: int) -> None:
+        """Report changes made by the line executed since the last step."""
+        if not self._active():
+            state.line = line
+            return
+        for index, value in enumerate(self._evaluate(frame)):
+            old = state.values[index]
+            if type(value) in _IMMUTABLE_TYPES or value is _UNDEFINED:
+                previous = old[0]
+                if previous is value or (
+                    type(previous) is type(value) and previous == value
+                ):
+                    continue
+                new = (value, None)
+            else:
+                new = (_MUTABLE, self._format_value(value))
+                if old[0] is _MUTABLE and old[1] == new[1]:
+                    continue
+            state.values[index] = new
+            self._report(self.code, state.line, self.expressions[index],
+                         self._text(old), self._text(new))
+        state.line = line
+    
+    # Event handlers shared by both backends
+    
+    def _on_start(self, frame) -> None:
+        self._states[id(frame)] = self._begin(frame)
+    
+    def _on_line(self, frame, line: int) -> None:
+        state = self._states.get(id(frame))
+        if state is None:
+            # Watching started while this frame was already running
+            state = self._states[id(frame)] = self._begin(frame)
+        self._step(frame, state, line)
+    
+    def _on_yield(self, frame) -> None:
+        self._on_line(frame, frame.f_lineno)
+    
+    def _on_return(self, frame) -> None:
+        state = self._states.pop(id(frame), None)
+        if state is not None:
+            self._step(frame, state, frame.f_lineno)
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+def acquire_tool_id(name: str) -> int:
+    """Claim a free ``sys.monitoring`` tool id (3.12+).
+    
+    Raises:
+        RuntimeError: If all tool ids are in use.
+    """
+    monitoring = sys.monitoring
+    # Prefer the ids without an assigned role
+    for tool in (4, 3, monitoring.OPTIMIZER_ID, monitoring.PROFILER_ID):
+        if monitoring.get_tool(tool) is None:
+            monitoring.use_tool_id(tool, name)
+            return tool
+    raise RuntimeError(f"No free sys.monitoring tool id for {name}")
+
+
+class _MonitoringBackend:
+    """Dispatches sys.monitoring events of the watched code objects (3.12+)."""
+    
+    TOOL_NAME = "litprinter watch"
+    
+    def __init__(self):
+        self._watches: Dict[Any, List[Watch]] = {}
+        self._tool: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def _acquire_tool(self) -> int:
+        monitoring = sys.monitoring
+        tool = acquire_tool_id(self.TOOL_NAME)
+        events = monitoring.events
+        monitoring.register_callback(tool, events.PY_START, self._start)
+        monitoring.register_callback(tool, events.LINE, self._line)
+        monitoring.register_callback(tool, events.PY_RETURN, self._return)
+        monitoring.register_callback(tool, events.PY_YIELD, self._yield)
+        return tool
+    
+    def _events(self) -> int:
+        events = sys.monitoring.events
+        return events.PY_START | events.LINE | events.PY_RETURN | events.PY_YIELD
+    
+    def add(self, watch: Watch) -> None:
+        with self._lock:
+            if self._tool is None:
+                self._tool = self._acquire_tool()
+            watches = self._watches.setdefault(watch.code, [])
+            watches.append(watch)
+            if len(watches) == 1:
+                sys.monitoring.set_local_events(self._tool, watch.code, self._events())
+    
+    def remove(self, watch: Watch) -> None:
+        with self._lock:
+            watches = self._watches.get(watch.code, [])
+            if watch in watches:
+                watches.remove(watch)
+            if watches:
+                return
+            self._watches.pop(watch.code, None)
+            if self._tool is None:
+                return
+            sys.monitoring.set_local_events(self._tool, watch.code, 0)
+            if not self._watches:
+                sys.monitoring.free_tool_id(self._tool)
+                self._tool = None
+    
+    def _dispatch(self, code, handler: str, *args) -> None:
+        if getattr(_busy, "active", False):
+            return
+        watches = self._watches.get(code)
+        if not watches:
+            return
+        # The callback runs on top of the monitored frame
+        frame = sys._getframe(2)
+        _busy.active = True
+        try:
+            for watch in list(watches):
+                getattr(watch, handler)(frame, *args)
+        finally:
+            _busy.active = False
+    
+    def _start(self, code, offset):
+        self._dispatch(code, "_on_start")
+    
+    def _line(self, code, line):
+        self._dispatch(code, "_on_line", line)
+    
+    def _return(self, code, offset, retval):
+        self._dispatch(code, "_on_return")
+    
+    def _yield(self, code, offset, retval):
+        # Report changes before the generator is suspended; keep its state
+        self._dispatch(code, "_on_yield")
+
+
+def _threading_trace() -> Optional[Callable]:
+    """The trace function installed by ``threading.settrace``."""
+    if hasattr(threading, "gettrace"):  # 3.10+
+        return threading.gettrace()
+    return getattr(threading, "_trace_hook", None)
+
+
+class _TraceDispatcher:
+    """One sys.settrace function shared by watchpoints and logpoints.
+    
+    Clients are global trace functions: called with each new frame, they
+    return a local tracer for it or None. The dispatcher owns the hooks of
+    ``sys.settrace`` and ``threading.settrace`` while it has clients, and
+    clears them only if they are still its own.
+    """
+    
+    def __init__(self):
+        self._clients: List[Callable] = []
+        self._lock = threading.Lock()
+    
+    def add(self, client: Callable, purpose: str) -> None:
+        with self._lock:
+            if not self._clients:
+                current = sys.gettrace()
+                if current is not None and current != self._trace:
+                    raise RuntimeError(
+                        "Another trace function (debugger or coverage) is active; "
+                        f"{purpose} need sys.settrace on this Python version"
+                    )
+                sys.settrace(self._trace)
+                threading.settrace(self._trace)
+            # Copy on write: _trace reads the list without the lock
+            self._clients = self._clients + [client]
+    
+    def remove(self, client: Callable) -> None:
+        with self._lock:
+            if client not in self._clients:
+                return
+            clients = list(self._clients)
+            clients.remove(client)
+            self._clients = clients
+            if clients:
+                return
+            if sys.gettrace() == self._trace:
+                sys.settrace(None)
+            if _threading_trace() == self._trace:
+                threading.settrace(None)
+    
+    def _trace(self, frame, event, arg):
+        clients = self._clients
+        if len(clients) == 1:
+            return clients[0](frame, event, arg)
+        tracers = [tracer for tracer in (client(frame, event, arg) for client in clients)
+                   if tracer is not None]
+        if len(tracers) < 2:
+            return tracers[0] if tracers else None
+        
+        def local_trace(frame, event, arg):
+            # Each local tracer returns its successor, or None to stop
+            results = [tracer(frame, event, arg) for tracer in tracers]
+            tracers[:] = [tracer for tracer in results if tracer is not None]
+            return local_trace if tracers else None
+        
+        return local_trace
+
+
+_dispatcher = _TraceDispatcher()
+
+
+def add_trace_client(client: Callable, purpose: str) -> None:
+    """Start calling ``client`` as a global trace function (Pythons < 3.12).
+    
+    Args:
+        client: Called like a ``sys.settrace`` function for each new frame.
+        purpose: Named in the error, e.g. "logpoints".
+    
+    Raises:
+        RuntimeError: If a trace function of another tool is installed.
+    """
+    _dispatcher.add(client, purpose)
+
+
+def remove_trace_client(client: Callable) -> None:
+    """Stop calling ``client``; the trace hooks are cleared after the last one."""
+    _dispatcher.remove(client)
+
+
+class _TraceBackend:
+    """sys.settrace fallback for Pythons without sys.monitoring."""
+    
+    def __init__(self):
+        self._watches: Dict[Any, List[Watch]] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, watch: Watch) -> None:
+        with self._lock:
+            if not self._watches:
+                add_trace_client(self._trace, "watchpoints")
+            self._watches.setdefault(watch.code, []).append(watch)
+    
+    def remove(self, watch: Watch) -> None:
+        with self._lock:
+            watches = self._watches.get(watch.code, [])
+            if watch in watches:
+                watches.remove(watch)
+            if not watches:
+                self._watches.pop(watch.code, None)
+            if not self._watches:
+                remove_trace_client(self._trace)
+    
+    def _trace(self, frame, event, arg):
+        # Global trace function: only watched code gets a local tracer
+        watches = self._watches.get(frame.f_code)
+        if not watches or getattr(_busy, "active", False):
+            return None
+        watches = list(watches)
+        states = [watch._begin(frame) for watch in watches]
+        
+        def local_trace(frame, event, arg):
+            if event not in ("line", "return") or getattr(_busy, "active", False):
+                return local_trace
+            line = frame.f_lineno
+            _busy.active = True
+            try:
+                for watch, state in zip(watches, states):
+                    if watch.code is not None:
+                        watch._step(frame, state, line)
+            finally:
+                _busy.active = False
+            return local_trace
+        
+        return local_trace
+
+
+_backend_instance = None
+
+
+def _backend():
+    global _backend_instance
+    if _backend_instance is None:
+        _backend_instance = _MonitoringBackend() if MONITORING_AVAILABLE else _TraceBackend()
+    return _backend_instance
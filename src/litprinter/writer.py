@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+LitPrinter Writer Module
+
+Output writers that take the cost of highlighting and writing off the
+thread that called ic().
+
+The BackgroundWriter accepts already formatted strings and hands them to an
+output function (by default the colorizing stderr printer) on a daemon
+thread. The queue between the two is bounded, and what happens when it is
+full is governed by an overflow policy:
+
+- ``"block"``: the caller waits until there is room (no output is lost)
+- ``"drop-newest"``: the incoming record is discarded
+- ``"drop-oldest"``: the oldest queued record is discarded to make room
+- ``"sample"``: one in every ``sample_every`` overflowing records replaces
+  the oldest queued record, the rest are discarded
+
+Dropped records are reported with a single summary line once the queue
+drains. Writers flush on interpreter exit and reset themselves in children
+after ``os.fork()``.
+
+The AtomicWriter keeps records from several processes (multiprocessing,
+gunicorn workers) from interleaving mid-line. Each record is encoded once
+and written with a single ``os.write`` to a descriptor in ``O_APPEND``
+mode; records longer than ``PIPE_BUF`` are split at line boundaries into
+chunks the kernel writes atomically to pipes and appends atomically to
+files. It is file-like, so it also works as ``Console(file=...)``.
+
+Usage:
+    from litprinter import ic
+    
+    ic.configureOutput(asyncOutput=True, overflow='drop-oldest')
+    ic(x)        # formatted here, highlighted and written in the background
+    ic.flush()   # wait until everything queued so far has been written
+    
+    ic.configureOutput(atomicOutput=True)         # stderr, one write per record
+    console = Console(file=AtomicWriter("app.log"))
+
+Author: OEvortex <helpingai5@gmail.com>
+License: MIT
+"""
+
+import atexit
+import io
+import os
+import select
+import sys
+import threading
+import traceback
+import weakref
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple, Union
+
+
+__all__ = [
+    "AtomicWriter",
+    "BackgroundWriter",
+    "OVERFLOW_POLICIES",
+    "DEFAULT_QUEUE_SIZE",
+]
+
+OVERFLOW_POLICIES = ("block", "drop-newest", "drop-oldest", "sample")
+
+DEFAULT_QUEUE_SIZE = 1024
+DEFAULT_SAMPLE_EVERY = 10
+EXIT_FLUSH_TIMEOUT = 2.0
+
+# Largest write the kernel keeps in one piece on a pipe (POSIX guarantees 512)
+PIPE_BUF = getattr(select, "PIPE_BUF", 512)
+
+# Every live writer, so fork and exit hooks can be registered only once
+_writers: "weakref.WeakSet[BackgroundWriter]" = weakref.WeakSet()
+_atomic_writers: "weakref.WeakSet[AtomicWriter]" = weakref.WeakSet()
+
+
+class BackgroundWriter:
+    """Run output functions on a background thread fed by a bounded queue.
+    
+    Example:
+        >>> writer = BackgroundWriter(maxsize=256, overflow="drop-newest")
+        >>> writer.submit(print, "hello")
+        >>> writer.flush()
+    
+    Attributes:
+        maxsize: Maximum number of queued records.
+        overflow: Overflow policy, one of OVERFLOW_POLICIES.
+        sample_every: Sampling ratio used by the ``"sample"`` policy.
+        dropped: Number of records discarded since the last drop report.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = "block",
+        sample_every: int = DEFAULT_SAMPLE_EVERY,
+    ):
+        """Initialize the writer. The thread starts on the first submit.
+        
+        Args:
+            maxsize: Maximum number of queued records.
+            overflow: What to do when the queue is full.
+            sample_every: Keep one in this many overflowing records ("sample").
+        
+        Raises:
+            ValueError: If the policy is unknown or a size is not positive.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; "
+                f"expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        if maxsize < 1 or sample_every < 1:
+            raise ValueError("maxsize and sample_every must be positive")
+        
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.sample_every = sample_every
+        self._reset()
+        _writers.add(self)
+    
+    def _reset(self) -> None:
+        """(Re)create all synchronization state; used at init and after fork."""
+        self._queue: Deque[Tuple[Callable[[str], None], str]] = deque()
+        self._cond = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self._overflowed = 0
+        self._closed = False
+        self.dropped = 0
+    
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    
+    def submit(self, function: Callable[[str], None], text: str) -> None:
+        """Queue ``function(text)`` to be run on the writer thread.
+        
+        Args:
+            function: Output function to call with the text.
+            text: Already formatted output.
+        """
+        if self._closed or self._thread is threading.current_thread():
+            # Exiting (nothing drains the queue any more), or an output
+            # function that itself calls ic(): write synchronously
+            function(text)
+            return
+        
+        item = (function, text)
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            
+            queue = self._queue
+            if len(queue) >= self.maxsize:
+                policy = self.overflow
+                if policy == "block":
+                    while len(queue) >= self.maxsize and not self._closed:
+                        self._cond.wait()
+                elif policy == "drop-newest":
+                    self.dropped += 1
+                    return
+                elif policy == "drop-oldest":
+                    queue.popleft()
+                    self.dropped += 1
+                else:  # sample
+                    self._overflowed += 1
+                    self.dropped += 1
+                    if self._overflowed % self.sample_every:
+                        return
+                    queue.popleft()
+            
+            queue.append(item)
+            self._cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued record has been written.
+        
+        Args:
+            timeout: Maximum number of seconds to wait (None waits forever).
+        
+        Returns:
+            True if the queue drained, False on timeout.
+        """
+        with self._cond:
+            if self._thread is None or self._thread is threading.current_thread():
+                return not self._queue
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._in_flight, timeout
+            )
+    
+    def close(self, timeout: Optional[float] = EXIT_FLUSH_TIMEOUT) -> None:
+        """Flush pending records and stop the writer thread.
+        
+        Records submitted after closing are written synchronously.
+        """
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+    
+    @property
+    def pending(self) -> int:
+        """Number of records queued or being written."""
+        with self._cond:
+            return len(self._queue) + self._in_flight
+    
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    
+    def _start(self) -> None:
+        """Start the writer thread (called with the lock held)."""
+        self._thread = threading.Thread(
+            target=self._run, name="litprinter-writer", daemon=True
+        )
+        self._thread.start()
+    
+    def _run(self) -> None:
+        """Drain the queue until the writer is closed."""
+        cond = self._cond
+        queue = self._queue
+        while True:
+            with cond:
+                while not queue and not self._closed:
+                    cond.wait()
+                if not queue:
+                    return
+                batch = list(queue)
+                queue.clear()
+                self._in_flight = len(batch)
+                # Wake producers blocked on a full queue
+                cond.notify_all()
+            
+            for function, text in batch:
+                self._write(function, text)
+            
+            with cond:
+                report = None
+                if self.dropped and not queue:
+                    report = self._drop_report()
+                    self.dropped = 0
+            if report is not None:
+                self._write(function, report)
+            
+            with cond:
+                self._in_flight = 0
+                cond.notify_all()
+    
+    def _drop_report(self) -> str:
+        """Build the summary line for records dropped on overflow."""
+        return (
+            f"litprinter: dropped {self.dropped:,} record(s) "
+            f"(queue full, overflow={self.overflow!r})"
+        )
+    
+    @staticmethod
+    def _write(function: Callable[[str], None], text: str) -> None:
+        """Run one output call, reporting (not propagating) its errors."""
+        try:
+            function(text)
+        except Exception:
+            traceback.print_exc(file=sys.__stderr__)
+    
+    def __repr__(self) -> str:
+        return (
+            f"<BackgroundWriter maxsize={self.maxsize} overflow={self.overflow!r} "
+            f"pending={self.pending}>"
+        )
+
+
+# ============================================================================
+# Atomic Line Writer
+# ============================================================================
+
+def _chunks(data: bytes, limit: int) -> List[bytes]:
+    """Split ``data`` into pieces of at most ``limit`` bytes.
+    
+    Pieces end at a newline where possible, and never inside a UTF-8
+    sequence.
+    """
+    if len(data) <= limit:
+        return [data]
+    chunks = []
+    start = 0
+    while len(data) - start > limit:
+        end = data.rfind(b"\n", start, start + limit) + 1
+        if end <= start:
+            # A single line longer than the limit
+            end = start + limit
+            while end > start + 1 and data[end] & 0xC0 == 0x80:
+                end -= 1
+        chunks.append(data[start:end])
+        start = end
+    chunks.append(data[start:])
+    return chunks
+
+
+class AtomicWriter:
+    """Write each record with a single ``os.write`` to an append-mode fd.
+    
+    Text streams buffer and may split a record over several writes, so
+    output of concurrent processes interleaves mid-line. This writer encodes
+    a record once and hands it to the kernel in one call (split into
+    ``PIPE_BUF``-sized chunks at line boundaries if it is longer).
+    
+    Besides ``write_record()``, it implements the file methods Console and
+    ``print()`` use. Text passed to ``write()`` is buffered per thread until
+    it ends with a newline or ``flush()`` is called, so ``print(text,
+    file=writer)`` still produces a single write.
+    
+    Example:
+        >>> writer = AtomicWriter("worker.log")
+        >>> writer.write_record("ic| pid: 4242")
+    
+    Attributes:
+        encoding: Encoding of the written bytes.
+        name: The path, or the descriptor number.
+    """
+    
+    errors = "replace"
+    
+    def __init__(self, target: Union[int, str, "os.PathLike[str]", None] = None,
+                 encoding: str = "utf-8"):
+        """Initialize the writer.
+        
+        Args:
+            target: A file descriptor, a path (opened for appending and
+                created if needed), or an object with ``fileno()``.
+                Defaults to standard error.
+            encoding: Encoding of the written bytes.
+        
+        Raises:
+            ValueError: If the target is a stream without a file descriptor
+                (``io.StringIO``, a captured or notebook stderr, ...).
+        """
+        self.encoding = encoding
+        self._owns_fd = False
+        if target is None:
+            target = sys.stderr if sys.stderr is not None else 2
+        if isinstance(target, int):
+            fd = target
+        elif hasattr(target, "fileno"):
+            try:
+                fd = target.fileno()
+            except (AttributeError, OSError, io.UnsupportedOperation) as exc:
+                raise ValueError(
+                    f"Cannot write atomically to {getattr(target, 'name', target)!r}: "
+                    f"it has no file descriptor ({exc})"
+                ) from exc
+            # Write out what the stream buffered before we bypass it
+            target.flush()
+        else:
+            fd = os.open(target, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._owns_fd = True
+        self._fd = fd
+        self.name = target if isinstance(target, (int, str)) else getattr(target, "name", fd)
+        self._set_append()
+        self._reset()
+        _atomic_writers.add(self)
+    
+    def _set_append(self) -> None:
+        """Put a shared regular file in append mode so writes never overlap."""
+        try:
+            import fcntl
+            import stat
+            if stat.S_ISREG(os.fstat(self._fd).st_mode):
+                flags = fcntl.fcntl(self._fd, fcntl.F_GETFL)
+                if not flags & os.O_APPEND:
+                    fcntl.fcntl(self._fd, fcntl.F_SETFL, flags | os.O_APPEND)
+        except (ImportError, OSError):
+            pass
+    
+    def _reset(self) -> None:
+        """(Re)create the per-thread buffers and lock; used at init and after fork."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    # ------------------------------------------------------------------
+    # Records
+    # ------------------------------------------------------------------
+    
+    def write_record(self, text: str) -> None:
+        """Write ``text`` and a newline as one record."""
+        self.write_bytes((text + "\n").encode(self.encoding, self.errors))
+    
+    def write_bytes(self, data: bytes) -> None:
+        """Write already encoded record(s) with as few ``os.write`` calls as possible."""
+        if not data:
+            return
+        # The lock keeps threads of this process from splitting each
+        # other's chunks; O_APPEND does the same across processes
+        with self._lock:
+            for chunk in _chunks(data, PIPE_BUF):
+                view = memoryview(chunk)
+                while view:
+                    try:
+                        written = os.write(self._fd, view)
+                    except BlockingIOError:
+                        # Non-blocking pipe that is full: wait for room
+                        select.select([], [self._fd], [])
+                        continue
+                    view = view[written:]
+    
+    # ------------------------------------------------------------------
+    # File interface
+    # ------------------------------------------------------------------
+    
+    def write(self, text: str) -> int:
+        """Buffer ``text``; a trailing newline completes and writes the record."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+        buffer.append(text)
+        if text.endswith("\n"):
+            self.flush()
+        return len(text)
+    
+    def flush(self) -> None:
+        """Write what this thread has buffered."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer:
+            text = "".join(buffer)
+            buffer.clear()
+            self.write_bytes(text.encode(self.encoding, self.errors))
+    
+    def fileno(self) -> int:
+        return self._fd
+    
+    def isatty(self) -> bool:
+        try:
+            return os.isatty(self._fd)
+        except OSError:
+            return False
+    
+    def writable(self) -> bool:
+        return True
+    
+    def close(self) -> None:
+        """Flush, and close the descriptor if this writer opened it."""
+        self.flush()
+        if self._owns_fd:
+            self._owns_fd = False
+            os.close(self._fd)
+    
+    def __repr__(self) -> str:
+        return f"<AtomicWriter {self.name!r}>"
+
+
+# ============================================================================
+# Process Lifecycle Hooks
+# ============================================================================
+
+def _after_fork_in_child() -> None:
+    """Give every writer fresh locks and an empty queue in the child.
+    
+    The writer thread does not survive fork, and records queued in the
+    parent are written by the parent.
+    """
+    for writer in list(_writers):
+        writer._reset()
+    # Text buffered by parent threads belongs to the parent
+    for atomic in list(_atomic_writers):
+        atomic._reset()
+
+
+def _flush_at_exit() -> None:
+    """Write out whatever is still queued when the interpreter exits."""
+    for writer in list(_writers):
+        writer.close(EXIT_FLUSH_TIMEOUT)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(_flush_at_exit)